@@ -12,23 +12,18 @@ cd /app/scraper
 # =======================
 # FASE 1: SCRAPING DE STEAM API
 # =======================
-echo "[*] FASE 1: Ejecutando scraping de Steam API..."
+# DLC, bandas sonoras, paquetes y contenido adulto se filtran ya en el
+# descubrimiento (gameid-script.py + lista de exclusión de filtro_juegos.py),
+# antes de pedir sus detalles; filter-games.py ya no hace falta aquí.
+echo "[*] FASE 1: Ejecutando scraping de Steam API (con filtrado de DLC/soundtracks)..."
 echo ""
 python scripts/run_pipeline.py || { echo "[ERROR] Fallo ejecutando run_pipeline.py"; exit 1; }
 echo ""
 
 # =======================
-# FASE 2: FILTRADO DE JUEGOS
+# FASE 2: RESÚMENES IA (flux.sh)
 # =======================
-echo "[*] FASE 2: Filtrando DLC, soundtracks y contenido adulto..."
-echo ""
-python scripts/filter-games.py || { echo "[ERROR] Fallo ejecutando filter-games.py"; exit 1; }
-echo ""
-
-# =======================
-# FASE 3: RESÚMENES IA (flux.sh)
-# =======================
-echo "[*] FASE 3: Ejecutando pipeline de extracción y resumen IA..."
+echo "[*] FASE 2: Ejecutando pipeline de extracción y resumen IA..."
 echo ""
 cd /app/imp-futuras
 
@@ -50,37 +45,33 @@ fi
 echo ""
 
 # =======================
-# FASE 4: INTEGRACIÓN DE RESÚMENES
+# FASE 3: POSTPROCESO (resúmenes IA + limpieza de tags y HTML)
 # =======================
-echo "[*] FASE 4: Reemplazando descripciones con resúmenes IA..."
+# Una sola pasada sobre el dataset (antes desc-changer.py y clean-tags.py)
+echo "[*] FASE 3: Integrando resúmenes IA y limpiando categorías/HTML..."
 echo ""
 cd /app/scraper
-python scripts/desc-changer.py || { echo "[ERROR] Fallo ejecutando desc-changer.py"; exit 1; }
-echo ""
-
-# =======================
-# FASE 5: LIMPIEZA DE TAGS
-# =======================
-echo "[*] FASE 5: Limpiando categorías irrelevantes..."
-echo ""
-python scripts/clean-tags.py || { echo "[ERROR] Fallo ejecutando clean-tags.py"; exit 1; }
+python scripts/postproceso.py || { echo "[ERROR] Fallo ejecutando postproceso.py"; exit 1; }
 echo ""
 
 # =======================
-# FASE 6: VECTORIZACIÓN
+# FASE 4: VECTORIZACIÓN
 # =======================
-echo "[*] FASE 6: Generando embeddings semánticos (768 dims)..."
+echo "[*] FASE 4: Generando embeddings semánticos (768 dims)..."
 echo ""
 python scripts/vectorizador.py || { echo "[ERROR] Fallo ejecutando vectorizador.py"; exit 1; }
 echo ""
 
 # =======================
-# FASE 7: SINCRONIZACIÓN REMOTA (SCP)
+# FASE 5: SINCRONIZACIÓN REMOTA (SCP)
 # =======================
-echo "[*] FASE 7: Sincronizando datos a máquina remota..."
+echo "[*] FASE 5: Sincronizando datos a máquina remota..."
 echo ""
 
 ARCHIVO_VECT="/app/scraper/data/steam-games-data-vect.ndjson"
+# Sidecar binario de vectorizador.py --formato npy|ambos (solo existe en esos formatos)
+ARCHIVO_VECT_NPY="/app/scraper/data/steam-games-data-vect.npy"
+ARCHIVO_VECT_IDS="/app/scraper/data/steam-games-data-vect.ids.npy"
 LOG_METRICS="/app/scraper/logs/scraper_metrics.log"
 MAQUINA_REMOTA="192.199.1.65"
 RUTA_REMOTA="/home/g6/reto/datos"
@@ -93,6 +84,10 @@ if [ -f "$ARCHIVO_VECT" ]; then
     echo "Copiando datos vectorizados a $MAQUINA_REMOTA:$RUTA_REMOTA ..."
     scp "$ARCHIVO_VECT" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || { echo "[ERROR] Fallo copiando archivo vectorizado"; exit 1; }
     echo "[OK] Datos sincronizados: steam-games-data-vect.ndjson"
+    if [ -f "$ARCHIVO_VECT_NPY" ]; then
+        scp "$ARCHIVO_VECT_NPY" "$ARCHIVO_VECT_IDS" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || { echo "[ERROR] Fallo copiando vectores .npy"; exit 1; }
+        echo "[OK] Vectores sincronizados: steam-games-data-vect.npy + .ids.npy"
+    fi
 else
     echo "[WARN] No se encontró el archivo vectorizado. Saltando sincronización."
 fi
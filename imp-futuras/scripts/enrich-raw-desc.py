@@ -5,6 +5,11 @@ Enrich raw-desc.ndjson with genres and categories from steam-games-data.ndjson
 
 import json
 import os
+import sys
+
+# Shared scraper modules (NDJSON index)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'scraper', 'scripts'))
+import indice_ndjson
 
 def main():
     # Define paths
@@ -15,28 +20,13 @@ def main():
     
     print(f"[*] Leyendo datos de juegos desde: {games_data_path}")
     
-    # Load game data into a dictionary keyed by steam_id
-    games_dict = {}
-    try:
-        with open(games_data_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, 1):
-                if not line.strip():
-                    continue
-                try:
-                    game = json.loads(line)
-                    steam_id = game.get('steam_id')
-                    if steam_id:
-                        games_dict[steam_id] = {
-                            'genres': game.get('genres', []),
-                            'categories': game.get('categories', [])
-                        }
-                except json.JSONDecodeError as e:
-                    print(f"[WARN] Error en línea {line_num}: {e}")
-    except FileNotFoundError:
+    # Game data through its index: only the games present in raw-desc get decoded
+    if not os.path.exists(games_data_path):
         print(f"[ERROR] No se encontró {games_data_path}")
         return
+    games = indice_ndjson.IndiceNDJSON(games_data_path).abrir()
     
-    print(f"[OK] Cargados {len(games_dict)} juegos con datos de géneros y categorías")
+    print(f"[OK] Indexados {len(games)} juegos con datos de géneros y categorías")
     print(f"[*] Enriqueciendo {raw_desc_path}")
     
     # Process raw-desc and add genres/categories
@@ -54,20 +44,30 @@ def main():
                 record = json.loads(line)
                 steam_id = record.get('steam_id')
                 
-                if steam_id in games_dict:
-                    record['genres'] = games_dict[steam_id]['genres']
-                    record['categories'] = games_dict[steam_id]['categories']
+                # A corrupt line in games data only costs this record its enrichment
+                try:
+                    game = games.get(steam_id)
+                except ValueError as e:
+                    print(f"[WARN] steam_id {steam_id}: línea ilegible en steam-games-data ({e})")
+                    game = None
+                if game is not None:
+                    record['genres'] = game.get('genres', [])
+                    record['categories'] = game.get('categories', [])
                     enriched_count += 1
                 else:
                     missing_count += 1
-                    print(f"[WARN] steam_id {steam_id} no encontrado en steam-games-data")
+                    if steam_id not in games:
+                        print(f"[WARN] steam_id {steam_id} no encontrado en steam-games-data")
                 
                 f_out.write(json.dumps(record, ensure_ascii=False) + '\n')
             except json.JSONDecodeError as e:
                 print(f"[ERROR] Error en línea {line_num}: {e}")
     
-    # Reemplazar archivo original con el temporal
+    games.cerrar()
+    
+    # Reemplazar archivo original con el temporal (con su índice ya generado)
     import shutil
+    indice_ndjson.construir(temp_path, indice_ndjson.ruta_indice(raw_desc_path))
     shutil.move(temp_path, raw_desc_path)
     
     print(f"\n[OK] Enriquecimiento completado:")
@@ -3,8 +3,6 @@ import json
 import time
 import os
 import sys
-import html
-import re
 
 # Forzar que los prints se muestren inmediatamente (sin buffer)
 sys.stdout.reconfigure(line_buffering=True)
@@ -12,53 +10,33 @@ sys.stdout.reconfigure(line_buffering=True)
 # Obtener la ruta del directorio raíz del proyecto (dos niveles arriba desde scripts/)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Módulos compartidos con el scraper (índice de los NDJSON, limpieza HTML)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scraper', 'scripts'))
+import indice_ndjson
+from limpieza_html import limpiar_html_respetando_utf8
+
 # Configuración
 CANTIDAD_A_PROCESAR = 0  # 0 = procesar todos
 ARCHIVO_ENTRADA = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-top-games.json')
 ARCHIVO_STEAM_ACTUAL = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-top-games.json')
 ARCHIVO_SALIDA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'raw-desc.ndjson')
 
-URL_DETALLES = "https://store.steampowered.com/api/appdetails/"
+URL_DETALLES = os.environ.get('STEAM_STORE_URL', 'https://store.steampowered.com').rstrip('/') + "/api/appdetails/"
 PARAMS_BASE = {"cc": "es", "l": "spanish"}
 DELAY = 0.8  # Reducido porque solo extraemos 3 campos
 
-def limpiar_html_respetando_utf8(texto):
-    """
-    Elimina las etiquetas HTML
-    """
-    if not texto or not isinstance(texto, str): return ""
-    
-    # 1. Reemplazar saltos de línea HTML por espacios para que no se peguen las palabras
-    texto = texto.replace('<br>', ' ').replace('<br/>', ' ').replace('</p>', ' ')
-    
-    # 2. Eliminar cualquier etiqueta HTML (<...>) usando Expresiones Regulares
-    texto_limpio = re.sub(r'<[^>]+>', ' ', texto)
-    
-    # 3. Decodificar entidades HTML (Ej: convierte "&quot;" en comillas reales, "&amp;" en &)
-    texto_limpio = html.unescape(texto_limpio)
-    
-    # 4. Eliminar espacios dobles o triples que hayan quedado
-    return " ".join(texto_limpio.split())
-
 def cargar_ids_ya_procesados():
     """
-    Lee el archivo de salida y devuelve un set con los steam_id ya procesados
+    Devuelve un set con los steam_id ya procesados del archivo de salida,
+    leídos de su índice (sin decodificar las descripciones)
     """
     ids_procesados = set()
     if os.path.exists(ARCHIVO_SALIDA):
         print("[INFO] Escaneando IDs ya procesados...")
         try:
-            with open(ARCHIVO_SALIDA, 'r', encoding='utf-8') as f:
-                for linea in f:
-                    try:
-                        doc = json.loads(linea)
-                        steam_id = doc.get('steam_id')
-                        if steam_id:
-                            ids_procesados.add(steam_id)
-                    except:
-                        pass
-        except:
-            pass
+            ids_procesados = indice_ndjson.ids_ndjson(ARCHIVO_SALIDA)
+        except Exception as e:
+            print(f"[ERROR] No se pudo leer el índice de {ARCHIVO_SALIDA}: {e}")
         print(f"[INFO] {len(ids_procesados)} IDs ya procesados cargados")
     return ids_procesados
 
@@ -181,6 +159,9 @@ def main():
             
             time.sleep(DELAY)
     
+    # Solo se ha añadido al final: se indexan las líneas nuevas
+    indice_ndjson.actualizar(ARCHIVO_SALIDA)
+    
     print("-" * 60)
     print(f"[DONE] FINALIZADO.")
     print(f"[INFO] Nuevos encontrados: {nuevos_encontrados}")
@@ -8,16 +8,21 @@ sys.stdout.reconfigure(line_buffering=True)
 # Obtener la ruta del directorio raíz del proyecto
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Módulos compartidos con el scraper (índice de los NDJSON y snapshots)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'scraper', 'scripts'))
+import indice_ndjson
+import snapshots
+
 # Configuración de archivos
 ARCHIVO_STEAM = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-top-games.json')
 ARCHIVO_RAW = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'raw-desc.ndjson')
-ARCHIVO_RAW_BACKUP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backup', 'raw-desc-backup.ndjson')
+NOMBRE_SNAPSHOT = 'raw-desc'
 
 def main():
     print(f"[*] SINCRONIZANDO IDs ENTRE ARCHIVOS")
     print(f"[*] Steam IDs desde: {ARCHIVO_STEAM}")
     print(f"[*] Raw descriptions: {ARCHIVO_RAW}")
-    print(f"[*] Backup de raw descriptions: {ARCHIVO_RAW_BACKUP}")
+    print(f"[*] Snapshots: {snapshots.SNAPSHOTS_DIR}")
     # Verificar que existen los archivos
     if not os.path.exists(ARCHIVO_STEAM):
         print(f"[ERROR] No se encuentra '{ARCHIVO_STEAM}'")
@@ -35,23 +40,12 @@ def main():
     steam_ids = set(juego.get('appid') for juego in steam_data if juego.get('appid'))
     print(f"[OK] {len(steam_ids)} IDs cargados desde steam-top-games.json")
     
-    # Cargar entradas de raw-desc.ndjson
-    print("\n[*] Cargando entradas de raw-desc.ndjson...")
-    raw_entries = []
-    raw_ids = set()
-    
-    with open(ARCHIVO_RAW, 'r', encoding='utf-8') as f:
-        for linea in f:
-            try:
-                doc = json.loads(linea)
-                steam_id = doc.get('steam_id')
-                raw_entries.append(doc)
-                if steam_id:
-                    raw_ids.add(steam_id)
-            except:
-                pass
+    # IDs de raw-desc.ndjson desde su índice (sin decodificar las descripciones)
+    print("\n[*] Cargando IDs de raw-desc.ndjson...")
+    raw = indice_ndjson.IndiceNDJSON(ARCHIVO_RAW).abrir()
+    raw_ids = raw.ids()
     
-    print(f"[OK] {len(raw_entries)} entradas cargadas desde raw-desc.ndjson")
+    print(f"[OK] {len(raw_ids)} IDs cargados desde raw-desc.ndjson")
     
     # Comparar IDs
     ids_a_eliminar = raw_ids - steam_ids
@@ -68,26 +62,45 @@ def main():
         for steam_id in sorted(ids_a_eliminar):
             print(f"  - {steam_id}")
         
-        # Crear backup
-        print(f"\n[*] Creando backup de raw-desc.ndjson...")
-        with open(ARCHIVO_RAW_BACKUP, 'w', encoding='utf-8') as f:
-            for doc in raw_entries:
-                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
-        print(f"[OK] Backup guardado en: {ARCHIVO_RAW_BACKUP}")
+        # Snapshot deduplicado antes de reescribir
+        print(f"\n[*] Creando snapshot de raw-desc.ndjson...")
+        print(f"[OK] Snapshot {snapshots.resumen(snapshots.guardar(NOMBRE_SNAPSHOT, ARCHIVO_RAW), NOMBRE_SNAPSHOT)}")
         
-        # Filtrar y guardar
+        # Filtrar y guardar: se copian tal cual, en su orden original y sin
+        # decodificar, todas las líneas salvo las de los IDs a eliminar (las
+        # repetidas y las que no tienen steam_id se conservan)
         print(f"\n[*] Filtrando raw-desc.ndjson...")
-        raw_filtrado = [doc for doc in raw_entries if doc.get('steam_id') in steam_ids]
-        
-        with open(ARCHIVO_RAW, 'w', encoding='utf-8') as f:
-            for doc in raw_filtrado:
-                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+        raw.cerrar()
+        antes = despues = repetidas = sin_id = 0
+        vistos = set()
+        temporal = ARCHIVO_RAW + '.tmp'
+        with open(ARCHIVO_RAW, 'rb') as entrada, open(temporal, 'wb') as f:
+            for linea in entrada:
+                contenido = linea.rstrip(b'\r\n')
+                if not contenido.strip():
+                    continue
+                antes += 1
+                steam_id = indice_ndjson.appid_de_linea(contenido)
+                if steam_id in ids_a_eliminar:
+                    continue
+                if steam_id is None:
+                    sin_id += 1
+                elif steam_id in vistos:
+                    repetidas += 1
+                vistos.add(steam_id)
+                f.write(contenido + b"\n")
+                despues += 1
+        indice_ndjson.construir(temporal, indice_ndjson.ruta_indice(ARCHIVO_RAW))
+        os.replace(temporal, ARCHIVO_RAW)
         
         print(f"[OK] raw-desc.ndjson actualizado")
-        print(f"[INFO] Entradas antes: {len(raw_entries)}")
-        print(f"[INFO] Entradas después: {len(raw_filtrado)}")
-        print(f"[INFO] Entradas eliminadas: {len(ids_a_eliminar)}")
+        print(f"[INFO] Entradas antes: {antes}")
+        print(f"[INFO] Entradas después: {despues}")
+        print(f"[INFO] Entradas eliminadas: {antes - despues} ({len(ids_a_eliminar)} IDs)")
+        if repetidas or sin_id:
+            print(f"[WARN] Conservadas {repetidas} líneas con steam_id repetido y {sin_id} sin steam_id")
     else:
+        raw.cerrar()
         print(f"\n[OK] No hay IDs para eliminar. Archivos sincronizados.")
     
     print("\n[DONE] Sincronización completada.")
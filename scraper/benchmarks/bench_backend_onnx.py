@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark: backend torch frente a ONNX Runtime (float32 e int8 con
+cuantización dinámica) para el modelo de vectorizador.py.
+
+Uso:
+  python benchmarks/bench_backend_onnx.py                          # 500 juegos sintéticos
+  python benchmarks/bench_backend_onnx.py --ndjson data/steam-games-data.ndjson --juegos 2000
+  python benchmarks/bench_backend_onnx.py --configs avx2,avx512_vnni
+  python benchmarks/bench_backend_onnx.py --modelo /ruta/a/un/modelo/local
+
+Con los textos que vectoriza el pipeline (texto_vector) mide, por backend:
+  - rendimiento: juegos/s codificando todo el corpus con codificar() (lotes
+    ordenados por longitud, como el pipeline)
+  - latencia: ms por texto suelto (lote de 1), p50 y p95
+  - precisión frente a torch: coseno por juego (mínimo, p1, media) y
+    cuántos top-10 de vecinos coinciden para --consultas juegos del corpus
+La exportación a ONNX se hace en un directorio temporal y su tiempo se
+informa aparte (en el pipeline se paga solo la primera vez).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import modelo_onnx
+import vectorizador
+from bench_vectorizador_procesos import generar
+
+
+def leer_textos(ruta, limite):
+    textos = []
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                textos.append(vectorizador.texto_vector(json.loads(linea)))
+            if len(textos) == limite:
+                break
+    return textos
+
+
+def normalizar(vectores):
+    return vectores / np.linalg.norm(vectores, axis=1, keepdims=True)
+
+
+def vecinos(matriz, consultas, k=10):
+    puntuaciones = matriz[consultas] @ matriz.T
+    puntuaciones[np.arange(len(consultas)), consultas] = -np.inf  # sin el propio juego
+    return [set(fila) for fila in np.argpartition(-puntuaciones, k, axis=1)[:, :k]]
+
+
+def medir(modelo, textos, lote, muestra):
+    inicio = time.perf_counter()
+    vectores = vectorizador.codificar(modelo, textos, lote)
+    t_total = time.perf_counter() - inicio
+    latencias = []
+    for texto in muestra:
+        inicio = time.perf_counter()
+        modelo.encode([texto], batch_size=1, show_progress_bar=False)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    percentil_95 = statistics.quantiles(latencias, n=20)[-1] if len(latencias) > 1 else latencias[0]
+    return vectores, len(textos) / t_total, statistics.median(latencias), percentil_95
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modelo', default=vectorizador.MODEL_NAME)
+    parser.add_argument('--ndjson', help="steam-games-data.ndjson real (solo se lee)")
+    parser.add_argument('--juegos', type=int, default=500)
+    parser.add_argument('--lote', type=int, default=vectorizador.TAMANO_LOTE)
+    parser.add_argument('--configs', default=modelo_onnx.CONFIG,
+                        help=f"Configs de cuantización separadas por comas ({', '.join(modelo_onnx.CONFIGS)})")
+    parser.add_argument('--latencias', type=int, default=50, help="Textos sueltos para medir la latencia")
+    parser.add_argument('--consultas', type=int, default=100, help="Juegos cuyo top-10 se compara con torch")
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench-backend-onnx-')
+    modelo_onnx.CACHE_DIR = os.path.join(directorio, 'onnx')
+    if args.ndjson:
+        ruta = args.ndjson
+    else:
+        ruta = os.path.join(directorio, 'steam-games-data.ndjson')
+        generar(ruta, args.juegos)
+    textos = leer_textos(ruta, args.juegos)
+    muestra = textos[:args.latencias]
+    consultas = np.linspace(0, len(textos) - 1, min(args.consultas, len(textos)), dtype=int)
+
+    from sentence_transformers import SentenceTransformer
+
+    def cargar_torch():
+        return SentenceTransformer(args.modelo, device='cpu')
+
+    def cargar_onnx_float32(ruta_exportada):
+        return SentenceTransformer(ruta_exportada, device='cpu', backend='onnx',
+                                   model_kwargs={'file_name': 'onnx/model.onnx', 'provider': modelo_onnx.PROVEEDOR})
+
+    backends = [("torch", cargar_torch)]
+    exportaciones = []
+    for config in [c for c in args.configs.split(',') if c]:
+        inicio = time.perf_counter()
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            ruta_exportada = modelo_onnx.preparar(args.modelo, config)
+        exportaciones.append(f"{config} {time.perf_counter() - inicio:.0f}s")
+        if len(backends) == 1:
+            backends.append(("onnx float32", lambda r=ruta_exportada: cargar_onnx_float32(r)))
+        backends.append((f"onnx-int8 {config}", lambda r=ruta_exportada, c=config: modelo_onnx.cargar(r, c)))
+
+    print(f"[*] {len(textos)} juegos | lote {args.lote} | CPUs {vectorizador.cpus_disponibles()} | "
+          f"exportación ONNX: {', '.join(exportaciones)}")
+    print(f"{'backend':<24}{'juegos/s':>10}{'x torch':>9}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'cos mín':>10}{'cos p1':>9}{'cos media':>11}{'top-10 =':>10}")
+    referencia = None
+    for nombre, cargar in backends:
+        modelo = cargar()
+        vectores, por_segundo, p50, p95 = medir(modelo, textos, args.lote, muestra)
+        vectores = normalizar(vectores)
+        if referencia is None:
+            referencia = (vectores, por_segundo, vecinos(vectores, consultas))
+        cosenos = np.sum(vectores * referencia[0], axis=1)
+        iguales = sum(a == b for a, b in zip(vecinos(vectores, consultas), referencia[2]))
+        print(f"{nombre:<24}{por_segundo:>10.1f}{por_segundo / referencia[1]:>9.2f}{p50:>9.1f}{p95:>9.1f}"
+              f"{cosenos.min():>10.4f}{np.percentile(cosenos, 1):>9.4f}{cosenos.mean():>11.4f}"
+              f"{iguales:>6}/{len(consultas)}")
+        del modelo
+
+    shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
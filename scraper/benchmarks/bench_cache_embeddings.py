@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorización nocturna con y sin la caché de embeddings
+(cache_embeddings.py).
+
+Uso:
+  python benchmarks/bench_cache_embeddings.py                         # 1000 juegos, 3% cambian
+  python benchmarks/bench_cache_embeddings.py --juegos 5000 --cambios 5
+  python benchmarks/bench_cache_embeddings.py --ndjson data/steam-games-data.ndjson
+  python benchmarks/bench_cache_embeddings.py --modelo /ruta/a/un/modelo/local
+
+Pasos, con procesar_pipeline() completo sobre copias en un directorio temporal:
+  1. sin caché (como antes)
+  2. con la caché vacía (primera noche: coste de llenarla)
+  3. misma entrada, caché llena (noche sin cambios)
+  4. --cambios % de los juegos con otro resumen (noche típica)
+Comprueba que la salida del paso 4 es la misma que la de un paso sin caché
+sobre la misma entrada (mismo orden, coseno mínimo).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import cache_embeddings
+import vectorizador
+from bench_vectorizador_procesos import PALABRAS, coseno_minimo, generar, leer_vectores
+
+
+def cambiar_resumenes(ruta, porcentaje, semilla=11):
+    """Cambia el resumen de `porcentaje` % de los juegos (como una noche con resúmenes nuevos)."""
+    rnd = random.Random(semilla)
+    with open(ruta, 'r', encoding='utf-8') as f:
+        juegos = [json.loads(linea) for linea in f if linea.strip()]
+    for juego in rnd.sample(juegos, max(1, round(len(juegos) * porcentaje / 100))):
+        juego['detailed_description'] = " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(8, 140)))
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for juego in juegos:
+            f.write(json.dumps(juego, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modelo', default=vectorizador.MODEL_NAME)
+    parser.add_argument('--ndjson', help="steam-games-data.ndjson real (se copia, no se modifica)")
+    parser.add_argument('--juegos', type=int, default=1000)
+    parser.add_argument('--cambios', type=float, default=3.0, help="% de juegos con resumen nuevo en el paso 4")
+    parser.add_argument('--procesos', type=int, default=1)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench-cache-embeddings-')
+    cache_embeddings.CACHE_DIR = os.path.join(directorio, 'cache')
+    vectorizador.ARCHIVO_RAW = os.path.join(directorio, 'steam-games-data.ndjson')
+    if args.ndjson:
+        shutil.copyfile(args.ndjson, vectorizador.ARCHIVO_RAW)
+    else:
+        generar(vectorizador.ARCHIVO_RAW, args.juegos)
+
+    def paso(salida, usar_cache):
+        vectorizador.ARCHIVO_FINAL = os.path.join(directorio, salida)
+        inicio = time.perf_counter()
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            resultado = vectorizador.procesar_pipeline(procesos=args.procesos, nombre_modelo=args.modelo,
+                                                       usar_cache=usar_cache)
+        return time.perf_counter() - inicio, resultado
+
+    pasos = [("1. sin caché", 'sin-cache.ndjson', False),
+             ("2. caché vacía", 'vacia.ndjson', True),
+             ("3. sin cambios", 'sin-cambios.ndjson', True),
+             (f"4. {args.cambios:g}% cambiados", 'cambios.ndjson', True),
+             ("   (4 sin caché)", 'cambios-sin-cache.ndjson', False)]
+    print(f"{'paso':<22}{'s':>9}{'codificados':>13}{'aciertos':>10}{'% aciertos':>12}{'x paso 1':>10}")
+    base = None
+    for etiqueta, salida, usar_cache in pasos:
+        if salida == 'cambios.ndjson':
+            cambiar_resumenes(vectorizador.ARCHIVO_RAW, args.cambios)
+        t, r = paso(salida, usar_cache)
+        base = base or t
+        total = r['aciertos'] + r['codificados']
+        print(f"{etiqueta:<22}{t:>9.1f}{r['codificados']:>13}{r['aciertos']:>10}"
+              f"{r['aciertos'] / total * 100:>11.1f}%{base / t:>10.2f}")
+
+    ids, vectores = leer_vectores(os.path.join(directorio, 'cambios.ndjson'))
+    ids_ref, referencia = leer_vectores(os.path.join(directorio, 'cambios-sin-cache.ndjson'))
+    print(f"[*] Paso 4 con caché = sin caché: orden {ids == ids_ref}, coseno mínimo {coseno_minimo(vectores, referencia):.6f}")
+    ruta_cache = os.path.join(cache_embeddings.CACHE_DIR, os.listdir(cache_embeddings.CACHE_DIR)[0])
+    print(f"[*] Caché: {os.path.getsize(ruta_cache) / 1024 / 1024:.2f} MB para {len(ids)} juegos")
+
+    shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
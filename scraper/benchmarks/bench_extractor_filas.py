@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parseo de páginas de /search/results/ con BeautifulSoup(html.parser)
+(implementación anterior de gameid-script.py) frente a extractor_filas.
+
+Uso:
+  python benchmarks/bench_extractor_filas.py                       # páginas de tests/datos
+  python benchmarks/bench_extractor_filas.py --paginas DIR         # páginas grabadas
+  python benchmarks/bench_extractor_filas.py --grabar 1            # graba 1 página de Steam en tests/datos y mide
+  python benchmarks/bench_extractor_filas.py --sintetica           # 50 filas sintéticas iguales
+
+Cada página grabada es el JSON tal cual lo devuelve /search/results/
+(o un .html con el results_html). Por defecto se miden las mismas páginas
+que usa tests/test_extractor_filas.py: lo que se grabe en tests/datos entra
+también en sus tests. También comprueba que ambos parseadores devuelven los
+mismos appids y títulos.
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+from extractor_filas import extraer_filas
+
+URL_SEARCH = "https://store.steampowered.com/search/results/"
+DIRECTORIO_PAGINAS = os.path.join(SCRAPER_DIR, 'tests', 'datos')
+
+FILA_SINTETICA = '''<a href="https://store.steampowered.com/app/{appid}/Juego_{appid}/?snr=1_7_7_230_150_1"  data-ds-appid="{appid}" data-ds-itemkey="App_{appid}" data-ds-tagids="[1663,1774,3859,3878,1693,5711,5055]" data-ds-crtrids="[4]" data-ds-descids="[2,5]" onmouseover="GameHover( this, event, 'global_hover', {{&quot;type&quot;:&quot;app&quot;,&quot;id&quot;:{appid},&quot;public&quot;:1,&quot;v6&quot;:1}} );" onmouseout="HideGameHover( this, event, 'global_hover' )" class="search_result_row ds_collapse_flag " data-search-page="1" data-gpnav="item">
+    <div class="col search_capsule"><img src="https://shared.cloudflare.steamstatic.com/store_item_assets/steam/apps/{appid}/capsule_sm_120.jpg" srcset="https://shared.cloudflare.steamstatic.com/store_item_assets/steam/apps/{appid}/capsule_sm_120.jpg 1x, https://shared.cloudflare.steamstatic.com/store_item_assets/steam/apps/{appid}/capsule_231x87.jpg 2x"></div>
+    <div class="responsive_search_name_combined">
+        <div class="col search_name ellipsis">
+            <span class="title">Juego de prueba {appid} &amp; amigos</span>
+            <div><span class="platform_img win"></span><span class="platform_img mac"></span></div>
+        </div>
+        <div class="col search_released responsive_secondrow">Aug 21, 2012</div>
+        <div class="col search_reviewscore responsive_secondrow">
+            <span class="search_review_summary positive" data-tooltip-html="Very Positive&lt;br&gt;86% of the 8,123,456 user reviews for this game are positive.">
+            </span>
+        </div>
+        <div class="col search_price_discount_combined responsive_secondrow" data-price-final="1999">
+            <div class="col search_discount_and_price responsive_secondrow">
+                <div class="discount_block search_discount_block" data-price-final="1999" data-bundlediscount="0" data-discount="33" role="link" aria-label="33% de descuento. 29,99€ normalmente, ahora a 19,99€"><div class="discount_pct">-33%</div><div class="discount_prices"><div class="discount_original_price">$29.99</div><div class="discount_final_price">$19.99</div></div></div>
+            </div>
+        </div>
+    </div>
+    <div style="clear: left;"></div>
+</a>'''
+
+
+def parsear_bs4(results_html):
+    """Implementación anterior de gameid-script.py (solo appid + título)."""
+    soup = BeautifulSoup(results_html, 'html.parser')
+    filas = []
+    for row in soup.find_all('a', class_='search_result_row'):
+        appid = row.get('data-ds-appid')
+        title = row.find('span', class_='title').text.strip()
+        if appid:
+            filas.append((appid.split(',')[0], title))
+    return filas
+
+
+def parsear_extractor(results_html):
+    return [(f['appid'], f['title']) for f in extraer_filas(results_html)]
+
+
+def grabar_paginas(directorio, n):
+    import requests
+    os.makedirs(directorio, exist_ok=True)
+    for i in range(n):
+        params = {'query': '', 'start': i * 50, 'count': 50, 'sort_by': 'CCU_DESC',
+                  'infinite': 1, 'ignore_preferences': 1, 'cc': 'us'}
+        resp = requests.get(URL_SEARCH, params=params, timeout=30)
+        resp.raise_for_status()
+        with open(os.path.join(directorio, f'pagina-grabada-{i:03d}.json'), 'w', encoding='utf-8') as f:
+            f.write(resp.text)
+        print(f"[OK] Grabada página {i + 1}/{n}")
+        time.sleep(1.0)
+
+
+def cargar_paginas(directorio):
+    paginas = []
+    for ruta in sorted(glob.glob(os.path.join(directorio, '*'))):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            contenido = f.read()
+        if ruta.endswith('.json'):
+            contenido = json.loads(contenido).get('results_html', '')
+        paginas.append(contenido)
+    return paginas
+
+
+def medir(funcion, paginas, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        for pagina in paginas:
+            t0 = time.perf_counter()
+            funcion(pagina)
+            tiempos.append((time.perf_counter() - t0) * 1000)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--paginas', default=DIRECTORIO_PAGINAS,
+                        help="Directorio con páginas grabadas (.json o .html). Por defecto, tests/datos")
+    parser.add_argument('--grabar', type=int, default=0, help="Graba N páginas de Steam en --paginas antes de medir")
+    parser.add_argument('--sintetica', action='store_true', help="Mide una página sintética de 50 filas")
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.grabar:
+        grabar_paginas(args.paginas, args.grabar)
+
+    if args.sintetica:
+        paginas = ["\n".join(FILA_SINTETICA.format(appid=730 + i) for i in range(50))]
+        origen = "página sintética (50 filas)"
+    else:
+        paginas = cargar_paginas(args.paginas)
+        origen = args.paginas
+
+    if not paginas:
+        print(f"[ERROR] No hay páginas en {args.paginas}")
+        return
+
+    # Comprobación de equivalencia
+    diferentes = sum(1 for p in paginas if parsear_bs4(p) != parsear_extractor(p))
+    filas = sum(len(parsear_extractor(p)) for p in paginas)
+
+    t_bs4 = medir(parsear_bs4, paginas, args.repeticiones)
+    t_ext = medir(parsear_extractor, paginas, args.repeticiones)
+
+    print(f"[*] Origen: {origen} | páginas: {len(paginas)} | filas: {filas} | repeticiones: {args.repeticiones}")
+    print(f"[*] Páginas con resultado distinto (appid/título): {diferentes}")
+    print(f"{'parser':<28}{'media ms/pág':>14}{'mediana':>10}{'p95':>10}")
+    for nombre, t in (("BeautifulSoup html.parser", t_bs4), ("extractor_filas", t_ext)):
+        p95 = sorted(t)[int(len(t) * 0.95) - 1]
+        print(f"{nombre:<28}{statistics.mean(t):>14.3f}{statistics.median(t):>10.3f}{p95:>10.3f}")
+    print(f"[INFO] Aceleración (media): x{statistics.mean(t_bs4) / statistics.mean(t_ext):.1f}")
+
+
+if __name__ == "__main__":
+    main()
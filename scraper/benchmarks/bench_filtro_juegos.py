@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: filtro de nombres por palabras clave con la implementación
+anterior de contiene_palabra_clave (lower() de cada palabra + búsqueda de
+subcadena, una por palabra) frente al patrón compilado de filtro_juegos
+(alternancia factorizada por prefijos, palabra completa, casefold).
+
+Uso:
+  python benchmarks/bench_filtro_juegos.py                          # 100k y 1M nombres sintéticos
+  python benchmarks/bench_filtro_juegos.py --tamanos 10000,100000,1000000
+  python benchmarks/bench_filtro_juegos.py --palabras 500           # + 500 palabras clave sintéticas
+  python benchmarks/bench_filtro_juegos.py --nombres data/steam-top-games.json
+
+Mide ns/nombre para cada tamaño (si es lineal, ns/nombre no cambia con el
+tamaño) y cuenta los nombres en los que ambas versiones discrepan, con
+ejemplos: son los falsos positivos de subcadena ("dlc" en "Idlcraft").
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import filtro_juegos
+
+PALABRAS_NOMBRE = ("Dark", "Souls", "Legend", "Quest", "Space", "Empire", "Racing", "Simulator", "Tactics",
+                   "Idle", "Craft", "Seasons", "Adventure", "Sound", "Tracker", "Cosmos", "Expanse",
+                   "Castle", "Ninja", "Farm", "Zombie", "Kingdom", "Hero", "Rogue", "Galaxy", "Drift")
+EXTRAS = ("Soundtrack", "DLC", "Season Pass", "Artbook", "Bundle", "Cosmetics Pack", "Expansion",
+          "Idlcraft", "Adulthood", "Sexualized", "Soundtracker", "ＤＬＣ", "Grüße Edition", "Remastered")
+
+
+def contiene_palabra_clave_anterior(nombre, palabras):
+    """Implementación anterior (filter-games.py)."""
+    nombre_lower = nombre.lower()
+    for palabra in palabras:
+        if palabra.lower() in nombre_lower:
+            return True
+    return False
+
+
+def generar_nombres(n, semilla=7):
+    rnd = random.Random(semilla)
+    nombres = []
+    for i in range(n):
+        partes = rnd.sample(PALABRAS_NOMBRE, rnd.randint(1, 4))
+        if rnd.random() < 0.15:
+            partes.append(rnd.choice(EXTRAS))
+        nombres.append(" ".join(partes) + (f" {rnd.randint(2, 9)}" if rnd.random() < 0.2 else ""))
+    return nombres
+
+
+def palabras_sinteticas(n, semilla=11):
+    rnd = random.Random(semilla)
+    return ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(5, 12))) for _ in range(n)]
+
+
+def cargar_nombres(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return [j.get('name') or '' for j in json.load(f)]
+
+
+def cronometrar(funcion, nombres):
+    inicio = time.perf_counter()
+    descartados = sum(1 for nombre in nombres if funcion(nombre))
+    return time.perf_counter() - inicio, descartados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', default='100000,1000000', help="Nº de nombres sintéticos, separados por comas")
+    parser.add_argument('--palabras', type=int, default=0, help="Palabras clave sintéticas extra (escalado con k)")
+    parser.add_argument('--nombres', help="JSON [{name}] real (p.ej. data/steam-top-games.json) en vez de sintéticos")
+    args = parser.parse_args()
+
+    palabras = list(filtro_juegos.PALABRAS_CLAVE_FILTRO) + palabras_sinteticas(args.palabras)
+    patron = filtro_juegos.compilar_palabras(palabras, filtro_juegos.PALABRAS_COMPLETAS)
+    alternancia = re.compile(r'(?<!\w)(?:' + '|'.join(re.escape(filtro_juegos.normalizar(p)) for p in palabras)
+                             + r')(?!\w)')
+
+    def compilado(nombre):
+        return nombre and patron.search(filtro_juegos.normalizar(nombre)) is not None
+
+    def alternancia_plana(nombre):
+        return nombre and alternancia.search(filtro_juegos.normalizar(nombre)) is not None
+
+    def anterior(nombre):
+        return contiene_palabra_clave_anterior(nombre, palabras)
+
+    if args.nombres:
+        lotes = [(os.path.basename(args.nombres), cargar_nombres(args.nombres))]
+    else:
+        lotes = [(f"{int(n):,}".replace(',', '.'), generar_nombres(int(n))) for n in args.tamanos.split(',') if n]
+
+    print(f"[*] Palabras clave: {len(palabras)} | patrón compilado: {len(patron.pattern)} caracteres "
+          f"| palabra completa: {filtro_juegos.PALABRAS_COMPLETAS}")
+    print(f"{'nombres':>12}  {'filtro':<26}{'s':>8}{'ns/nombre':>12}{'descartados':>13}")
+    for etiqueta, nombres in lotes:
+        for nombre_funcion, funcion in (("anterior (subcadena)", anterior),
+                                        ("alternancia plana", alternancia_plana),
+                                        ("filtro_juegos (trie)", compilado)):
+            t, descartados = cronometrar(funcion, nombres)
+            print(f"{etiqueta:>12}  {nombre_funcion:<26}{t:>8.2f}{t / len(nombres) * 1e9:>12.0f}{descartados:>13}")
+
+    nombres = lotes[0][1]
+    distintos = [n for n in nombres if bool(anterior(n)) != bool(compilado(n))]
+    # Un ejemplo por palabra que causa la discrepancia (la última del nombre sintético)
+    ejemplos = list({n.rstrip(string.digits + ' ').split(' ')[-1]: n for n in distintos}.values())[:8]
+    print(f"[*] Discrepancias anterior vs compilado: {len(distintos)} de {len(nombres)}")
+    for n in ejemplos:
+        print(f"    {n!r}: anterior={bool(anterior(n))} compilado={bool(compilado(n))}")
+
+
+if __name__ == "__main__":
+    main()
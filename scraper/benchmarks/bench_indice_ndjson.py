@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: consultas de IDs sobre un NDJSON leyendo línea a línea con
+json.loads (como hacían cargar_ids_ya_procesados, sync-ids, etc.) frente
+al índice de indice_ndjson.
+
+Uso:
+  python benchmarks/bench_indice_ndjson.py                      # 1M registros sintéticos
+  python benchmarks/bench_indice_ndjson.py --registros 100000
+  python benchmarks/bench_indice_ndjson.py --ndjson data/steam-games-data.ndjson
+
+Mide: construir el índice, abrirlo, sacar el set de IDs, diferencia de IDs
+contra una lista de entrada y búsquedas sueltas (contains + decodificar doc).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import indice_ndjson
+
+DESCRIPCION = "Juego de prueba con tildes y eñes para el índice. " * 8
+
+
+def generar(ruta, n):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for appid in random.sample(range(10, n * 4), n):
+            f.write(json.dumps({"steam_id": appid, "name": f"Juego {appid}",
+                                "detailed_description": DESCRIPCION}, ensure_ascii=False) + "\n")
+
+
+def ids_con_json(ruta):
+    """Implementación anterior: decodificar cada línea para quedarse con el steam_id."""
+    ids = set()
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            try:
+                steam_id = json.loads(linea).get('steam_id')
+                if steam_id:
+                    ids.add(steam_id)
+            except ValueError:
+                pass
+    return ids
+
+
+def cronometrar(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return resultado, (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registros', type=int, default=1_000_000)
+    parser.add_argument('--ndjson', help="NDJSON existente (por defecto se genera uno sintético)")
+    parser.add_argument('--busquedas', type=int, default=10_000)
+    args = parser.parse_args()
+
+    temporal = None
+    if args.ndjson:
+        ruta = args.ndjson
+    else:
+        temporal = tempfile.mkdtemp()
+        ruta = os.path.join(temporal, 'bench.ndjson')
+        print(f"[*] Generando {args.registros} registros sintéticos...")
+        generar(ruta, args.registros)
+
+    tamano_mb = os.path.getsize(ruta) / 1024 / 1024
+    ids_json, t_json = cronometrar(lambda: ids_con_json(ruta))
+    n, t_construir = cronometrar(lambda: indice_ndjson.construir(ruta))
+    indice, t_abrir = cronometrar(lambda: indice_ndjson.IndiceNDJSON(ruta).abrir())
+    ids_idx, t_ids = cronometrar(indice.ids)
+
+    # Entrada tipo steam-top-games.json: la mitad coincide, la otra mitad es nueva
+    entrada = random.sample(sorted(ids_idx), len(ids_idx) // 2) + [-i for i in range(1, len(ids_idx) // 2)]
+    entrada_set = set(entrada)
+    (nuevos, obsoletos), t_diff = cronometrar(lambda: (entrada_set - ids_idx, ids_idx - entrada_set))
+
+    muestra = random.sample(entrada, min(args.busquedas, len(entrada)))
+    _, t_contains = cronometrar(lambda: sum(1 for a in muestra if a in indice))
+    _, t_docs = cronometrar(lambda: [indice.get(a) for a in muestra])
+    indice.cerrar()
+
+    print(f"[*] NDJSON: {ruta} | registros: {n} | {tamano_mb:.1f} MB | índice: "
+          f"{os.path.getsize(indice_ndjson.ruta_indice(ruta)) / 1024 / 1024:.1f} MB")
+    print(f"[*] IDs iguales (json.loads vs índice): {ids_json == ids_idx}")
+    print(f"{'operación':<44}{'ms':>12}")
+    filas = (
+        ("set de IDs con json.loads línea a línea", t_json),
+        ("construir índice (una vez, lo hace el escritor)", t_construir),
+        ("abrir índice (mmap)", t_abrir),
+        ("set de IDs desde el índice", t_ids),
+        (f"diff de IDs ({len(nuevos)} nuevos, {len(obsoletos)} obsoletos)", t_diff),
+        (f"{len(muestra)} contains (búsqueda binaria)", t_contains),
+        (f"{len(muestra)} docs decodificados por appid", t_docs),
+    )
+    for nombre, t in filas:
+        print(f"{nombre:<44}{t:>12.1f}")
+    print(f"[INFO] Aceleración del set de IDs (abrir + set vs json.loads): x{t_json / (t_abrir + t_ids):.1f}")
+
+    if temporal:
+        os.remove(ruta)
+        os.remove(indice_ndjson.ruta_indice(ruta))
+        os.rmdir(temporal)
+
+
+if __name__ == "__main__":
+    main()
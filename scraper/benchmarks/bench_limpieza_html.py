@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark: limpieza HTML de las descripciones de appdetails con la
+implementación anterior de limpiar_html_respetando_utf8 (copiada en
+sacar-datos-games.py, extract-desc.py y extract-desc-nuevas.py) frente a
+limpieza_html.
+
+Uso:
+  python benchmarks/bench_limpieza_html.py                       # caché de respuestas (o sintético si está vacía)
+  python benchmarks/bench_limpieza_html.py --muestras DIR        # JSON de appdetails grabados
+  python benchmarks/bench_limpieza_html.py --muestras DIR --grabar 730,570,1245620   # graba y mide
+
+Las muestras reales salen de cache/respuestas (lo que guarda cache_steam al
+scrapear) o de --muestras. Se limpian detailed_description, short_description
+y pc_requirements.minimum. Además de los tiempos, comprueba que la salida es
+idéntica byte a byte, también con HTML roto generado al azar.
+"""
+
+import argparse
+import glob
+import html
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import cache_steam
+from limpieza_html import limpiar_html_respetando_utf8
+
+URL_DETALLES = "https://store.steampowered.com/api/appdetails/"
+
+PARRAFO = ("Explora un mundo abierto lleno de secretos, combate a criaturas legendarias y "
+           "forja tu propio destino en una aventura épica con más de 100 horas de campaña.")
+DESCRIPCION_SINTETICA = (
+    '<h2 class="bb_tag">Acerca del juego</h2>{p}<br><br>'
+    '<img src="https://shared.akamai.steamstatic.com/store_item_assets/steam/apps/{appid}/extras/a.gif?t=1" /><br>'
+    '<ul class="bb_ul"><li><strong>Combate táctico:</strong> {p}</li><li>&quot;Modo cooperativo&quot; &amp; online</li></ul>'
+    '<p class="bb_paragraph">{p}&nbsp;&#8212; edición &lt;Deluxe&gt;</p>'
+)
+
+
+def limpiar_html_anterior(texto):
+    """Implementación anterior (idéntica en los tres scripts)."""
+    if not texto or not isinstance(texto, str): return ""
+    texto = texto.replace('<br>', ' ').replace('<br/>', ' ').replace('</p>', ' ')
+    texto_limpio = re.sub(r'<[^>]+>', ' ', texto)
+    texto_limpio = html.unescape(texto_limpio)
+    return " ".join(texto_limpio.split())
+
+
+def textos_de_appdetails(cuerpo):
+    textos = []
+    try:
+        d = json.loads(cuerpo)
+    except (TypeError, ValueError):
+        return textos
+    for entrada in (d or {}).values():
+        data = (entrada or {}).get('data')
+        if not isinstance(data, dict):
+            continue
+        pc_req = data.get('pc_requirements', {})
+        textos += [data.get('detailed_description', ''), data.get('short_description', ''),
+                   pc_req.get('minimum', '') if isinstance(pc_req, dict) else '']
+    return [t for t in textos if t]
+
+
+def grabar_muestras(directorio, appids):
+    import requests
+    os.makedirs(directorio, exist_ok=True)
+    for appid in appids:
+        resp = requests.get(URL_DETALLES, params={"appids": appid, "cc": "es", "l": "spanish"}, timeout=30)
+        resp.raise_for_status()
+        with open(os.path.join(directorio, f'appdetails-{appid}.json'), 'w', encoding='utf-8') as f:
+            f.write(resp.text)
+        print(f"[OK] Grabado appdetails de {appid}")
+        time.sleep(1.5)
+
+
+def cargar_textos(directorio):
+    if directorio:
+        textos = []
+        for ruta in sorted(glob.glob(os.path.join(directorio, '*.json'))):
+            with open(ruta, 'r', encoding='utf-8') as f:
+                textos += textos_de_appdetails(f.read())
+        return textos, directorio
+    textos = []
+    for entrada in cache_steam.iterar():
+        if entrada.get('url') == URL_DETALLES and 'filters' not in entrada.get('params', {}):
+            textos += textos_de_appdetails(entrada.get('body'))
+    if textos:
+        return textos, cache_steam.CACHE_DIR
+    return [DESCRIPCION_SINTETICA.format(p=PARRAFO, appid=i) for i in range(500)], "descripciones sintéticas (500)"
+
+
+def html_roto(rnd, n):
+    """Cadenas con '<', '>', '&' y entidades sueltas para comprobar la equivalencia."""
+    piezas = ['<', '>', '<br>', '<br/>', '</p>', '&amp;', '&lt;', '&nbsp;', '&#10;', '&quot', ' ', '\n', 'a', 'ñ', '<b>', '&']
+    return ["".join(rnd.choice(piezas) for _ in range(rnd.randint(1, 40))) for _ in range(n)]
+
+
+def medir(funcion, textos, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        for texto in textos:
+            funcion(texto)
+        tiempos.append((time.perf_counter() - t0) / len(textos) * 1e6)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--muestras', help="Directorio con respuestas de appdetails (.json)")
+    parser.add_argument('--grabar', help="appids separados por comas a grabar en --muestras antes de medir")
+    parser.add_argument('--repeticiones', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.grabar:
+        if not args.muestras:
+            parser.error("--grabar necesita --muestras")
+        grabar_muestras(args.muestras, [a.strip() for a in args.grabar.split(',') if a.strip()])
+
+    textos, origen = cargar_textos(args.muestras)
+    if not textos:
+        print(f"[ERROR] No hay textos en {origen}")
+        return
+
+    diferentes = sum(1 for t in textos if limpiar_html_anterior(t) != limpiar_html_respetando_utf8(t))
+    rotos = html_roto(random.Random(7), 20000)
+    diferentes_rotos = sum(1 for t in rotos if limpiar_html_anterior(t) != limpiar_html_respetando_utf8(t))
+
+    t_ant = medir(limpiar_html_anterior, textos, args.repeticiones)
+    t_nuevo = medir(limpiar_html_respetando_utf8, textos, args.repeticiones)
+    media_kb = sum(len(t) for t in textos) / len(textos) / 1024
+
+    print(f"[*] Origen: {origen} | textos: {len(textos)} | media: {media_kb:.1f} KB | repeticiones: {args.repeticiones}")
+    print(f"[*] Salidas distintas: {diferentes} de {len(textos)} | HTML roto: {diferentes_rotos} de {len(rotos)}")
+    print(f"{'limpieza':<30}{'media µs/texto':>16}{'mediana':>10}{'MB/s':>8}")
+    for nombre, t in (("anterior (replace+re.sub)", t_ant), ("limpieza_html", t_nuevo)):
+        print(f"{nombre:<30}{statistics.mean(t):>16.2f}{statistics.median(t):>10.2f}"
+              f"{media_kb / 1024 / (statistics.mean(t) / 1e6):>8.1f}")
+    print(f"[INFO] Aceleración (media): x{statistics.mean(t_ant) / statistics.mean(t_nuevo):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark: postproceso de steam-games-data.ndjson con la secuencia de
+scripts (desc-changer.py -> clean-tags.py -> pasada de vectorizador.py)
+frente a postproceso.py (una pasada) -> pasada de vectorizador.py.
+
+Uso:
+  python benchmarks/bench_postproceso.py                      # 100k registros sintéticos
+  python benchmarks/bench_postproceso.py --registros 20000 --repeticiones 5
+  python benchmarks/bench_postproceso.py --ndjson data/steam-games-data.ndjson --summary ../imp-futuras/data/summary.ndjson
+
+La pasada de vectorizador.py se mide sin el modelo (lectura, limpieza HTML,
+texto del vector y escritura; el encode es igual en los dos casos). Trabaja
+sobre copias en un directorio temporal, se queda con el mejor tiempo de
+cada paso entre las repeticiones y comprueba que los NDJSON vectorizables
+resultantes son idénticos registro a registro.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(SCRAPER_DIR, 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import postproceso
+import snapshots
+from limpieza_html import quitar_etiquetas
+from limpieza_tags import TAGS_BASURA
+
+TAGS_BUENOS = ("Acción", "Aventura", "Un jugador", "Multijugador", "Cooperativo", "Rol", "Estrategia")
+PARRAFO = "Explora un mundo abierto lleno de secretos y forja tu propio destino en una aventura épica. "
+
+
+def cargar_script(archivo, nombre):
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(SCRIPTS_DIR, archivo))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def generar(directorio, n, semilla=7):
+    rnd = random.Random(semilla)
+    basura = sorted(TAGS_BASURA)
+    datos = os.path.join(directorio, 'steam-games-data.ndjson')
+    summary = os.path.join(directorio, 'summary.ndjson')
+    with open(datos, 'w', encoding='utf-8') as f, open(summary, 'w', encoding='utf-8') as s:
+        for appid in range(10, 10 + n):
+            descripcion = PARRAFO * rnd.randint(3, 15)
+            if rnd.random() < 0.3:
+                descripcion = f"<p>{descripcion}</p><br><strong>Edición &amp; extras</strong>"
+            categorias = rnd.sample(TAGS_BUENOS, 3) + [t.title() for t in rnd.sample(basura, rnd.randint(0, 4))]
+            f.write(json.dumps({"steam_id": appid, "name": f"Juego {appid}", "genres": ["Acción", "Indie"],
+                                "categories": categorias, "detailed_description": descripcion},
+                               ensure_ascii=False) + "\n")
+            if rnd.random() < 0.35:
+                s.write(json.dumps({"steam_id": appid, "summary": f"Resumen IA del juego {appid}."},
+                                   ensure_ascii=False) + "\n")
+    return datos, summary
+
+
+def pasada_vectorizador(ruta_entrada, ruta_salida):
+    """Lo que hace vectorizador.py con cada registro, sin el encode."""
+    with open(ruta_entrada, 'r', encoding='utf-8') as f_in, open(ruta_salida, 'w', encoding='utf-8') as f_out:
+        for linea in f_in:
+            if not linea.strip():
+                continue
+            juego = json.loads(linea)
+            genres = ", ".join((juego.get('genres') or [])[:5])
+            tags = ", ".join((juego.get('categories') or [])[:10])
+            juego['detailed_description'] = quitar_etiquetas(juego.get('detailed_description'))
+            juego['texto_vector'] = (f"Title: {juego.get('name')}. Genres: {genres}. Tags: {tags}. "
+                                     f"Details: {juego['detailed_description']}")
+            json.dump(juego, f_out, ensure_ascii=False)
+            f_out.write('\n')
+
+
+def secuencia_anterior(directorio, datos, summary):
+    desc_changer = cargar_script('desc-changer.py', 'desc_changer')
+    clean_tags = cargar_script('clean-tags.py', 'clean_tags')
+    desc_changer.ARCHIVO_SUMMARY = summary
+    desc_changer.ARCHIVO_STEAM_DATA = datos
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    desc_changer.main()
+    tiempos['desc-changer.py'] = time.perf_counter() - inicio
+
+    # Como el __main__ de clean-tags.py: temporal + snapshot + move
+    inicio = time.perf_counter()
+    temporal = datos + '.tmp'
+    clean_tags.procesar_archivo(datos, temporal, 'steam-games-data')
+    shutil.move(temporal, datos)
+    tiempos['clean-tags.py'] = time.perf_counter() - inicio
+    return tiempos
+
+
+def secuencia_fusionada(directorio, datos, summary):
+    postproceso.ARCHIVO_SUMMARY = summary
+    postproceso.ARCHIVO_STEAM_DATA = datos
+    argv = sys.argv
+    sys.argv = ['postproceso.py']
+    inicio = time.perf_counter()
+    try:
+        postproceso.main()
+    finally:
+        sys.argv = argv
+    return {'postproceso.py': time.perf_counter() - inicio}
+
+
+def correr(nombre, secuencia, datos_origen, summary_origen):
+    directorio = tempfile.mkdtemp(prefix=f'bench-postproceso-{nombre}-')
+    datos = os.path.join(directorio, 'steam-games-data.ndjson')
+    summary = os.path.join(directorio, 'summary.ndjson')
+    shutil.copyfile(datos_origen, datos)
+    shutil.copyfile(summary_origen, summary)
+    snapshots.SNAPSHOTS_DIR = os.path.join(directorio, 'snapshots')
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        tiempos = secuencia(directorio, datos, summary)
+        inicio = time.perf_counter()
+        vect = os.path.join(directorio, 'vect.ndjson')
+        pasada_vectorizador(datos, vect)
+        tiempos['vectorizador.py (sin modelo)'] = time.perf_counter() - inicio
+    return tiempos, vect, directorio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registros', type=int, default=100000)
+    parser.add_argument('--ndjson', help="steam-games-data.ndjson real (se copia, no se modifica)")
+    parser.add_argument('--summary', help="summary.ndjson real (con --ndjson)")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    origen = tempfile.mkdtemp(prefix='bench-postproceso-')
+    if args.ndjson:
+        if not args.summary:
+            parser.error("--ndjson necesita --summary")
+        datos, summary = args.ndjson, args.summary
+    else:
+        print(f"[*] Generando {args.registros} registros sintéticos...")
+        datos, summary = generar(origen, args.registros)
+
+    t_ant, t_fus, iguales = {}, {}, True
+    for _ in range(args.repeticiones):
+        # Alternadas, para que la caché de páginas no favorezca a ninguna
+        tiempos_ant, vect_ant, dir_ant = correr('anterior', secuencia_anterior, datos, summary)
+        tiempos_fus, vect_fus, dir_fus = correr('fusionado', secuencia_fusionada, datos, summary)
+        for acumulado, tiempos in ((t_ant, tiempos_ant), (t_fus, tiempos_fus)):
+            for paso, t in tiempos.items():
+                acumulado[paso] = min(t, acumulado.get(paso, t))
+        with open(vect_ant, 'r', encoding='utf-8') as a, open(vect_fus, 'r', encoding='utf-8') as b:
+            iguales = iguales and all(json.loads(x) == json.loads(y) for x, y in zip(a, b))
+        shutil.rmtree(dir_ant, ignore_errors=True)
+        shutil.rmtree(dir_fus, ignore_errors=True)
+    tamano_mb = os.path.getsize(datos) / 1024 / 1024
+
+    print(f"[*] Dataset: {tamano_mb:.1f} MB | salida vectorizable idéntica: {iguales} "
+          f"| mejor de {args.repeticiones} repeticiones")
+    print(f"{'paso':<34}{'s':>10}")
+    for nombre, tiempos in (("secuencia anterior", t_ant), ("postproceso en una pasada", t_fus)):
+        print(f"-- {nombre}")
+        for paso, t in tiempos.items():
+            print(f"   {paso:<31}{t:>10.2f}")
+        print(f"   {'TOTAL':<31}{sum(tiempos.values()):>10.2f}")
+    ahorro = sum(t_ant.values()) - sum(t_fus.values())
+    print(f"[INFO] Tiempo ahorrado: {ahorro:.2f}s ({ahorro / sum(t_ant.values()) * 100:.0f}% del total, "
+          f"x{sum(t_ant.values()) / sum(t_fus.values()):.2f})")
+
+    shutil.rmtree(origen, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark: steam-games-data-vect.ndjson con vector_embedding en cada línea
+frente al sidecar binario de vectores_npy.py (float32 y float16).
+
+Uso:
+  python benchmarks/bench_vectores_npy.py                          # 10000 juegos sintéticos, 768 dims
+  python benchmarks/bench_vectores_npy.py --juegos 50000
+  python benchmarks/bench_vectores_npy.py --ndjson data/steam-games-data-vect.ndjson
+
+Para cada formato mide el tamaño en disco y el tiempo de carga hasta tener
+la matriz de vectores y el índice steam_id -> fila, y hasta responder una
+búsqueda top-10 por coseno (con mmap la carga no lee la matriz: la
+búsqueda es la que la recorre). Los tiempos son con el archivo en la caché
+de páginas. Con float16 informa del coseno mínimo frente a float32 y de
+cuántos top-10 coinciden.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import vectores_npy
+
+PARRAFO = "Explora un mundo abierto lleno de secretos y forja tu propio destino en una aventura épica. "
+
+
+def generar(ruta, n, dimension, semilla=7):
+    rnd = random.Random(semilla)
+    generador = np.random.default_rng(semilla)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for appid in range(10, 10 + n):
+            vector = generador.standard_normal(dimension).astype(np.float32)
+            vector /= np.linalg.norm(vector)
+            f.write(json.dumps({"steam_id": appid, "name": f"Juego {appid}", "genres": ["Acción", "Indie"],
+                                "categories": ["Un jugador", "Mundo abierto"],
+                                "detailed_description": PARRAFO * rnd.randint(1, 4),
+                                "vector_embedding": vector.tolist()}, ensure_ascii=False) + "\n")
+
+
+def separar(ruta_vect, directorio):
+    """Lo que escribe vectorizador.py --formato npy: NDJSON sin vectores + sidecar float32 y float16."""
+    sin_vectores = os.path.join(directorio, 'sin-vectores.ndjson')
+    escritores = {dtype: vectores_npy.EscritorVectores(os.path.join(directorio, f'vect-{dtype}.npy'), dtype)
+                  for dtype in ('float32', 'float16')}
+    with open(ruta_vect, 'r', encoding='utf-8') as f_in, open(sin_vectores, 'w', encoding='utf-8') as f_out:
+        for linea in f_in:
+            juego = json.loads(linea)
+            vector = np.asarray([juego.pop('vector_embedding')], dtype=np.float32)
+            for escritor in escritores.values():
+                escritor.anadir([juego['steam_id']], vector)
+            f_out.write(json.dumps(juego, ensure_ascii=False) + "\n")
+    for escritor in escritores.values():
+        escritor.cerrar()
+    return sin_vectores, {dtype: e.ruta for dtype, e in escritores.items()}
+
+
+def cargar_json(ruta):
+    ids, vectores = [], []
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            juego = json.loads(linea)
+            ids.append(juego['steam_id'])
+            vectores.append(juego['vector_embedding'])
+    return np.asarray(ids, dtype=np.int64), np.asarray(vectores, dtype=np.float32)
+
+
+def top10(matriz, consulta):
+    puntuaciones = matriz @ consulta.astype(matriz.dtype)
+    mejores = np.argpartition(-puntuaciones, 10)[:10]
+    return mejores[np.argsort(-puntuaciones[mejores])]
+
+
+def medir(cargar, consulta):
+    inicio = time.perf_counter()
+    ids, matriz = cargar()
+    vectores_npy.filas(ids)
+    t_carga = time.perf_counter() - inicio
+    top10(matriz, consulta)
+    return t_carga, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ndjson', help="steam-games-data-vect.ndjson real (con vector_embedding)")
+    parser.add_argument('--juegos', type=int, default=10000)
+    parser.add_argument('--dimension', type=int, default=768)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp(prefix='bench-vectores-npy-')
+    if args.ndjson:
+        ruta_vect = args.ndjson
+    else:
+        ruta_vect = os.path.join(directorio, 'steam-games-data-vect.ndjson')
+        print(f"[*] Generando {args.juegos} juegos sintéticos ({args.dimension} dims)...")
+        generar(ruta_vect, args.juegos, args.dimension)
+    sin_vectores, npy = separar(ruta_vect, directorio)
+
+    ids, matriz32 = vectores_npy.cargar(npy['float32'], mmap=False)
+    consulta = matriz32[len(matriz32) // 2]
+    mb = lambda *rutas: sum(os.path.getsize(r) for r in rutas) / 1024 / 1024
+    formatos = (
+        ("ndjson (vector en la línea)", mb(ruta_vect), lambda: cargar_json(ruta_vect)),
+        ("npy float32, mmap", mb(npy['float32'], vectores_npy.ruta_ids(npy['float32'])),
+         lambda: vectores_npy.cargar(npy['float32'])),
+        ("npy float32, np.load", mb(npy['float32'], vectores_npy.ruta_ids(npy['float32'])),
+         lambda: vectores_npy.cargar(npy['float32'], mmap=False)),
+        ("npy float16, mmap", mb(npy['float16'], vectores_npy.ruta_ids(npy['float16'])),
+         lambda: vectores_npy.cargar(npy['float16'])),
+    )
+    print(f"[*] {len(ids)} juegos x {matriz32.shape[1]} dims | NDJSON sin vectores: {mb(sin_vectores):.1f} MB")
+    print(f"{'formato':<30}{'MB':>12}{'carga s':>10}{'+ top-10 s':>12}{'x ndjson':>10}")
+    base = None
+    for nombre, tamano, cargar in formatos:
+        t_carga, t_consulta = medir(cargar, consulta)
+        base = base or t_consulta
+        print(f"{nombre:<30}{tamano:>12.1f}{t_carga:>10.3f}{t_consulta:>12.3f}{base / t_consulta:>10.1f}")
+
+    _, matriz16 = vectores_npy.cargar(npy['float16'])
+    a = matriz32 / np.linalg.norm(matriz32, axis=1, keepdims=True)
+    b = matriz16.astype(np.float32)
+    b /= np.linalg.norm(b, axis=1, keepdims=True)
+    consultas = np.random.default_rng(3).choice(len(ids), size=min(100, len(ids)), replace=False)
+    iguales = sum(set(top10(matriz32, matriz32[i])) == set(top10(matriz16, matriz32[i])) for i in consultas)
+    print(f"[*] float16 vs float32: coseno mínimo {float(np.min(np.sum(a * b, axis=1))):.6f}, "
+          f"top-10 idéntico en {iguales}/{len(consultas)} consultas")
+
+    shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorización de textos con un encode() por juego (implementación
+anterior de vectorizador.py, lote de 1) frente a vectorizador.codificar()
+(lotes ordenados por longitud en tokens), por tamaño de lote.
+
+Uso:
+  python benchmarks/bench_vectorizador.py                               # 2000 textos sintéticos
+  python benchmarks/bench_vectorizador.py --lotes 8,16,32,64,128 --textos 5000
+  python benchmarks/bench_vectorizador.py --ndjson data/steam-games-data.ndjson
+  python benchmarks/bench_vectorizador.py --modelo /ruta/a/un/modelo/local
+
+Para cada tamaño de lote mide textos/s con los lotes en el orden de entrada
+y ordenados por tokens, y el % de posiciones de padding de cada caso. La
+referencia de lote 1 se mide sobre --muestra textos (es lenta) y sirve para
+comprobar que los embeddings por lotes coinciden (coseno mínimo).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+import torch
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import vectorizador
+from sentence_transformers import SentenceTransformer
+
+PALABRAS = ("explora", "un", "mundo", "abierto", "lleno", "de", "secretos", "y", "forja", "tu", "destino",
+            "en", "una", "aventura", "épica", "combate", "táctico", "por", "turnos", "construye", "tu", "base",
+            "sobrevive", "a", "la", "noche", "con", "amigos", "en", "cooperativo", "online", "historia")
+GENEROS = ("Acción", "Aventura", "Indie", "Rol", "Estrategia", "Simulación", "Casual", "Deportes", "Carreras")
+TAGS = ("Un jugador", "Multijugador", "Cooperativo", "Mundo abierto", "Pixel art", "Roguelike", "Supervivencia",
+        "Construcción", "Terror", "Ciencia ficción", "Fantasía", "Difícil", "Atmosférico", "Gestión de recursos")
+
+
+def textos_sinteticos(n, semilla=7):
+    """Como los de vectorizador.texto_vector tras postproceso: resúmenes IA de longitud variable."""
+    rnd = random.Random(semilla)
+    textos = []
+    for i in range(n):
+        resumen = " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(8, 140)))
+        textos.append(f"Title: Juego {i}. Genres: {', '.join(rnd.sample(GENEROS, rnd.randint(1, 5)))}. "
+                      f"Tags: {', '.join(rnd.sample(TAGS, rnd.randint(2, 10)))}. Details: {resumen}.")
+    return textos
+
+
+def textos_ndjson(ruta, n):
+    textos = []
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                textos.append(vectorizador.texto_vector(json.loads(linea)))
+                if len(textos) == n:
+                    break
+    return textos
+
+
+def padding(longitudes, lotes):
+    """% de posiciones de relleno: sum(len(lote) * max - sum) / sum(len(lote) * max)."""
+    posiciones = relleno = 0
+    for indices in lotes:
+        maximo = max(longitudes[i] for i in indices)
+        posiciones += maximo * len(indices)
+        relleno += maximo * len(indices) - sum(longitudes[i] for i in indices)
+    return relleno / posiciones * 100
+
+
+def en_orden(modelo, textos, tamano_lote):
+    """Lotes consecutivos en el orden de entrada (un encode() por lote)."""
+    partes = [modelo.encode(textos[i:i + tamano_lote], batch_size=tamano_lote, convert_to_numpy=True,
+                            show_progress_bar=False)
+              for i in range(0, len(textos), tamano_lote)]
+    return np.concatenate(partes)
+
+
+def cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return time.perf_counter() - inicio, resultado
+
+
+def coseno_minimo(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return float(np.min(np.sum(a * b, axis=1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modelo', default=vectorizador.MODEL_NAME)
+    parser.add_argument('--ndjson', help="steam-games-data.ndjson real en vez de textos sintéticos")
+    parser.add_argument('--textos', type=int, default=2000)
+    parser.add_argument('--muestra', type=int, default=256, help="Textos de la referencia de lote 1")
+    parser.add_argument('--lotes', default='8,16,32,64,128')
+    args = parser.parse_args()
+
+    modelo = SentenceTransformer(args.modelo, device='cpu')
+    textos = textos_ndjson(args.ndjson, args.textos) if args.ndjson else textos_sinteticos(args.textos)
+    longitudes = vectorizador.longitudes_tokens(modelo, textos)
+    print(f"[*] Modelo: {args.modelo} | {len(textos)} textos | tokens: media {np.mean(longitudes):.0f}, "
+          f"máx {max(longitudes)} (max_seq_length {modelo.max_seq_length}) | hilos torch: {torch.get_num_threads()}")
+
+    # Calentamiento (primera llamada: asignaciones y kernels)
+    modelo.encode(textos[:16], batch_size=16, show_progress_bar=False)
+
+    muestra = textos[:args.muestra]
+    t, referencia = cronometrar(lambda: np.stack([modelo.encode(texto) for texto in muestra]))
+    base = len(muestra) / t
+    print(f"{'lote':>6}  {'orden':<22}{'textos/s':>10}{'x lote 1':>10}{'padding':>10}")
+    print(f"{1:>6}  {'encode por juego':<22}{base:>10.1f}{1:>10.2f}{0:>9.0f}%")
+
+    orden = sorted(range(len(textos)), key=longitudes.__getitem__)
+    for tamano_lote in (int(n) for n in args.lotes.split(',') if n):
+        consecutivos = [range(i, min(i + tamano_lote, len(textos))) for i in range(0, len(textos), tamano_lote)]
+        ordenados = [orden[i:i + tamano_lote] for i in range(0, len(orden), tamano_lote)]
+        t_orden, _ = cronometrar(en_orden, modelo, textos, tamano_lote)
+        t_ord, vectores = cronometrar(vectorizador.codificar, modelo, textos, tamano_lote)
+        for etiqueta, t, lotes in (("en orden de entrada", t_orden, consecutivos),
+                                   ("ordenado por tokens", t_ord, ordenados)):
+            print(f"{tamano_lote:>6}  {etiqueta:<22}{len(textos) / t:>10.1f}{len(textos) / t / base:>10.2f}"
+                  f"{padding(longitudes, lotes):>9.0f}%")
+        print(f"        coseno mínimo con lote 1: {coseno_minimo(vectores[:len(muestra)], referencia):.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: escalado de vectorizador.py con 1, 2, 4 y N procesos de
+codificación (N = CPUs disponibles), cada uno con torch limitado a
+CPUs / procesos hilos.
+
+Uso:
+  python benchmarks/bench_vectorizador_procesos.py                    # 2000 juegos sintéticos
+  python benchmarks/bench_vectorizador_procesos.py --procesos 1,2,4,8 --juegos 5000
+  python benchmarks/bench_vectorizador_procesos.py --ndjson data/steam-games-data.ndjson
+  python benchmarks/bench_vectorizador_procesos.py --modelo /ruta/a/un/modelo/local
+
+Ejecuta procesar_pipeline() completo (lectura, pool, escritura en orden)
+sobre una copia en un directorio temporal. El tiempo incluye arrancar los
+procesos y cargar el modelo en cada uno, que es lo que paga el pipeline.
+Comprueba que cada salida tiene los mismos juegos, en el mismo orden y con
+los mismos vectores (coseno mínimo) que la de 1 proceso.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import vectorizador
+
+PALABRAS = ("explora", "un", "mundo", "abierto", "lleno", "de", "secretos", "y", "forja", "tu", "destino",
+            "en", "una", "aventura", "épica", "combate", "táctico", "por", "turnos", "construye", "base",
+            "sobrevive", "a", "la", "noche", "con", "amigos", "cooperativo", "online", "historia")
+GENEROS = ("Acción", "Aventura", "Indie", "Rol", "Estrategia", "Simulación", "Casual", "Deportes", "Carreras")
+TAGS = ("Un jugador", "Multijugador", "Cooperativo", "Mundo abierto", "Pixel art", "Roguelike", "Supervivencia",
+        "Construcción", "Terror", "Ciencia ficción", "Fantasía", "Difícil", "Atmosférico", "Gestión de recursos")
+
+
+def generar(ruta, n, semilla=7):
+    rnd = random.Random(semilla)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for appid in range(10, 10 + n):
+            resumen = " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(8, 140)))
+            f.write(json.dumps({"steam_id": appid, "name": f"Juego {appid}",
+                                "genres": rnd.sample(GENEROS, rnd.randint(1, 5)),
+                                "categories": rnd.sample(TAGS, rnd.randint(2, 10)),
+                                "detailed_description": f"<p>{resumen}.</p>"}, ensure_ascii=False) + "\n")
+
+
+def leer_vectores(ruta):
+    ids, vectores = [], []
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            juego = json.loads(linea)
+            ids.append(juego['steam_id'])
+            vectores.append(juego['vector_embedding'])
+    return ids, np.asarray(vectores, dtype=np.float32)
+
+
+def coseno_minimo(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return float(np.min(np.sum(a * b, axis=1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modelo', default=vectorizador.MODEL_NAME)
+    parser.add_argument('--ndjson', help="steam-games-data.ndjson real (se copia, no se modifica)")
+    parser.add_argument('--juegos', type=int, default=2000)
+    parser.add_argument('--procesos', help="Separados por comas (por defecto 1,2,4,N)")
+    parser.add_argument('--lote', type=int, default=vectorizador.TAMANO_LOTE)
+    parser.add_argument('--bloque', type=int, default=vectorizador.TAMANO_BLOQUE)
+    args = parser.parse_args()
+
+    cpus = vectorizador.cpus_disponibles()
+    procesos = ([int(p) for p in args.procesos.split(',') if p] if args.procesos
+                else sorted({1, 2, 4, cpus}))
+
+    directorio = tempfile.mkdtemp(prefix='bench-vectorizador-')
+    vectorizador.ARCHIVO_RAW = os.path.join(directorio, 'steam-games-data.ndjson')
+    if args.ndjson:
+        shutil.copyfile(args.ndjson, vectorizador.ARCHIVO_RAW)
+    else:
+        generar(vectorizador.ARCHIVO_RAW, args.juegos)
+    with open(vectorizador.ARCHIVO_RAW, 'rb') as f:
+        juegos = sum(1 for linea in f if linea.strip())
+
+    print(f"[*] {juegos} juegos | CPUs disponibles: {cpus} | lote {args.lote} | bloque {args.bloque}")
+    print(f"{'procesos':>9}{'hilos/proc':>12}{'s':>9}{'juegos/s':>10}{'x 1 proc':>10}{'coseno mín':>12}")
+    base = referencia = None
+    for n in procesos:
+        vectorizador.ARCHIVO_FINAL = os.path.join(directorio, f'vect-{n}.ndjson')
+        inicio = time.perf_counter()
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            vectorizador.procesar_pipeline(args.lote, args.bloque, n, args.modelo, usar_cache=False)
+        t = time.perf_counter() - inicio
+        ids, vectores = leer_vectores(vectorizador.ARCHIVO_FINAL)
+        if referencia is None:
+            base, referencia = t, (ids, vectores)
+        coseno = coseno_minimo(vectores, referencia[1]) if ids == referencia[0] else float('nan')
+        print(f"{n:>9}{max(1, cpus // n):>12}{t:>9.1f}{juegos / t:>10.1f}{base / t:>10.2f}{coseno:>12.6f}")
+
+    shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga de los scrapers contra benchmarks/mock_steam.py: throughput,
+latencia de cola y reintentos de gameid-script.py, sacar-datos-games.py y
+obtener_tags_populares, sin tocar Steam ni data/.
+
+Uso:
+  python benchmarks/carga_scrapers.py                                   # escenario "realista"
+  python benchmarks/carga_scrapers.py --escenario hostil --juegos 300
+  python benchmarks/carga_scrapers.py --latencia lognormal:0.1:0.8 --p429 0.05 --ptimeout 0.01
+  python benchmarks/carga_scrapers.py --scrapers datos,tags --tasa-inicial 20 --tasa-maxima 50
+  python benchmarks/carga_scrapers.py --url http://127.0.0.1:8765     # mock_steam.py ya lanzado
+
+Cada scraper se carga como módulo con STEAM_STORE_URL apuntando al mock y
+sus archivos de entrada/salida, la caché de respuestas y el log de métricas
+en un directorio temporal. Se mide en el cliente (latencia de cada petición
+hasta las cabeceras, estados, excepciones, peticiones repetidas) y en el
+mock (fallos inyectados). El mock corre en otro proceso para no competir
+por el GIL con el scraper.
+
+Los scrapers usan su limitador tal cual (tasa inicial, máxima y pausa de
+backoff), así que con 429 frecuentes lo que se mide es sobre todo la pausa;
+--tasa-inicial/--tasa-maxima/--pausa-backoff/--timeout/--pausa-reintento permiten
+probar otros valores.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import requests
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(SCRAPER_DIR, 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+import cache_steam
+import filtro_juegos
+import indice_ndjson
+
+MOCK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mock_steam.py')
+
+# Escenarios predefinidos; cualquier opción explícita los sobreescribe
+ESCENARIOS = {
+    "limpio":   {"latencia": "fija:0.02", "p429": 0.0, "perror": 0.0, "ptimeout": 0.0, "pmalformado": 0.0},
+    "realista": {"latencia": "lognormal:0.08:0.6", "p429": 0.01, "perror": 0.005, "ptimeout": 0.002, "pmalformado": 0.002},
+    "hostil":   {"latencia": "lognormal:0.25:0.9", "p429": 0.05, "perror": 0.02, "ptimeout": 0.01, "pmalformado": 0.01},
+}
+SCRAPERS = ("gameid", "datos", "tags")
+
+
+# =================================================================
+# MEDICIÓN EN EL CLIENTE
+# =================================================================
+class Medidor:
+    """Latencias, estados y repeticiones de las peticiones de un scraper (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencias = []
+        self.estados = Counter()
+        self.errores = Counter()
+        self.por_peticion = Counter()
+        self.inicio = time.perf_counter()
+
+    def anotar(self, clave, segundos, status=None, error=None):
+        with self._lock:
+            self.latencias.append(segundos)
+            self.por_peticion[clave] += 1
+            if error:
+                self.errores[error] += 1
+            else:
+                self.estados[status] += 1
+
+
+class SesionMedida(requests.Session):
+    """requests.Session que anota cada petición en un Medidor."""
+
+    def __init__(self, medidor):
+        super().__init__()
+        self.medidor = medidor
+
+    def request(self, method, url, params=None, **kwargs):
+        clave = f"{method} {url}?{urlencode(sorted((params or {}).items()))}"
+        inicio = time.perf_counter()
+        try:
+            resp = super().request(method, url, params=params, **kwargs)
+        except requests.RequestException as e:
+            self.medidor.anotar(clave, time.perf_counter() - inicio, error=type(e).__name__)
+            raise
+        self.medidor.anotar(clave, time.perf_counter() - inicio, status=resp.status_code)
+        return resp
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+# =================================================================
+# MOCK
+# =================================================================
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def pedir_json(url):
+    with urllib.request.urlopen(url, timeout=10) as resp:
+        return json.load(resp)
+
+
+def lanzar_mock(args):
+    """Arranca mock_steam.py en otro proceso y espera a que responda."""
+    puerto = puerto_libre()
+    comando = [sys.executable, MOCK, '--puerto', str(puerto), '--juegos', str(args.juegos),
+               '--latencia', args.latencia, '--p429', str(args.p429), '--perror', str(args.perror),
+               '--ptimeout', str(args.ptimeout), '--pmalformado', str(args.pmalformado),
+               '--cuelgue', str(args.cuelgue), '--semilla', str(args.semilla)]
+    if args.grabaciones:
+        comando += ['--grabaciones', args.grabaciones]
+    proceso = subprocess.Popen(comando, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{puerto}"
+    for _ in range(100):
+        try:
+            pedir_json(url + '/__stats')
+            return proceso, url
+        except OSError:
+            if proceso.poll() is not None:
+                raise RuntimeError("mock_steam.py no ha arrancado")
+            time.sleep(0.1)
+    proceso.terminate()
+    raise RuntimeError("mock_steam.py no responde")
+
+
+# =================================================================
+# CARGA DE LOS SCRAPERS
+# =================================================================
+def cargar_script(archivo, nombre, medidor, args):
+    """
+    Importa un script de scripts/ como módulo nuevo (limitador y contadores
+    a cero) con las sesiones instrumentadas y los ajustes de la prueba.
+    """
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(SCRIPTS_DIR, archivo))
+    modulo = importlib.util.module_from_spec(spec)
+    # El pool de parseo (procesos) importa procesar_juego_elk por nombre de módulo
+    sys.modules[nombre] = modulo
+    with silenciar(args):
+        spec.loader.exec_module(modulo)
+
+    local = threading.local()
+
+    def obtener_sesion():
+        if not hasattr(local, 'sesion'):
+            local.sesion = SesionMedida(medidor)
+        return local.sesion
+
+    modulo.obtener_sesion = obtener_sesion
+    if args.tasa_inicial or args.tasa_maxima or args.pausa_backoff is not None:
+        previo = modulo.LIMITADOR
+        modulo.LIMITADOR = modulo.LimitadorAIMD(
+            tasa_inicial=args.tasa_inicial or previo.tasa,
+            tasa_max=args.tasa_maxima or previo.tasa_max,
+            pausa_backoff=previo.pausa_backoff if args.pausa_backoff is None else args.pausa_backoff,
+        )
+    if args.timeout:
+        modulo.TIMEOUT = args.timeout
+    return modulo
+
+
+def correr_gameid(args, directorio, medidor):
+    m = cargar_script('gameid-script.py', 'gameid_script', medidor, args)
+    etapas = [('CCU_DESC', args.juegos, "Mas Jugados (Trends)"), ('', args.juegos, "Por Relevancia (Iconicos)")]
+    with silenciar(args):
+        listas = m.obtener_listas_steam(etapas)
+
+    maestro = {}
+    for lista in listas:
+        maestro.update(lista)
+    # Entrada para sacar-datos-games.py, como la escribe gameid-script.py
+    with open(os.path.join(directorio, 'steam-top-games.json'), 'w', encoding='utf-8') as f:
+        json.dump([{"appid": int(a), "name": fila['title']} for a, fila in maestro.items()], f, ensure_ascii=False)
+    with open(os.path.join(directorio, 'steam-search-rows.json'), 'w', encoding='utf-8') as f:
+        json.dump({a: {k: v for k, v in fila.items() if k not in ('appid', 'title')} for a, fila in maestro.items()}, f)
+
+    objetivo = len(set(pedir_json(args.url + '/__catalogo')))
+    return {"unidad": "juegos", "ok": len(maestro), "fallidos": max(0, objetivo - len(maestro)),
+            "limitador": m.LIMITADOR}
+
+
+def preparar_entrada(args, directorio):
+    """Sin gameid en la prueba, la entrada es el catálogo del mock."""
+    ruta = os.path.join(directorio, 'steam-top-games.json')
+    if not os.path.exists(ruta):
+        appids = pedir_json(args.url + '/__catalogo')[:args.juegos]
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump([{"appid": a, "name": f"Juego {a}"} for a in appids], f)
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return [j['appid'] for j in json.load(f)]
+
+
+def correr_datos(args, directorio, medidor):
+    appids = preparar_entrada(args, directorio)
+    m = cargar_script('sacar-datos-games.py', 'sacar_datos_games', medidor, args)
+    m.ARCHIVO_ENTRADA = os.path.join(directorio, 'steam-top-games.json')
+    m.ARCHIVO_FILAS = os.path.join(directorio, 'steam-search-rows.json')
+    m.ARCHIVO_SALIDA = os.path.join(directorio, 'steam-games-data.ndjson')
+    m.ARCHIVO_HUELLAS = os.path.join(directorio, 'steam-search-rows-procesadas.json')
+    m.ARCHIVO_FRESCURA = os.path.join(directorio, 'steam-games-frescura.json')
+    m.ARCHIVO_TAGS = os.path.join(directorio, 'steam-tags-cache.json')
+    m.ARCHIVO_FALLIDOS = os.path.join(directorio, 'steam-games-fallidos.json')
+    if args.pausa_reintento is not None:
+        m.PAUSA_REINTENTO = args.pausa_reintento
+    if multiprocessing.get_start_method() != 'fork':
+        # Con spawn los procesos hijos no ven el módulo cargado a mano
+        m.PROCESOS_PARSEO = 0
+
+    argv = sys.argv
+    sys.argv = ['sacar-datos-games.py']
+    try:
+        with silenciar(args):
+            m.main()
+    finally:
+        sys.argv = argv
+
+    escritos = len(indice_ndjson.ids_ndjson(m.ARCHIVO_SALIDA))
+    with open(m.ARCHIVO_FALLIDOS, 'r', encoding='utf-8') as f:
+        sin_resolver = len(json.load(f))
+    # Los que appdetails marcó como DLC/música no se escriben, pero no son fallos
+    excluidos = len(filtro_juegos.cargar_excluidos())
+    return {"unidad": "juegos", "ok": escritos, "fallidos": len(appids) - escritos - excluidos,
+            "limitador": m.LIMITADOR,
+            "extra": f"páginas de tienda: {m.BYTES_TIENDA['leidos'] / 1024:.0f} KB leídos, "
+                     f"{m.BYTES_TIENDA['ahorrados'] / 1024:.0f} KB ahorrados | "
+                     f"excluidos por tipo: {excluidos} | "
+                     f"sin resolver tras el reintento diferido: {sin_resolver}"}
+
+
+def correr_tags(args, directorio, medidor, previas=None):
+    """Tags de todos los appids; con `previas` (la pasada anterior) son revalidaciones condicionales."""
+    appids = preparar_entrada(args, directorio)
+    m = cargar_script('sacar-datos-games.py', 'sacar_datos_games', medidor, args)
+    previas = previas or {}
+    with ThreadPoolExecutor(max_workers=m.MAX_HILOS_TAGS) as executor:
+        resultados = list(executor.map(lambda a: m.obtener_tags_populares(a, previas.get(a), -1), appids))
+    estados = Counter(estado for estado, _ in resultados)
+    entradas = {a: entrada for a, (estado, entrada) in zip(appids, resultados) if entrada}
+    return {"unidad": "páginas", "ok": len(appids) - estados['ERROR'], "fallidos": estados['ERROR'],
+            "limitador": m.LIMITADOR, "entradas": entradas,
+            "extra": " | ".join(f"{k}: {v}" for k, v in sorted(estados.items()))}
+
+
+@contextlib.contextmanager
+def silenciar(args):
+    if args.verbose:
+        yield
+        return
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+# =================================================================
+# INFORME
+# =================================================================
+def resumir(nombre, resultado, medidor, duracion, servidor):
+    lat = [s * 1000 for s in medidor.latencias]
+    peticiones = len(lat)
+    repetidas = [n for n in medidor.por_peticion.values() if n > 1]
+    limitador = resultado["limitador"]
+    return {
+        "scraper": nombre,
+        "duracion_s": round(duracion, 2),
+        "ok": resultado["ok"],
+        "fallidos": resultado["fallidos"],
+        "unidad": resultado["unidad"],
+        "items_s": round(resultado["ok"] / duracion, 2) if duracion else 0.0,
+        "peticiones": peticiones,
+        "req_s": round(peticiones / duracion, 2) if duracion else 0.0,
+        "latencia_ms": {f"p{p}": round(percentil(lat, p), 1) for p in (50, 90, 95, 99)} | {"max": round(max(lat, default=0), 1)},
+        "estados": {str(k): v for k, v in sorted(medidor.estados.items())},
+        "excepciones": dict(medidor.errores),
+        "reintentos": sum(n - 1 for n in repetidas),
+        "peticiones_reintentadas": len(repetidas),
+        "max_intentos": max(repetidas, default=1),
+        "backoffs": limitador.backoffs,
+        "tasa_final": round(limitador.tasa, 2),
+        "inyectados": servidor.get("inyectados", {}),
+        "extra": resultado.get("extra", ""),
+    }
+
+
+def imprimir(r):
+    lat = r["latencia_ms"]
+    print(f"\n[*] {r['scraper']}: {r['ok']} {r['unidad']} en {r['duracion_s']}s ({r['items_s']} {r['unidad']}/s) "
+          f"| {r['fallidos']} fallidos")
+    print(f"    peticiones: {r['peticiones']} ({r['req_s']} req/s) | latencia ms: p50 {lat['p50']} | p90 {lat['p90']} "
+          f"| p95 {lat['p95']} | p99 {lat['p99']} | max {lat['max']}")
+    estados = " ".join(f"{k}:{v}" for k, v in r["estados"].items()) or "-"
+    excepciones = " ".join(f"{k}:{v}" for k, v in r["excepciones"].items()) or "-"
+    print(f"    estados: {estados} | excepciones: {excepciones}")
+    print(f"    reintentos: {r['reintentos']} ({r['peticiones_reintentadas']} peticiones, máx {r['max_intentos']} intentos) "
+          f"| backoffs del limitador: {r['backoffs']} | tasa final: {r['tasa_final']} req/s")
+    inyectados = " ".join(f"{k}:{v}" for k, v in sorted(r["inyectados"].items())) or "-"
+    print(f"    inyectado por el mock: {inyectados}")
+    if r["extra"]:
+        print(f"    {r['extra']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escenario', choices=sorted(ESCENARIOS), default='realista')
+    parser.add_argument('--scrapers', default=",".join(SCRAPERS), help=f"Lista separada por comas de: {', '.join(SCRAPERS)}")
+    parser.add_argument('--juegos', type=int, default=200, help="Tamaño del catálogo (y juegos por criterio en gameid)")
+    parser.add_argument('--url', help="URL de un mock_steam.py ya lanzado (por defecto se lanza uno)")
+    parser.add_argument('--latencia')
+    parser.add_argument('--p429', type=float)
+    parser.add_argument('--perror', type=float)
+    parser.add_argument('--ptimeout', type=float)
+    parser.add_argument('--pmalformado', type=float)
+    parser.add_argument('--cuelgue', type=float, default=35.0)
+    parser.add_argument('--grabaciones', help="Directorio de respuestas grabadas para el mock")
+    parser.add_argument('--semilla', type=int, default=7)
+    parser.add_argument('--tasa-inicial', type=float, help="Tasa inicial del limitador (req/s)")
+    parser.add_argument('--tasa-maxima', type=float, help="Tasa máxima del limitador (req/s)")
+    parser.add_argument('--pausa-backoff', type=float, help="Pausa global tras un 429/5xx (s)")
+    parser.add_argument('--timeout', type=float, help="Timeout de las peticiones de los scrapers (s)")
+    parser.add_argument('--pausa-reintento', type=float, help="Espera antes del reintento diferido de fallidos (s)")
+    parser.add_argument('--json', help="Guarda los resultados en este archivo")
+    parser.add_argument('--conservar', action='store_true', help="No borra el directorio temporal con las salidas")
+    parser.add_argument('--verbose', action='store_true', help="Muestra la salida de los scrapers")
+    args = parser.parse_args()
+
+    for clave, valor in ESCENARIOS[args.escenario].items():
+        if getattr(args, clave) is None:
+            setattr(args, clave, valor)
+    scrapers = [s.strip() for s in args.scrapers.split(',') if s.strip()]
+    desconocidos = set(scrapers) - set(SCRAPERS)
+    if desconocidos:
+        parser.error(f"scrapers desconocidos: {', '.join(sorted(desconocidos))}")
+
+    directorio = tempfile.mkdtemp(prefix='carga-scrapers-')
+    # Antes de cargar los scripts: su logging.basicConfig ya no tocará logs/
+    logging.basicConfig(filename=os.path.join(directorio, 'metricas.log'), level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+    cache_steam.CACHE_DIR = os.path.join(directorio, 'cache')
+    filtro_juegos.ARCHIVO_EXCLUIDOS = os.path.join(directorio, 'steam-excluidos.json')
+
+    proceso = None
+    if not args.url:
+        proceso, args.url = lanzar_mock(args)
+    os.environ['STEAM_STORE_URL'] = args.url
+
+    print(f"[*] Mock: {args.url} | escenario: {args.escenario} | latencia: {args.latencia} | 429: {args.p429} "
+          f"| 503: {args.perror} | cuelgues: {args.ptimeout} | malformadas: {args.pmalformado}")
+    print(f"[*] Juegos: {args.juegos} | scrapers: {', '.join(scrapers)} | directorio de trabajo: {directorio}")
+
+    ejecuciones = []
+    for nombre in scrapers:
+        if nombre == 'gameid':
+            ejecuciones.append(('gameid-script', lambda med: correr_gameid(args, directorio, med)))
+        elif nombre == 'datos':
+            ejecuciones.append(('sacar-datos-games', lambda med: correr_datos(args, directorio, med)))
+        else:
+            previas = {}
+
+            def primera(med, previas=previas):
+                resultado = correr_tags(args, directorio, med)
+                previas.update(resultado["entradas"])
+                return resultado
+
+            ejecuciones.append(('obtener_tags_populares', primera))
+            ejecuciones.append(('obtener_tags_populares (304)',
+                                lambda med, previas=previas: correr_tags(args, directorio, med, previas)))
+
+    resultados = []
+    try:
+        for nombre, correr in ejecuciones:
+            pedir_json(args.url + '/__stats?reiniciar=1')
+            medidor = Medidor()
+            inicio = time.perf_counter()
+            resultado = correr(medidor)
+            duracion = time.perf_counter() - inicio
+            resultados.append(resumir(nombre, resultado, medidor, duracion, pedir_json(args.url + '/__stats')))
+            imprimir(resultados[-1])
+    finally:
+        if proceso:
+            proceso.terminate()
+            proceso.wait()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"escenario": args.escenario, "juegos": args.juegos, "resultados": resultados},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n[DONE] Resultados en {args.json}")
+    if args.conservar:
+        print(f"[INFO] Salidas y log de métricas en {directorio}")
+    else:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
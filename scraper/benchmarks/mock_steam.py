@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita los endpoints de Steam que usan los scrapers, para
+medir gameid-script.py, sacar-datos-games.py y obtener_tags_populares sin
+tocar Steam (ni arriesgar un baneo).
+
+Endpoints:
+  /search/results/   JSON con results_html (filas como las de Steam) y total_count;
+                     sort_by=CCU_DESC y relevancia dan órdenes distintos del catálogo
+  /api/appdetails/   appdetails de uno o varios appids, con filters=price_overview
+                     y filters=recommendations
+  /app/<appid>/      página de tienda con el bloque popular_tags; manda ETag,
+                     Last-Modified y Content-Length y responde 304 a las condicionales
+  /__stats           contadores del servidor en JSON (?reiniciar=1 los pone a cero)
+  /__catalogo        appids del catálogo en JSON
+
+Fallos inyectables (probabilidad por petición, excepto /__*):
+  --p429          429 con Retry-After
+  --perror        503
+  --ptimeout      la respuesta se retrasa --cuelgue segundos (más que el timeout del cliente)
+  --pmalformado   200 con el cuerpo cortado a la mitad (JSON inválido / HTML sin cerrar)
+  --fallar        appids (separados por comas) cuyo appdetails completo responde siempre 503
+
+Latencias (segundos, antes de cada respuesta):
+  ninguna | fija:S | uniforme:MIN:MAX | lognormal:MEDIANA:SIGMA
+
+Respuestas grabadas (si las hay se sirven en lugar de las sintéticas):
+  --grabaciones DIR   appdetails-<appid>.json (bench_limpieza_html.py --grabar)
+                      y app-<appid>.html
+  --cache             respuestas de appdetails y páginas de tienda de cache/respuestas
+
+Uso:
+  python benchmarks/mock_steam.py --puerto 8765 --juegos 2000 --latencia lognormal:0.08:0.6 --p429 0.03
+  STEAM_STORE_URL=http://127.0.0.1:8765 python scripts/sacar-datos-games.py   # ¡escribe en data/!
+
+Para medir los scrapers sin tocar data/ está benchmarks/carga_scrapers.py.
+"""
+
+import argparse
+import glob
+import html
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'scripts'))
+
+import cache_steam
+
+RESULTADOS_POR_PAGINA = 50
+MESES = ("ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC")
+GENEROS = ("Acción", "Aventura", "Rol", "Estrategia", "Simuladores", "Indie", "Deportes", "Carreras", "Casual")
+CATEGORIAS = ("Un jugador", "Multijugador", "Cooperativo", "Logros de Steam", "Mando completo", "Steam Cloud")
+TAGS = ("Mundo abierto", "RPG", "Supervivencia", "Multijugador", "Acción", "Difícil", "Pixel Art",
+        "Roguelike", "Estrategia", "Atmosférico", "Gran banda sonora", "Cooperativo", "Terror")
+RESENAS = ("Overwhelmingly Positive", "Very Positive", "Mostly Positive", "Mixed", "Mostly Negative")
+
+PARRAFO = ("Explora un mundo abierto lleno de secretos, combate a criaturas legendarias y "
+           "forja tu propio destino en una aventura épica con más de 100 horas de campaña.")
+
+FILA_BUSQUEDA = (
+    '<a href="https://store.steampowered.com/app/{appid}/Juego_{appid}/?snr=1_7_7_230_150_1" '
+    ' data-ds-appid="{appid}" data-ds-itemkey="App_{appid}" data-ds-tagids="[1663,1774,3859]" '
+    'class="search_result_row ds_collapse_flag " data-search-page="1" data-gpnav="item">\n'
+    '    <div class="col search_capsule"><img src="https://shared.cloudflare.steamstatic.com/'
+    'store_item_assets/steam/apps/{appid}/capsule_sm_120.jpg"></div>\n'
+    '    <div class="responsive_search_name_combined">\n'
+    '        <div class="col search_name ellipsis"><span class="title">{titulo}</span></div>\n'
+    '        <div class="col search_released responsive_secondrow">{lanzamiento}</div>\n'
+    '        <div class="col search_reviewscore responsive_secondrow">\n'
+    '            <span class="search_review_summary positive" data-tooltip-html="{resena}&lt;br&gt;'
+    '{pct}% of the {resenas:,} user reviews for this game are positive."></span>\n'
+    '        </div>\n'
+    '        <div class="col search_price_discount_combined responsive_secondrow" data-price-final="{precio}">\n'
+    '            <div class="discount_block search_discount_block" data-price-final="{precio}" '
+    'data-bundlediscount="0" data-discount="{descuento}"></div>\n'
+    '        </div>\n'
+    '    </div>\n'
+    '</a>'
+)
+
+# Relleno de la página de tienda: cabecera con scripts antes del bloque de tags
+# y el resto de la página (reseñas, requisitos...) después
+_RELLENO = '<script>var g_rgAppContextData = {"730": {"appid": 730, "name": "Juego"}};</script>\n'
+
+
+def distribucion_latencia(spec):
+    """'ninguna' | 'fija:S' | 'uniforme:MIN:MAX' | 'lognormal:MEDIANA:SIGMA' -> función(rnd) -> segundos."""
+    nombre, *valores = spec.split(':')
+    try:
+        valores = [float(v) for v in valores]
+        if nombre == 'ninguna' and not valores:
+            return lambda rnd: 0.0
+        if nombre == 'fija':
+            segundos, = valores
+            return lambda rnd: segundos
+        if nombre == 'uniforme':
+            minimo, maximo = valores
+            return lambda rnd: rnd.uniform(minimo, maximo)
+        if nombre == 'lognormal':
+            mediana, sigma = valores
+            return lambda rnd: rnd.lognormvariate(math.log(mediana), sigma)
+    except ValueError:
+        pass
+    raise ValueError(f"Latencia no válida: '{spec}' (ninguna | fija:S | uniforme:MIN:MAX | lognormal:MEDIANA:SIGMA)")
+
+
+class Catalogo:
+    """Juegos sintéticos deterministas por appid, más las respuestas grabadas que haya."""
+
+    def __init__(self, juegos, semilla=7, kb_tienda=300):
+        rnd = random.Random(semilla)
+        self.appids = rnd.sample(range(10, max(juegos * 50, 1000)), juegos)
+        self.orden_relevancia = list(self.appids)
+        rnd.shuffle(self.orden_relevancia)
+        self.conjunto = set(self.appids)
+        self.appdetails_grabados = {}
+        self.tiendas_grabadas = {}
+        self._cabecera_tienda = _RELLENO * (kb_tienda * 1024 // 10 // len(_RELLENO))
+        self._pie_tienda = _RELLENO * (kb_tienda * 1024 * 9 // 10 // len(_RELLENO))
+
+    def cargar_grabaciones(self, directorio):
+        for ruta in glob.glob(os.path.join(directorio, 'appdetails-*.json')):
+            with open(ruta, 'r', encoding='utf-8') as f:
+                self._anadir_appdetails(f.read())
+        for ruta in glob.glob(os.path.join(directorio, 'app-*.html')):
+            appid = int(re.search(r'app-(\d+)\.html$', ruta).group(1))
+            with open(ruta, 'r', encoding='utf-8') as f:
+                self.tiendas_grabadas[appid] = f.read()
+        self._incluir_grabados()
+
+    def cargar_cache(self):
+        for entrada in cache_steam.iterar():
+            url, params = entrada.get('url', ''), entrada.get('params', {})
+            if entrada.get('status') != 200:
+                continue
+            if url.endswith('/api/appdetails/') and 'filters' not in params:
+                self._anadir_appdetails(entrada.get('body'))
+            else:
+                m = re.search(r'/app/(\d+)/', url)
+                if m:
+                    self.tiendas_grabadas[int(m.group(1))] = entrada.get('body') or ''
+        self._incluir_grabados()
+
+    def _anadir_appdetails(self, cuerpo):
+        try:
+            d = json.loads(cuerpo)
+        except (TypeError, ValueError):
+            return
+        for appid, entrada in (d or {}).items():
+            if (entrada or {}).get('success') and isinstance(entrada.get('data'), dict):
+                self.appdetails_grabados[int(appid)] = entrada['data']
+
+    def _incluir_grabados(self):
+        """Los appids grabados entran en el catálogo (al principio de ambos órdenes)."""
+        grabados = [a for a in self.appdetails_grabados if a not in self.conjunto]
+        self.appids = grabados + self.appids
+        self.orden_relevancia = grabados[::-1] + self.orden_relevancia
+        self.conjunto.update(grabados)
+
+    # --- Datos de cada juego ---
+    @staticmethod
+    def _juego(appid):
+        rnd = random.Random(appid)
+        gratis = rnd.random() < 0.1
+        inicial = 0 if gratis else rnd.choice((499, 999, 1499, 1999, 2999, 3999, 5999, 6999))
+        descuento = 0 if gratis else rnd.choice((0, 0, 0, 10, 25, 33, 50, 75))
+        return {
+            "rnd": rnd,
+            "nombre": f"Juego de prueba {appid} & amigos",
+            "gratis": gratis,
+            "inicial": inicial,
+            "final": inicial * (100 - descuento) // 100,
+            "descuento": descuento,
+            "dia": rnd.randint(1, 28), "mes": rnd.randrange(12), "anio": rnd.randint(2005, 2025),
+            "resenas": rnd.randint(50, 2_000_000),
+            # Algunas apps no son juegos (y su nombre no lo delata): solo
+            # appdetails lo dice, como pasa en Steam con muchos DLC
+            "tipo": "dlc" if appid % 37 == 0 else "music" if appid % 53 == 0 else "game",
+        }
+
+    def fila_busqueda(self, appid):
+        j = self._juego(appid)
+        return FILA_BUSQUEDA.format(
+            appid=appid, titulo=html.escape(j["nombre"]), precio=j["final"], descuento=j["descuento"],
+            lanzamiento=f'{j["dia"]} {MESES[j["mes"]].title()}, {j["anio"]}', resena=j["rnd"].choice(RESENAS),
+            pct=j["rnd"].randint(40, 99), resenas=j["resenas"],
+        )
+
+    def appdetails(self, appid, filtro=None):
+        """El `data` de appdetails (None si el appid no está en el catálogo)."""
+        if appid in self.appdetails_grabados:
+            data = self.appdetails_grabados[appid]
+        elif appid in self.conjunto:
+            data = self._appdetails_sintetico(appid)
+        else:
+            return None
+        if filtro == 'price_overview':
+            return {"price_overview": data["price_overview"]} if data.get("price_overview") else []
+        if filtro == 'recommendations':
+            return {"recommendations": data["recommendations"]} if data.get("recommendations") else []
+        return data
+
+    def _appdetails_sintetico(self, appid):
+        j = self._juego(appid)
+        rnd = j["rnd"]
+        parrafos = "".join(f'<p class="bb_paragraph">{PARRAFO}</p><br>' for _ in range(rnd.randint(3, 12)))
+        data = {
+            "type": j["tipo"],
+            "name": j["nombre"],
+            "steam_appid": appid,
+            "is_free": j["gratis"],
+            "detailed_description": (
+                f'<h2 class="bb_tag">Acerca del juego</h2>{parrafos}'
+                f'<img src="https://shared.akamai.steamstatic.com/store_item_assets/steam/apps/{appid}/extras/a.gif" /><br>'
+                '<ul class="bb_ul"><li><strong>Combate táctico:</strong> por turnos</li>'
+                '<li>&quot;Modo cooperativo&quot; &amp; online</li></ul>'
+            ),
+            "short_description": f"{PARRAFO[:120]} &mdash; edición &lt;Deluxe&gt;",
+            "pc_requirements": {
+                "minimum": '<strong>Mínimo:</strong><br><ul class="bb_ul"><li>SO: Windows 10<br></li>'
+                           '<li><strong>Procesador:</strong> Intel Core i5<br></li><li><strong>Memoria:</strong> 8 GB de RAM</li></ul>'
+            },
+            "developers": [f"Estudio {appid % 97}"],
+            "publishers": [f"Editora {appid % 31}"],
+            "genres": [{"id": str(i), "description": g} for i, g in enumerate(rnd.sample(GENEROS, 2))],
+            "categories": [{"id": i, "description": c} for i, c in enumerate(rnd.sample(CATEGORIAS, 3))],
+            "metacritic": {"score": rnd.randint(50, 97)},
+            "recommendations": {"total": j["resenas"] // 3},
+            "achievements": {"total": rnd.randint(0, 80), "highlighted": [{"name": "Primer paso"}, {"name": "Leyenda"}]},
+            "release_date": {"coming_soon": False, "date": f'{j["dia"]} {MESES[j["mes"]]}. {j["anio"]}'},
+            "header_image": f"https://shared.akamai.steamstatic.com/store_item_assets/steam/apps/{appid}/header.jpg",
+            "website": None,
+        }
+        if not j["gratis"]:
+            data["price_overview"] = {"currency": "EUR", "initial": j["inicial"], "final": j["final"],
+                                      "discount_percent": j["descuento"]}
+        return data
+
+    def pagina_tienda(self, appid):
+        """HTML de la página de tienda (None si el appid no está en el catálogo)."""
+        if appid in self.tiendas_grabadas:
+            return self.tiendas_grabadas[appid]
+        if appid not in self.conjunto:
+            return None
+        rnd = random.Random(appid)
+        tags = "".join(f'<a href="https://store.steampowered.com/tags/es/x/" class="app_tag" style="display: none;">\n'
+                       f'\t\t\t\t\t\t\t\t\t\t\t\t{t}\t\t\t\t\t\t\t\t\t\t\t\t</a>' for t in rnd.sample(TAGS, 8))
+        return (f'<!DOCTYPE html><html><head><title>{html.escape(self._juego(appid)["nombre"])} en Steam</title>'
+                f'{self._cabecera_tienda}</head><body>'
+                f'<div class="glance_tags popular_tags" data-appid="{appid}">{tags}'
+                f'<div class="app_tag add_button" onclick="ShowAppTagModal( {appid} )">+</div></div>'
+                f'</div>{self._pie_tienda}</body></html>')
+
+
+class ServidorSteamFalso:
+    """
+    Servidor HTTP/1.1 multihilo con el catálogo y los fallos configurados.
+    Lleva la cuenta de peticiones por endpoint, estados devueltos, fallos
+    inyectados y repeticiones de la misma petición (reintentos del cliente).
+    """
+
+    def __init__(self, juegos=1000, latencia='ninguna', p429=0.0, perror=0.0, ptimeout=0.0,
+                 pmalformado=0.0, cuelgue=35.0, kb_tienda=300, grabaciones=None, usar_cache=False,
+                 semilla=7, host='127.0.0.1', puerto=8765, fallar=()):
+        self.catalogo = Catalogo(juegos, semilla, kb_tienda)
+        if grabaciones:
+            self.catalogo.cargar_grabaciones(grabaciones)
+        if usar_cache:
+            self.catalogo.cargar_cache()
+        self.latencia = distribucion_latencia(latencia)
+        self.p429, self.perror, self.ptimeout, self.pmalformado = p429, perror, ptimeout, pmalformado
+        self.cuelgue = cuelgue
+        self.fallar = {str(a) for a in fallar}
+        self.last_modified = formatdate(time.time() - 86400, usegmt=True)
+        self._rnd = random.Random(semilla)
+        self._lock = threading.Lock()
+        self.reiniciar_estadisticas()
+
+        servidor = self
+
+        class Manejador(_ManejadorSteam):
+            mock = servidor
+
+        self.httpd = _ServidorHTTP((host, puerto), Manejador)
+        self._hilo = None
+
+    @property
+    def url(self):
+        host, puerto = self.httpd.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def iniciar(self):
+        """Sirve en un hilo aparte (para usarlo desde otro script)."""
+        self._hilo = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def parar(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # --- Estadísticas ---
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            self._peticiones = Counter()
+            self._estados = Counter()
+            self._inyectados = Counter()
+            self._por_peticion = Counter()
+            self._bytes = 0
+
+    def anotar(self, endpoint, clave, status, enviados=0):
+        with self._lock:
+            self._peticiones[endpoint] += 1
+            self._estados[f"{endpoint} {status}"] += 1
+            self._por_peticion[clave] += 1
+            self._bytes += enviados
+
+    def estadisticas(self):
+        with self._lock:
+            repetidas = [n for n in self._por_peticion.values() if n > 1]
+            return {
+                "peticiones": dict(self._peticiones),
+                "estados": dict(self._estados),
+                "inyectados": dict(self._inyectados),
+                "repeticiones": sum(n - 1 for n in repetidas),
+                "peticiones_repetidas": len(repetidas),
+                "max_repeticiones": max(repetidas, default=1),
+                "bytes_enviados": self._bytes,
+            }
+
+    def sortear_fallo(self):
+        """
+        (fallo, latencia): fallo es None, '429', '503', 'cuelgue' o 'malformada'.
+        Los fallos se cuentan al sortearlos (un cuelgue responde mucho después).
+        """
+        with self._lock:
+            r = self._rnd.random()
+            espera = self.latencia(self._rnd)
+            for fallo, p in (('429', self.p429), ('503', self.perror), ('cuelgue', self.ptimeout),
+                             ('malformada', self.pmalformado)):
+                if r < p:
+                    self._inyectados[fallo] += 1
+                    return fallo, espera
+                r -= p
+        return None, espera
+
+
+class _ServidorHTTP(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Los scrapers cortan conexiones a propósito (timeouts, lectura parcial de la tienda)
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+class _ManejadorSteam(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    mock = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        consulta = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path.startswith('/__'):
+                return self._interno(url.path, consulta)
+            if url.path.startswith('/search/results'):
+                endpoint = 'search'
+            elif url.path.startswith('/api/appdetails'):
+                endpoint = 'appdetails'
+            elif re.match(r'/app/\d+', url.path):
+                endpoint = 'app'
+            else:
+                return self._responder(404, b'', endpoint='otro', clave=url.path)
+
+            clave = f"{url.path}?{'&'.join(f'{k}={v}' for k, v in sorted(consulta.items()))}"
+            if (endpoint == 'appdetails' and 'filters' not in consulta
+                    and self.mock.fallar.intersection(consulta.get('appids', '').split(','))):
+                return self._responder(503, b'Service Unavailable', {}, endpoint, clave)
+            fallo, espera = self.mock.sortear_fallo()
+            time.sleep(espera)
+            if fallo == '429':
+                return self._responder(429, b'', {'Retry-After': '5'}, endpoint, clave)
+            if fallo == '503':
+                return self._responder(503, b'Service Unavailable', {}, endpoint, clave)
+            if fallo == 'cuelgue':
+                time.sleep(self.mock.cuelgue)
+
+            status, cuerpo, cabeceras = getattr(self, '_' + endpoint)(url.path, consulta)
+            if fallo == 'malformada' and status == 200:
+                cuerpo = cuerpo[:len(cuerpo) // 2]
+            self._responder(status, cuerpo, cabeceras, endpoint, clave)
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente cortó (timeout o lectura en streaming que ya tenía los tags)
+            self.close_connection = True
+
+    def _responder(self, status, cuerpo, cabeceras=None, endpoint=None, clave=None):
+        self.mock.anotar(endpoint, clave, status, len(cuerpo))
+        self.send_response(status)
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _interno(self, ruta, consulta):
+        if ruta == '/__stats':
+            cuerpo = self.mock.estadisticas()
+            if consulta.get('reiniciar'):
+                self.mock.reiniciar_estadisticas()
+        elif ruta == '/__catalogo':
+            cuerpo = self.mock.catalogo.appids
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        datos = json.dumps(cuerpo).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    # --- Endpoints de Steam ---
+    def _search(self, ruta, consulta):
+        catalogo = self.mock.catalogo
+        inicio = int(consulta.get('start', 0))
+        cantidad = int(consulta.get('count', RESULTADOS_POR_PAGINA))
+        orden = catalogo.appids if consulta.get('sort_by') == 'CCU_DESC' else catalogo.orden_relevancia
+        filas = "\n".join(catalogo.fila_busqueda(a) for a in orden[inicio:inicio + cantidad])
+        cuerpo = {"success": 1, "results_html": filas, "total_count": len(orden), "start": inicio}
+        return 200, json.dumps(cuerpo).encode('utf-8'), {'Content-Type': 'application/json'}
+
+    def _appdetails(self, ruta, consulta):
+        filtro = consulta.get('filters')
+        salida = {}
+        for appid in consulta.get('appids', '').split(','):
+            if not appid.strip().isdigit():
+                continue
+            data = self.mock.catalogo.appdetails(int(appid), filtro)
+            salida[appid] = {"success": True, "data": data} if data is not None else {"success": False}
+        cuerpo = json.dumps(salida, ensure_ascii=False).encode('utf-8')
+        return 200, cuerpo, {'Content-Type': 'application/json; charset=utf-8'}
+
+    def _app(self, ruta, consulta):
+        appid = int(re.match(r'/app/(\d+)', ruta).group(1))
+        pagina = self.mock.catalogo.pagina_tienda(appid)
+        if pagina is None:
+            # Steam redirige a la portada; para los scrapers es una página sin tags
+            return 302, b'', {'Location': '/'}
+        etag = f'"{appid:x}-1"'
+        cabeceras = {'ETag': etag, 'Last-Modified': self.mock.last_modified}
+        if (self.headers.get('If-None-Match') == etag
+                or self.headers.get('If-Modified-Since') == self.mock.last_modified):
+            return 304, b'', cabeceras
+        cabeceras['Content-Type'] = 'text/html; charset=UTF-8'
+        return 200, pagina.encode('utf-8'), cabeceras
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--juegos', type=int, default=1000, help="Tamaño del catálogo sintético")
+    parser.add_argument('--latencia', default='ninguna')
+    parser.add_argument('--p429', type=float, default=0.0)
+    parser.add_argument('--perror', type=float, default=0.0)
+    parser.add_argument('--ptimeout', type=float, default=0.0)
+    parser.add_argument('--pmalformado', type=float, default=0.0)
+    parser.add_argument('--cuelgue', type=float, default=35.0, help="Segundos que se retrasa una respuesta colgada")
+    parser.add_argument('--kb-tienda', type=int, default=300, help="Tamaño aproximado de la página de tienda sintética")
+    parser.add_argument('--grabaciones', help="Directorio con appdetails-<appid>.json / app-<appid>.html")
+    parser.add_argument('--cache', action='store_true', help="Sirve también las respuestas de cache/respuestas")
+    parser.add_argument('--semilla', type=int, default=7)
+    parser.add_argument('--fallar', default='', help="Appids cuyo appdetails completo responde siempre 503")
+    args = parser.parse_args()
+
+    try:
+        mock = ServidorSteamFalso(
+            juegos=args.juegos, latencia=args.latencia, p429=args.p429, perror=args.perror,
+            ptimeout=args.ptimeout, pmalformado=args.pmalformado, cuelgue=args.cuelgue,
+            kb_tienda=args.kb_tienda, grabaciones=args.grabaciones, usar_cache=args.cache,
+            semilla=args.semilla, host=args.host, puerto=args.puerto,
+            fallar=[a.strip() for a in args.fallar.split(',') if a.strip()],
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    catalogo = mock.catalogo
+    print(f"[*] Mock de Steam en {mock.url} | juegos: {len(catalogo.appids)} "
+          f"({len(catalogo.appdetails_grabados)} appdetails y {len(catalogo.tiendas_grabadas)} páginas grabadas)")
+    print(f"[*] Latencia: {args.latencia} | 429: {args.p429} | 503: {args.perror} | "
+          f"cuelgues: {args.ptimeout} ({args.cuelgue}s) | malformadas: {args.pmalformado}")
+    try:
+        mock.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.httpd.server_close()
+        print(f"\n[DONE] {json.dumps(mock.estadisticas(), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
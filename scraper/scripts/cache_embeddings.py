@@ -0,0 +1,168 @@
+"""
+Caché en disco de los embeddings de vectorizador.py.
+
+Cada vector se guarda con la clave blake2b-128(huella del modelo + texto
+exacto que se vectoriza). La huella es el nombre del modelo + su revisión:
+el commit del snapshot en la caché de Hugging Face, o un hash de los
+archivos si el modelo es un directorio local; con otro backend que no sea
+torch (p. ej. ONNX int8) se añade también la variante. Hay un archivo por huella,
+cache/embeddings/<huella>.bin, así que cambiar de modelo o de revisión
+invalida la caché sin hacer nada más; al guardar se borran los archivos de
+otras huellas.
+
+Formato: cabecera (MAGIA, VERSION, dimensión) y registros de tamaño fijo
+[clave 16 B][dimensión x float32]. Se carga con numpy de una vez y al
+guardar solo se conservan las entradas usadas en la ejecución (los juegos
+que salen del top no se acumulan).
+"""
+
+import hashlib
+import os
+import struct
+
+import numpy as np
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(SCRAPER_DIR, 'cache', 'embeddings')
+
+MAGIA = b'EMBC'
+VERSION = 1
+_CABECERA = struct.Struct('<4sHI')  # magia, versión, dimensión
+
+
+def _hash_archivos(directorio):
+    h = hashlib.blake2b(digest_size=16)
+    for raiz, carpetas, archivos in os.walk(directorio):
+        carpetas.sort()
+        for archivo in sorted(archivos):
+            ruta = os.path.join(raiz, archivo)
+            h.update(os.path.relpath(ruta, directorio).encode('utf-8') + b'\0')
+            with open(ruta, 'rb') as f:
+                for trozo in iter(lambda: f.read(1 << 20), b''):
+                    h.update(trozo)
+    return h.hexdigest()
+
+
+def revision_modelo(nombre):
+    """Revisión del modelo: commit del snapshot de HF, o hash de los archivos si es un directorio local."""
+    if os.path.isdir(nombre):
+        return _hash_archivos(nombre)
+    from huggingface_hub import snapshot_download
+    # Mismo nombre de repo que resuelve SentenceTransformer para los modelos cortos
+    repo = nombre if '/' in nombre else f"sentence-transformers/{nombre}"
+    try:
+        ruta = snapshot_download(repo, local_files_only=True)
+    except Exception:
+        ruta = snapshot_download(repo)
+    return os.path.basename(os.path.normpath(ruta))
+
+
+def huella_modelo(nombre, revision=None, variante=None):
+    """Huella de nombre + revisión (+ variante del backend, que cambia los vectores)."""
+    revision = revision or revision_modelo(nombre)
+    clave = f"{nombre}\0{revision}" + (f"\0{variante}" if variante else "")
+    return hashlib.blake2b(clave.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CacheEmbeddings:
+    """
+    Embeddings por texto para una huella de modelo.
+
+    buscar() rellena los vectores conocidos y dice qué textos faltan;
+    anadir() registra los recién calculados; guardar() reescribe el archivo
+    con lo usado en la ejecución (tmp + rename atómico).
+    """
+
+    def __init__(self, huella, directorio=None):
+        self.huella = huella
+        self.directorio = directorio or CACHE_DIR
+        self.ruta = os.path.join(self.directorio, f"{huella}.bin")
+        # La dimensión sale de la cabecera o de los primeros vectores añadidos
+        self.dimension = None
+        self._guardados = None
+        self._filas = {}
+        self._nuevos = {}
+        self._usadas = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    def _registro(self):
+        return np.dtype([('clave', 'V16'), ('vector', '<f4', (self.dimension,))])
+
+    def _clave(self, texto):
+        return hashlib.blake2b(self.huella.encode('ascii') + b'\0' + texto.encode('utf-8'),
+                               digest_size=16).digest()
+
+    def cargar(self):
+        if not os.path.exists(self.ruta):
+            return self
+        with open(self.ruta, 'rb') as f:
+            cabecera = f.read(_CABECERA.size)
+            if len(cabecera) < _CABECERA.size:
+                return self
+            magia, version, dimension = _CABECERA.unpack(cabecera)
+            if magia != MAGIA or version != VERSION:
+                return self
+            self.dimension = dimension
+            self._guardados = np.fromfile(f, dtype=self._registro())
+        self._filas = {fila.tobytes(): i for i, fila in enumerate(self._guardados['clave'])}
+        return self
+
+    def __len__(self):
+        return len(self._filas) + len(self._nuevos)
+
+    def buscar(self, textos):
+        """
+        (vectores, índices de los textos que no están). Las filas de los que
+        faltan quedan sin rellenar; vectores es None si la caché está vacía.
+        """
+        if self.dimension is None:
+            self.fallos += len(textos)
+            return None, list(range(len(textos)))
+        vectores = np.empty((len(textos), self.dimension), dtype=np.float32)
+        faltan = []
+        for i, texto in enumerate(textos):
+            clave = self._clave(texto)
+            fila = self._filas.get(clave)
+            if fila is not None:
+                vectores[i] = self._guardados['vector'][fila]
+                self._usadas[clave] = fila
+            elif clave in self._nuevos:
+                vectores[i] = self._nuevos[clave]
+                self._usadas[clave] = None
+            else:
+                faltan.append(i)
+        self.aciertos += len(textos) - len(faltan)
+        self.fallos += len(faltan)
+        return vectores, faltan
+
+    def anadir(self, textos, vectores):
+        if self.dimension is None and len(vectores):
+            self.dimension = len(vectores[0])
+        for texto, vector in zip(textos, vectores):
+            clave = self._clave(texto)
+            self._nuevos[clave] = np.array(vector, dtype=np.float32)
+            self._usadas[clave] = None
+
+    def guardar(self):
+        """Escribe las entradas usadas en esta ejecución y borra los archivos de otras huellas."""
+        if self.dimension is None:
+            return 0
+        os.makedirs(self.directorio, exist_ok=True)
+        registros = np.empty(len(self._usadas), dtype=self._registro())
+        for i, (clave, fila) in enumerate(self._usadas.items()):
+            registros['clave'][i] = clave
+            registros['vector'][i] = self._guardados['vector'][fila] if fila is not None else self._nuevos[clave]
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(_CABECERA.pack(MAGIA, VERSION, self.dimension))
+            registros.tofile(f)
+        os.replace(temporal, self.ruta)
+        for archivo in os.listdir(self.directorio):
+            if archivo.endswith('.bin') and archivo != os.path.basename(self.ruta):
+                os.remove(os.path.join(self.directorio, archivo))
+        return len(registros)
+
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total * 100 if total else 0.0
@@ -0,0 +1,76 @@
+"""
+Caché en disco de las respuestas crudas de Steam.
+
+Cada respuesta (JSON de appdetails o HTML de la página de tienda) se guarda
+comprimida con gzip en cache/respuestas/<xx>/<sha256>.json.gz, donde el hash
+sale de la URL + parámetros ordenados. Junto al cuerpo se guarda la fecha de
+descarga, así el modo --replay de sacar-datos-games.py puede reconstruir
+steam-games-data.ndjson sin tocar la red, y los benchmarks tienen fixtures
+reproducibles.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from urllib.parse import urlencode
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(SCRAPER_DIR, 'cache', 'respuestas')
+
+
+def clave(url, params=None):
+    """Hash estable de la petición (URL + parámetros ordenados)."""
+    consulta = urlencode(sorted((params or {}).items()))
+    return hashlib.sha256(f"{url}?{consulta}".encode('utf-8')).hexdigest()
+
+
+def _ruta(hash_peticion):
+    return os.path.join(CACHE_DIR, hash_peticion[:2], hash_peticion + '.json.gz')
+
+
+def guardar(url, params, status, cuerpo, fetched_at=None):
+    """Guarda una respuesta. Escritura atómica (tmp + rename)."""
+    hash_peticion = clave(url, params)
+    ruta = _ruta(hash_peticion)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+
+    entrada = {
+        "url": url,
+        "params": params or {},
+        "status": status,
+        "fetched_at": fetched_at or datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        "body": cuerpo,
+    }
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with gzip.open(temporal, 'wt', encoding='utf-8') as f:
+        json.dump(entrada, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def leer(url, params=None):
+    """Devuelve la entrada guardada ({url, params, status, fetched_at, body}) o None."""
+    ruta = _ruta(clave(url, params))
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with gzip.open(ruta, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def iterar():
+    """Recorre todas las entradas de la caché."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for subdir in sorted(os.listdir(CACHE_DIR)):
+        carpeta = os.path.join(CACHE_DIR, subdir)
+        for nombre in sorted(os.listdir(carpeta)):
+            if nombre.endswith('.json.gz'):
+                try:
+                    with gzip.open(os.path.join(carpeta, nombre), 'rt', encoding='utf-8') as f:
+                        yield json.load(f)
+                except (OSError, ValueError):
+                    continue
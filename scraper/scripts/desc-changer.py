@@ -2,6 +2,10 @@ import json
 import os
 import sys
 
+import indice_ndjson
+import snapshots
+from postproceso import resumen_de
+
 # Forzar que los prints se muestren inmediatamente (sin buffer)
 sys.stdout.reconfigure(line_buffering=True)
 
@@ -11,92 +15,106 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 # Configuración de archivos
 ARCHIVO_SUMMARY = os.path.join(PROJECT_ROOT, 'imp-futuras', 'data', 'summary.ndjson')
 ARCHIVO_STEAM_DATA = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-games-data.ndjson')
-ARCHIVO_BACKUP = os.path.join(PROJECT_ROOT, 'scraper', 'backups', 'steam-games-data-backup.ndjson')
+NOMBRE_SNAPSHOT = 'steam-games-data'
+
+# Unión en streaming: los resúmenes se consultan a través del índice de
+# summary.ndjson (mapeado en memoria) y steam-games-data.ndjson se recorre
+# línea a línea hacia un temporal que se renombra al final. La memoria no
+# depende del tamaño del dataset; las líneas sin resumen se copian tal cual.
+# En el pipeline lo hace postproceso.py junto con la limpieza de tags y HTML.
+
+
+def reemplazar_descripciones(resumenes, ruta_entrada, ruta_salida):
+    """
+    Escribe en ruta_salida el NDJSON de entrada con detailed_description
+    reemplazada por el resumen de cada appid. Retorna (contadores, appids con resumen usado).
+    """
+    contadores = {"total": 0, "reemplazadas": 0, "ya_al_dia": 0, "sin_resumen": 0, "ilegibles": 0}
+    usados = set()
+    with open(ruta_entrada, 'rb') as entrada, open(ruta_salida, 'wb') as salida:
+        for linea in entrada:
+            contenido = linea.rstrip(b'\r\n')
+            if not contenido.strip():
+                continue
+            contadores["total"] += 1
+            steam_id = indice_ndjson.appid_de_linea(contenido)
+            resumen = resumen_de(resumenes, steam_id) if steam_id is not None else None
+            if resumen is None:
+                contadores["sin_resumen"] += 1
+                salida.write(contenido + b"\n")
+                continue
+            usados.add(steam_id)
+            try:
+                juego = json.loads(contenido)
+            except ValueError:
+                contadores["ilegibles"] += 1
+                salida.write(contenido + b"\n")
+                continue
+            if juego.get('detailed_description') == resumen:
+                contadores["ya_al_dia"] += 1
+                salida.write(contenido + b"\n")
+                continue
+            juego['detailed_description'] = resumen
+            salida.write(json.dumps(juego, ensure_ascii=False).encode('utf-8') + b"\n")
+            contadores["reemplazadas"] += 1
+        salida.flush()
+        os.fsync(salida.fileno())
+    return contadores, usados
+
 
 def main():
     print(f"[*] INICIANDO REEMPLAZO DE DESCRIPCIONES")
     print(f"[*] Summary source: {ARCHIVO_SUMMARY}")
     print(f"[*] Steam data target: {ARCHIVO_STEAM_DATA}")
-    print(f"[*] Backup target: {ARCHIVO_BACKUP}")
-    
+
     # Verificar que existen los archivos
     if not os.path.exists(ARCHIVO_SUMMARY):
         print(f"[ERROR] No se encuentra '{ARCHIVO_SUMMARY}'")
         return
-    
+
     if not os.path.exists(ARCHIVO_STEAM_DATA):
         print(f"[ERROR] No se encuentra '{ARCHIVO_STEAM_DATA}'")
         return
-    
-    # Cargar resúmenes de summary.ndjson en un diccionario {steam_id: summary}
-    print("\n[*] Cargando resúmenes de summary.ndjson...")
-    summaries = {}
-    
-    with open(ARCHIVO_SUMMARY, 'r', encoding='utf-8') as f:
-        for linea in f:
-            try:
-                doc = json.loads(linea)
-                steam_id = doc.get('steam_id')
-                summary = doc.get('summary')
-                if steam_id and summary:
-                    summaries[steam_id] = summary
-            except:
-                pass
-    
-    print(f"[OK] {len(summaries)} resúmenes cargados")
-    
-    # Cargar y procesar steam-games-data.ndjson
-    print("\n[*] Cargando steam-games-data.ndjson...")
-    steam_data = []
-    
-    with open(ARCHIVO_STEAM_DATA, 'r', encoding='utf-8') as f:
-        for linea in f:
-            try:
-                doc = json.loads(linea)
-                steam_data.append(doc)
-            except:
-                pass
-    
-    print(f"[OK] {len(steam_data)} entradas cargadas")
-    
-    # Comparar y reemplazar
-    print("\n[*] Comparando IDs y reemplazando descripciones...")
-    reemplazos = 0
-    sin_cambios = 0
-    
-    for juego in steam_data:
-        steam_id = juego.get('steam_id')
-        
-        if steam_id in summaries:
-            # Reemplazar detailed_description con el summary
-            juego['detailed_description'] = summaries[steam_id]
-            reemplazos += 1
-            print(f"[UPDATED] {steam_id} - {juego.get('name', 'Unknown')}")
-        else:
-            sin_cambios += 1
-    
-    # Crear backup
-    print(f"\n[*] Creando backup de steam-games-data.ndjson...")
-    with open(ARCHIVO_BACKUP, 'w', encoding='utf-8') as f:
-        with open(ARCHIVO_STEAM_DATA, 'r', encoding='utf-8') as f_orig:
-            f.write(f_orig.read())
-    print(f"[OK] Backup guardado en: {ARCHIVO_BACKUP}")
-    
-    # Guardar el archivo actualizado
-    print(f"\n[*] Guardando archivo actualizado...")
-    with open(ARCHIVO_STEAM_DATA, 'w', encoding='utf-8') as f:
-        for juego in steam_data:
-            f.write(json.dumps(juego, ensure_ascii=False) + "\n")
-    
-    print(f"[OK] Archivo actualizado guardado")
-    
+
+    # Índice de summary.ndjson {steam_id: doc}: solo se decodifica el resumen
+    # de los appids que aparecen en el dataset
+    print("\n[*] Abriendo índice de summary.ndjson...")
+    resumenes = indice_ndjson.IndiceNDJSON(ARCHIVO_SUMMARY).abrir()
+    total_resumenes = len(resumenes)
+    print(f"[OK] {total_resumenes} resúmenes indexados")
+
+    # Recorrer steam-games-data.ndjson y escribir el resultado en un temporal
+    print("\n[*] Reemplazando descripciones (streaming)...")
+    temporal = ARCHIVO_STEAM_DATA + '.tmp'
+    try:
+        contadores, usados = reemplazar_descripciones(resumenes, ARCHIVO_STEAM_DATA, temporal)
+    finally:
+        resumenes.cerrar()
+
+    if contadores["reemplazadas"]:
+        # Snapshot deduplicado de la versión anterior (ver snapshots.py)
+        print(f"\n[*] Creando snapshot de steam-games-data.ndjson...")
+        print(f"[OK] Snapshot {snapshots.resumen(snapshots.guardar(NOMBRE_SNAPSHOT, ARCHIVO_STEAM_DATA), NOMBRE_SNAPSHOT)}")
+
+        # Índice del temporal y rename atómico sobre el original
+        print(f"\n[*] Publicando archivo actualizado...")
+        indice_ndjson.construir(temporal, indice_ndjson.ruta_indice(ARCHIVO_STEAM_DATA))
+        os.replace(temporal, ARCHIVO_STEAM_DATA)
+        print(f"[OK] Archivo actualizado guardado")
+    else:
+        os.remove(temporal)
+        print(f"\n[OK] Ninguna descripción cambia; no se reescribe el archivo")
+
     # Resumen
     print("\n" + "="*60)
     print(f"[DONE] PROCESO COMPLETADO")
-    print(f"[INFO] Total de entradas: {len(steam_data)}")
-    print(f"[INFO] Descripciones reemplazadas: {reemplazos}")
-    print(f"[INFO] Sin cambios: {sin_cambios}")
-    print(f"[INFO] Backup creado en: {ARCHIVO_BACKUP}")
+    print(f"[INFO] Total de entradas: {contadores['total']}")
+    print(f"[INFO] Descripciones reemplazadas: {contadores['reemplazadas']}")
+    print(f"[INFO] Ya tenían el resumen: {contadores['ya_al_dia']}")
+    print(f"[INFO] Sin resumen: {contadores['sin_resumen']}")
+    if contadores["ilegibles"]:
+        print(f"[WARN] Líneas con resumen pero JSON ilegible (copiadas sin cambios): {contadores['ilegibles']}")
+    print(f"[INFO] Resúmenes sin juego en el dataset: {total_resumenes - len(usados)}")
     print("="*60)
 
 if __name__ == "__main__":
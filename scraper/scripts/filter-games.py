@@ -2,6 +2,9 @@ import json
 import os
 import sys
 
+import filtro_juegos
+import snapshots
+
 # Forzar que los prints se muestren inmediatamente (sin buffer)
 sys.stdout.reconfigure(line_buffering=True)
 
@@ -11,45 +14,19 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 # Configuración de archivos
 ARCHIVO_ENTRADA = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-top-games.json')
 ARCHIVO_SALIDA = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-top-games-filtered.json')
-ARCHIVO_BACKUP = os.path.join(PROJECT_ROOT, 'scraper', 'backups', 'steam-top-games-backup.json')
-
-# ==========================================
-# PALABRAS CLAVE A FILTRAR
-# ==========================================
-# Añade aquí las palabras clave que quieras filtrar (no importa mayúsculas/minúsculas)
-PALABRAS_CLAVE_FILTRO = [
-    "soundtrack",
-    "artbook",
-    "soundtrack",
-    "dlc",
-    "expansion",
-    "cosmetic",
-    "cosmetics",
-    "bundle",
-    "bundle pack",
-    "season pass",
-    "adult",
-    "sexual",
-    "xxx",
-]
+NOMBRE_SNAPSHOT = 'steam-top-games'
 
-def contiene_palabra_clave(nombre):
-    """
-    Verifica si el nombre contiene alguna palabra clave del filtro
-    """
-    nombre_lower = nombre.lower()
-    for palabra in PALABRAS_CLAVE_FILTRO:
-        if palabra.lower() in nombre_lower:
-            return True
-    return False
+# Las palabras clave y la lista de exclusión están en filtro_juegos.py, que
+# gameid-script.py ya aplica al descubrir los juegos. Este script queda para
+# filtrar a mano listas antiguas o generadas por otras vías.
 
 def main():
     print(f"[*] INICIANDO FILTRADO DE JUEGOS")
     print(f"[*] Entrada: {ARCHIVO_ENTRADA}")
     print(f"[*] Salida: {ARCHIVO_SALIDA}")
-    print(f"[*] Backup: {ARCHIVO_BACKUP}")
-    print(f"\n[INFO] Palabras clave a filtrar ({len(PALABRAS_CLAVE_FILTRO)}):")
-    for palabra in PALABRAS_CLAVE_FILTRO:
+    print(f"[*] Snapshots: {snapshots.SNAPSHOTS_DIR}")
+    print(f"\n[INFO] Palabras clave a filtrar ({len(filtro_juegos.PALABRAS_CLAVE_FILTRO)}):")
+    for palabra in filtro_juegos.PALABRAS_CLAVE_FILTRO:
         print(f"  - {palabra}")
     print()
     
@@ -71,9 +48,10 @@ def main():
     juegos_filtrados = []
     juegos_eliminados = []
     
+    excluidos = filtro_juegos.cargar_excluidos()
     for juego in datos:
         nombre = juego.get('name', '')
-        if contiene_palabra_clave(nombre):
+        if filtro_juegos.contiene_palabra_clave(nombre) or str(juego.get('appid')) in excluidos:
             juegos_eliminados.append(juego)
             print(f"[REMOVE] {nombre}")
         else:
@@ -88,11 +66,9 @@ def main():
     print(f"  Eliminados: {total_eliminados}")
     print(f"  Restantes: {total_restantes}")
     
-    # Crear backup del original
-    print(f"\n[*] Creando backup...")
-    with open(ARCHIVO_BACKUP, 'w', encoding='utf-8') as f:
-        json.dump(datos, f, ensure_ascii=False, indent=2)
-    print(f"[OK] Backup guardado en: {ARCHIVO_BACKUP}")
+    # Snapshot deduplicado del original (restaurable con snapshots.py restaurar)
+    print(f"\n[*] Creando snapshot...")
+    print(f"[OK] Snapshot {snapshots.resumen(snapshots.guardar(NOMBRE_SNAPSHOT, ARCHIVO_ENTRADA), NOMBRE_SNAPSHOT)}")
     
     # Guardar juegos filtrados directamente en el archivo original
     print(f"[*] Reemplazando archivo original...")
@@ -101,7 +77,7 @@ def main():
     print(f"[OK] Archivo original actualizado: {ARCHIVO_ENTRADA}")
     
     print(f"\n[INFO] ✓ El archivo original ha sido actualizado con {total_restantes} juegos")
-    print(f"[INFO] ✓ Backup del original guardado en: {ARCHIVO_BACKUP}")
+    print(f"[INFO] ✓ Original recuperable con: python scripts/snapshots.py restaurar {NOMBRE_SNAPSHOT}")
 
 if __name__ == "__main__":
     main()
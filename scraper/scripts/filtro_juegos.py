@@ -0,0 +1,220 @@
+"""
+Filtro de juegos en el descubrimiento (gameid-script.py), antes de pedir
+appdetails y la página de tienda de cada appid.
+
+Una fila de /search/results/ se descarta si:
+  - su appid está en la lista de exclusión (ya se vio en appdetails que su
+    `type` no es un juego: dlc, music, demo...)
+  - trae el descriptor de contenido "solo adultos" (data-ds-descids)
+  - su nombre contiene alguna palabra clave (antes solo en filter-games.py)
+
+La lista de exclusión (data/steam-excluidos.json) la alimenta
+sacar-datos-games.py con el `type` de appdetails y persiste entre
+ejecuciones, así esos appids no se vuelven a pedir nunca.
+
+Las filas de paquetes (itemkey Sub_/Bundle_) no se descartan por serlo: se
+quedan con su primer appid, como hacía gameid-script.py, y el `type` de
+appdetails decide si es un juego.
+
+Las reglas (palabras clave, tipos, descriptores) se leen de
+config/filtro-juegos.json (o FILTRO_JUEGOS_CONFIG); si no existe se usan los
+valores por defecto de abajo. Las palabras clave se compilan una sola vez en
+una expresión regular (alternancia factorizada por prefijos, como un trie),
+así cada nombre se recorre una vez sea cual sea el número de palabras.
+Benchmark: python benchmarks/bench_filtro_juegos.py
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVO_EXCLUIDOS = os.path.join(PROJECT_ROOT, 'data', 'steam-excluidos.json')
+ARCHIVO_CONFIG = os.environ.get('FILTRO_JUEGOS_CONFIG', os.path.join(PROJECT_ROOT, 'config', 'filtro-juegos.json'))
+
+# ==========================================
+# REGLAS POR DEFECTO (si no hay config)
+# ==========================================
+# Palabras clave en el nombre. Sin distinguir mayúsculas (casefold) y, con
+# PALABRAS_COMPLETAS, solo como palabra entera: "dlc" no casa dentro de
+# "Idlcraft" y los plurales van aparte.
+PALABRAS_CLAVE_FILTRO = [
+    "soundtrack",
+    "soundtracks",
+    "artbook",
+    "artbooks",
+    "dlc",
+    "dlcs",
+    "expansion",
+    "expansions",
+    "cosmetic",
+    "cosmetics",
+    "bundle",
+    "bundles",
+    "season pass",
+    "season passes",
+    "adult",
+    "adults",
+    "sexual",
+    "xxx",
+]
+PALABRAS_COMPLETAS = True
+
+# Valores de `type` de appdetails que no son juegos
+TIPOS_EXCLUIDOS = ('dlc', 'music', 'demo', 'video', 'advertising', 'hardware')
+
+# Descriptor de contenido de Steam 3 = "Adult Only Sexual Content"
+DESCRIPTORES_ADULTOS = {3}
+
+
+# ==========================================
+# COMPILACIÓN DE PALABRAS CLAVE
+# ==========================================
+def normalizar(texto):
+    """casefold (+ NFKC si no es ASCII: letras de ancho completo, ligaduras...)."""
+    if not texto.isascii():
+        texto = unicodedata.normalize('NFKC', texto)
+    return texto.casefold()
+
+
+def _regex_trie(palabras):
+    """
+    Alternancia factorizada por prefijos: ["dlc", "dlcs", "demo"] ->
+    d(?:lcs?|emo). En cada posición del nombre el motor prueba como mucho un
+    camino por letra en vez de todas las palabras una a una.
+    """
+    trie = {}
+    for palabra in palabras:
+        nodo = trie
+        for c in palabra:
+            nodo = nodo.setdefault(c, {})
+        nodo[''] = {}
+
+    def emitir(nodo):
+        fin = '' in nodo
+        ramas = []
+        for c in sorted(k for k in nodo if k):
+            # Un espacio de la palabra clave casa con cualquier hueco en el nombre
+            literal = r'\s+' if c == ' ' else re.escape(c)
+            ramas.append(literal + emitir(nodo[c]))
+        if not ramas:
+            return ''
+        if len(ramas) == 1 and not fin:
+            return ramas[0]
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        if fin:
+            # La palabra ya terminó: lo que sigue es opcional
+            return ('(?:' + cuerpo + ')?') if len(ramas) == 1 and len(ramas[0]) > 1 else cuerpo + '?'
+        return cuerpo
+
+    return emitir(trie)
+
+
+def compilar_palabras(palabras, completas=True):
+    """Compila las palabras clave (normalizadas y sin duplicados) en un solo patrón."""
+    unicas = sorted({normalizar(p.strip()) for p in palabras if p and p.strip()})
+    if not unicas:
+        return re.compile(r'(?!)')
+    cuerpo = _regex_trie(unicas)
+    if completas:
+        cuerpo = r'(?<!\w)(?:' + cuerpo + r')(?!\w)'
+    return re.compile(cuerpo)
+
+
+def cargar_config(ruta=None):
+    """
+    Aplica config/filtro-juegos.json sobre las reglas por defecto y recompila
+    el patrón. Claves (todas opcionales): palabras_clave, palabras_completas,
+    tipos_excluidos, descriptores_adultos.
+    """
+    global PALABRAS_CLAVE_FILTRO, PALABRAS_COMPLETAS, TIPOS_EXCLUIDOS, DESCRIPTORES_ADULTOS, PATRON_PALABRAS
+    ruta = ruta or ARCHIVO_CONFIG
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARN] Config de filtro ilegible ({ruta}): {e}. Se usan las reglas por defecto")
+            config = {}
+        PALABRAS_CLAVE_FILTRO = list(config.get('palabras_clave', PALABRAS_CLAVE_FILTRO))
+        PALABRAS_COMPLETAS = bool(config.get('palabras_completas', PALABRAS_COMPLETAS))
+        TIPOS_EXCLUIDOS = tuple(config.get('tipos_excluidos', TIPOS_EXCLUIDOS))
+        DESCRIPTORES_ADULTOS = set(config.get('descriptores_adultos', DESCRIPTORES_ADULTOS))
+    PATRON_PALABRAS = compilar_palabras(PALABRAS_CLAVE_FILTRO, PALABRAS_COMPLETAS)
+
+
+PATRON_PALABRAS = None
+cargar_config()
+
+
+def contiene_palabra_clave(nombre):
+    """Verifica si el nombre contiene alguna palabra clave del filtro."""
+    if not nombre:
+        return False
+    return PATRON_PALABRAS.search(normalizar(nombre)) is not None
+
+
+def motivo_exclusion(fila, excluidos):
+    """
+    Motivo por el que se descarta una fila de búsqueda (None si se queda):
+    'tipo:<type>' | 'adulto' | 'nombre'
+    """
+    entrada = excluidos.get(str(fila.get('appid')))
+    if entrada:
+        return f"tipo:{entrada.get('type')}"
+    if DESCRIPTORES_ADULTOS.intersection(fila.get('descids') or ()):
+        return 'adulto'
+    if contiene_palabra_clave(fila.get('title')):
+        return 'nombre'
+    return None
+
+
+def filtrar_filas(filas, excluidos):
+    """
+    filas: {appid: fila de extractor_filas}, en orden de ranking.
+    Retorna: ({appid: fila} sin los descartados, Counter de motivos)
+    """
+    quedan = {}
+    motivos = Counter()
+    for appid, fila in filas.items():
+        motivo = motivo_exclusion(fila, excluidos)
+        if motivo:
+            motivos[motivo] += 1
+        else:
+            quedan[appid] = fila
+    return quedan, motivos
+
+
+def cargar_excluidos(ruta=None):
+    """Lista de exclusión {appid: {"type", "name", "fecha"}} (vacía si no existe o está corrupta)."""
+    ruta = ruta or ARCHIVO_EXCLUIDOS
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def anadir_excluidos(nuevos, ruta=None):
+    """
+    Añade {appid: data de appdetails} a la lista de exclusión (tmp + rename
+    atómico). Retorna el nº de appids nuevos en la lista.
+    """
+    if not nuevos:
+        return 0
+    ruta = ruta or ARCHIVO_EXCLUIDOS
+    excluidos = cargar_excluidos(ruta)
+    ahora = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    antes = len(excluidos)
+    for appid, data in nuevos.items():
+        excluidos[str(appid)] = {"type": data.get('type'), "name": data.get('name'), "fecha": ahora}
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(excluidos, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, ruta)
+    return len(excluidos) - antes
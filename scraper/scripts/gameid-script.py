@@ -4,7 +4,12 @@ import time
 import logging
 import sys
 import os
-from bs4 import BeautifulSoup
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import filtro_juegos
+from extractor_filas import extraer_filas
+from limitador import LimitadorAIMD
 
 # Forzar que los prints se muestren inmediatamente (sin buffer)
 sys.stdout.reconfigure(line_buffering=True)
@@ -22,8 +27,13 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-URL_SEARCH = "https://store.steampowered.com/search/results/"
+# STEAM_STORE_URL permite apuntar a otro servidor (p. ej. benchmarks/mock_steam.py)
+URL_TIENDA = os.environ.get('STEAM_STORE_URL', 'https://store.steampowered.com').rstrip('/')
+URL_SEARCH = f"{URL_TIENDA}/search/results/"
 NOMBRE_ARCHIVO_SALIDA = os.path.join(PROJECT_ROOT, 'data', 'steam-top-games.json')
+# Sidecar con los datos de cada fila de búsqueda (precio, descuento, fecha...).
+# sacar-datos-games.py lo usa para saltarse los juegos que no han cambiado.
+NOMBRE_ARCHIVO_FILAS = os.path.join(PROJECT_ROOT, 'data', 'steam-search-rows.json')
 
 # 5000 de cada tipo para asegurar variedad
 CANTIDAD_POR_CRITERIO = 5000 
@@ -31,91 +41,188 @@ RESULTADOS_POR_PAGINA = 50
 TIMEOUT = 30
 MAX_REINTENTOS = 3
 
+# Descarga paralela de páginas: ambos criterios comparten hilos y limitador
+MAX_HILOS = 8
+TASA_INICIAL = 4.0   # peticiones/s
+TASA_MAXIMA = 10.0   # peticiones/s
+
+LIMITADOR = LimitadorAIMD(tasa_inicial=TASA_INICIAL, tasa_max=TASA_MAXIMA, pausa_backoff=5.0)
+_local = threading.local()
+
+def obtener_sesion():
+    """Una requests.Session por hilo (reutiliza conexiones keep-alive)."""
+    if not hasattr(_local, 'sesion'):
+        _local.sesion = requests.Session()
+    return _local.sesion
+
 # =================================================================
-# FUNCION DE BUSQUEDA GENERICA
+# DESCARGA Y PARSEO DE PAGINAS
 # =================================================================
-def obtener_lista_steam(criterio_sort, total_objetivo, nombre_etapa):
+def descargar_pagina(criterio_sort, offset):
     """
-    criterio_sort: 
+    Descarga y parsea una página de resultados respetando el limitador compartido.
+
+    criterio_sort:
       - 'CCU_DESC' -> Mas Jugados (Trafico actual)
       - '' (vacio) -> Relevancia (Algoritmo de Steam: Ventas + Valoracion)
+
+    Solo se reintenta lo transitorio (429, 5xx, timeouts y cortes de
+    conexión); otro 4xx no va a cambiar al repetirlo y falla a la primera.
+
+    Retorna: (filas, total_count) o (None, 0) si la página no se pudo obtener.
+    Cada fila es un dict de extractor_filas (appid, title, precio, descuento...).
     """
-    juegos_encontrados = {}
-    offset = 0
-    
-    print(f"\n>>> [ETAPA]: {nombre_etapa} (Objetivo: {total_objetivo})")
-    
-    # Limite de seguridad para no entrar en bucle infinito
-    limit_safety = total_objetivo * 2 
-    
-    while len(juegos_encontrados) < total_objetivo and offset < limit_safety:
-        
-        params = {
-            'query': '',
-            'start': offset,
-            'count': RESULTADOS_POR_PAGINA,
-            'sort_by': criterio_sort, # Aqui esta la clave
-            'infinite': 1,
-            'ignore_preferences': 1,
-            'cc': 'us' # USA para estandarizar
-        }
-
-        # Intentos de conexion
-        resp = None
+    params = {
+        'query': '',
+        'start': offset,
+        'count': RESULTADOS_POR_PAGINA,
+        'sort_by': criterio_sort, # Aqui esta la clave
+        'infinite': 1,
+        'ignore_preferences': 1,
+        'cc': 'us' # USA para estandarizar
+    }
+
+    for _ in range(MAX_REINTENTOS):
+        LIMITADOR.adquirir()
         start_time = time.time()  # Inicio medición
-        status_code = 0
-        
-        for _ in range(MAX_REINTENTOS):
-            try:
-                resp = requests.get(URL_SEARCH, params=params, timeout=TIMEOUT)
-                status_code = resp.status_code
-                if resp.status_code == 200: break
-            except requests.exceptions.Timeout:
-                logging.error(f"TIMEOUT | URL:{URL_SEARCH} | OFFSET:{offset}")
-            except requests.exceptions.RequestException as e:
-                logging.error(f"CONNECTION_ERROR | URL:{URL_SEARCH} | ERROR:{str(e)}")
-                time.sleep(1)
-        
-        end_time = time.time()
-        duration = round(end_time - start_time, 4)
-        
+        try:
+            resp = obtener_sesion().get(URL_SEARCH, params=params, timeout=TIMEOUT)
+        except requests.exceptions.Timeout:
+            logging.error(f"TIMEOUT | URL:{URL_SEARCH} | OFFSET:{offset}")
+            LIMITADOR.penalizar()
+            continue
+        except requests.exceptions.ConnectionError as e:
+            logging.error(f"CONNECTION_ERROR | URL:{URL_SEARCH} | ERROR:{str(e)}")
+            LIMITADOR.penalizar()
+            continue
+        except requests.exceptions.RequestException as e:
+            logging.error(f"REQUEST_ERROR | URL:{URL_SEARCH} | OFFSET:{offset} | ERROR:{str(e)}")
+            break
+
+        duration = round(time.time() - start_time, 4)
+        LIMITADOR.registrar(resp.status_code)
+
         # Log de la petición
-        if resp:
-            logging.info(f"REQUEST_URL:{resp.url} | STATUS:{status_code} | LATENCY:{duration}s | OFFSET:{offset}")
-        
-        if resp and resp.status_code == 200:
-            try:
-                data = resp.json()
-                soup = BeautifulSoup(data.get('results_html', ''), 'html.parser')
-                rows = soup.find_all('a', class_='search_result_row')
-                
-                if not rows:
-                    print("[WARN] Fin de resultados en Steam.")
-                    break
-
-                for row in rows:
-                    if len(juegos_encontrados) >= total_objetivo: break
-                    
-                    appid = row.get('data-ds-appid')
-                    title = row.find('span', class_='title').text.strip()
-                    
-                    if appid:
-                        # A veces vienen ids dobles "123,456", cogemos el primero
-                        first_id = appid.split(',')[0]
-                        juegos_encontrados[first_id] = title
-                
-                print(f"   [OK] Offset {offset}: Acumulados {len(juegos_encontrados)} juegos en esta etapa.")
-                
-            except Exception as e:
-                logging.error(f"PARSE_ERROR | OFFSET:{offset} | ERROR:{e}")
-        
-        else:
-            print(f"[ERR] Error conexion o bloqueo. Esperando 5s...")
-            time.sleep(5)
-
-        offset += RESULTADOS_POR_PAGINA
-        time.sleep(1.0) # Pausa para no ser baneado
+        logging.info(f"REQUEST_URL:{resp.url} | STATUS:{resp.status_code} | LATENCY:{duration}s | OFFSET:{offset}")
+
+        if resp.status_code == 429 or resp.status_code >= 500:
+            continue
+        if resp.status_code != 200:
+            break
 
+        try:
+            data = resp.json()
+            return extraer_filas(data.get('results_html', '')), int(data.get('total_count') or 0)
+        except Exception as e:
+            logging.error(f"PARSE_ERROR | OFFSET:{offset} | ERROR:{e}")
+            return None, 0
+
+    print(f"[ERR] Error conexion o bloqueo en offset {offset} ({criterio_sort or 'relevancia'}).")
+    return None, 0
+
+# =================================================================
+# BUSQUEDA PARALELA DE TODOS LOS CRITERIOS
+# =================================================================
+def obtener_listas_steam(etapas):
+    """
+    etapas: [(criterio_sort, total_objetivo, nombre_etapa), ...]
+
+    1. Pide la primera página de cada criterio para leer total_count.
+    2. Planifica todos los offsets de antemano y descarga las páginas de
+       todos los criterios a la vez bajo el mismo limitador.
+    3. Si faltan juegos (ids repetidos entre páginas), lanza otra tanda de
+       offsets hasta el límite de seguridad (total_objetivo * 2).
+    4. Las páginas que agotaron sus intentos vuelven a la cola para una
+       pasada final; si alguna sigue fallando lanza RuntimeError, porque la
+       lista tendría un hueco en el orden de ranking.
+
+    Retorna: lista de dicts {appid: fila}, uno por etapa y en orden de ranking.
+    """
+    paginas = [{} for _ in etapas]   # por etapa: {offset: filas}
+    totales = [0 for _ in etapas]
+    fallidas = []                    # (etapa, criterio_sort, offset) sin descargar
+    inicio = time.time()
+
+    with ThreadPoolExecutor(max_workers=MAX_HILOS) as executor:
+
+        # --- Primera página de cada criterio (da el total_count) ---
+        primeras = executor.map(lambda etapa: descargar_pagina(etapa[0], 0), etapas)
+        for n, (filas, total_count) in enumerate(primeras):
+            if filas is not None:
+                paginas[n][0] = filas
+            else:
+                fallidas.append((n, etapas[n][0], 0))
+            totales[n] = total_count
+            print(f"\n>>> [ETAPA]: {etapas[n][2]} (Objetivo: {etapas[n][1]} | Disponibles en Steam: {total_count})")
+
+        # --- Tandas de offsets planificados ---
+        desde = [RESULTADOS_POR_PAGINA for _ in etapas]
+        while True:
+            pendientes = []
+            for n, (criterio_sort, total_objetivo, _) in enumerate(etapas):
+                if len(fusionar_paginas(paginas[n], total_objetivo)) >= total_objetivo:
+                    continue
+                limite = min(totales[n] or total_objetivo * 2, total_objetivo * 2)
+                # Primera tanda: lo justo para el objetivo. Siguientes: de a 10 páginas.
+                hasta = total_objetivo if desde[n] < total_objetivo else desde[n] + RESULTADOS_POR_PAGINA * 10
+                hasta = min(hasta, limite)
+                pendientes += [(n, criterio_sort, off) for off in range(desde[n], hasta, RESULTADOS_POR_PAGINA)]
+                desde[n] = max(desde[n], hasta)
+
+            if not pendientes:
+                break
+
+            print(f"[INFO] Descargando {len(pendientes)} páginas en paralelo...")
+            resultados = executor.map(lambda p: descargar_pagina(p[1], p[2]), pendientes)
+            descargadas = []
+            for pendiente, (filas, _) in zip(pendientes, resultados):
+                if filas is None:
+                    fallidas.append(pendiente)
+                else:
+                    paginas[pendiente[0]][pendiente[2]] = filas
+                    descargadas.append(pendiente)
+
+            # Sin filas nuevas en la tanda: fin de resultados en Steam
+            # (las páginas fallidas no cuentan: se reintentan al final)
+            if not descargadas:
+                print("[WARN] Ninguna página de la tanda se pudo descargar.")
+                break
+            if all(not paginas[n].get(off) for n, _, off in descargadas):
+                print("[WARN] Fin de resultados en Steam.")
+                break
+
+        # --- Pasada final sobre las páginas que agotaron sus intentos ---
+        if fallidas:
+            print(f"[WARN] {len(fallidas)} páginas fallidas: pasada final...")
+            logging.warning(f"RETRY_PASS | PAGINAS:{len(fallidas)}")
+            resultados = executor.map(lambda p: descargar_pagina(p[1], p[2]), fallidas)
+            siguen = []
+            for pendiente, (filas, _) in zip(fallidas, resultados):
+                if filas is None:
+                    siguen.append(pendiente)
+                else:
+                    paginas[pendiente[0]][pendiente[2]] = filas
+            if siguen:
+                detalle = ", ".join(f"{etapas[n][2]} offset {off}" for n, _, off in siguen)
+                logging.error(f"MISSING_PAGES | PAGINAS:{len(siguen)} | {detalle}")
+                raise RuntimeError(f"{len(siguen)} páginas de búsqueda sin descargar tras la pasada final ({detalle})")
+
+    duracion = time.time() - inicio
+    listas = [fusionar_paginas(paginas[n], etapa[1]) for n, etapa in enumerate(etapas)]
+    for etapa, lista in zip(etapas, listas):
+        print(f"   [OK] {etapa[2]}: {len(lista)} juegos.")
+    print(f"[INFO] Descarga en {duracion:.1f}s | {LIMITADOR.req_por_segundo():.2f} req/s | backoffs: {LIMITADOR.backoffs}")
+    logging.info(f"THROUGHPUT | PAGINAS:{LIMITADOR.peticiones} | DURACION:{duracion:.2f}s | REQ_S:{LIMITADOR.req_por_segundo():.2f} | BACKOFFS:{LIMITADOR.backoffs}")
+    return listas
+
+def fusionar_paginas(paginas, total_objetivo):
+    """Recorre las páginas en orden de offset y acumula hasta total_objetivo juegos."""
+    juegos_encontrados = {}
+    for offset in sorted(paginas):
+        for fila in paginas[offset]:
+            if len(juegos_encontrados) >= total_objetivo:
+                return juegos_encontrados
+            juegos_encontrados[fila['appid']] = fila
     return juegos_encontrados
 
 # =================================================================
@@ -124,30 +231,57 @@ def obtener_lista_steam(criterio_sort, total_objetivo, nombre_etapa):
 if __name__ == "__main__":
     diccionario_maestro = {}
 
-    # --- FASE 1: LOS MAS JUGADOS (Tendencia y Multijugador) ---
-    # Captura: CS2, Dota, Apex, juegos virales del momento.
-    top_played = obtener_lista_steam('CCU_DESC', CANTIDAD_POR_CRITERIO, "Mas Jugados (Trends)")
+    # Ambas fases se descargan a la vez; la fusión respeta el orden de ranking.
+    # Con páginas sin descargar no se escribe nada: se conserva la lista anterior.
+    try:
+        top_played, top_relevance = obtener_listas_steam([
+            # --- FASE 1: LOS MAS JUGADOS (Tendencia y Multijugador) ---
+            # Captura: CS2, Dota, Apex, juegos virales del momento.
+            ('CCU_DESC', CANTIDAD_POR_CRITERIO, "Mas Jugados (Trends)"),
+            # --- FASE 2: RELEVANCIA (Historicos y Calidad) ---
+            # Al dejar sort_by vacio, Steam usa su algoritmo de "Relevancia".
+            # Captura: Witcher 3, Skyrim, Portal, Red Dead Redemption 2 (Juegos que venden siempre).
+            ('', CANTIDAD_POR_CRITERIO, "Por Relevancia (Iconicos)"),
+        ])
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
     diccionario_maestro.update(top_played)
-    
     print(f"[INFO] Total tras Fase 1: {len(diccionario_maestro)} juegos unicos.")
 
-    # --- FASE 2: RELEVANCIA (Historicos y Calidad) ---
-    # Al dejar sort_by vacio, Steam usa su algoritmo de "Relevancia".
-    # Captura: Witcher 3, Skyrim, Portal, Red Dead Redemption 2 (Juegos que venden siempre).
-    top_relevance = obtener_lista_steam('', CANTIDAD_POR_CRITERIO, "Por Relevancia (Iconicos)")
-    
     # Fusionar (El diccionario evita duplicados automaticamente)
     antes = len(diccionario_maestro)
     diccionario_maestro.update(top_relevance)
     despues = len(diccionario_maestro)
     
     print(f"[INFO] Se anadieron {despues - antes} juegos iconicos que no estaban en el Top Jugados.")
+
+    # --- FILTRO DE DESCUBRIMIENTO ---
+    # DLC, bandas sonoras, bundles y contenido adulto fuera antes de que
+    # sacar-datos-games.py gaste en ellos appdetails y la página de tienda
+    excluidos = filtro_juegos.cargar_excluidos()
+    diccionario_maestro, motivos = filtro_juegos.filtrar_filas(diccionario_maestro, excluidos)
+    despues = len(diccionario_maestro)
+    detalle = " | ".join(f"{motivo}: {n}" for motivo, n in motivos.most_common())
+    print(f"[INFO] Filtrados {sum(motivos.values())} (lista de exclusion: {len(excluidos)}){' | ' + detalle if detalle else ''}")
+    logging.info(f"FILTRO | DESCARTADOS:{sum(motivos.values())} | QUEDAN:{despues} | EXCLUIDOS_CONOCIDOS:{len(excluidos)} "
+                 f"| MOTIVOS:{dict(motivos)}")
     print(f"[INFO] TOTAL FINAL: {despues} JUEGOS UNICOS.")
 
     # --- GUARDAR ---
-    lista_final = [{"appid": int(aid), "name": name} for aid, name in diccionario_maestro.items()]
+    lista_final = [{"appid": int(aid), "name": fila['title']} for aid, fila in diccionario_maestro.items()]
     
     with open(NOMBRE_ARCHIVO_SALIDA, 'w', encoding='utf-8') as f:
         json.dump(lista_final, f, ensure_ascii=False, indent=4)
 
-    print(f"\n[DONE] Guardado en: {NOMBRE_ARCHIVO_SALIDA}")
\ No newline at end of file
+    # Datos de fila por appid (sin appid/title, que ya están en la lista)
+    filas = {
+        aid: {k: v for k, v in fila.items() if k not in ('appid', 'title')}
+        for aid, fila in diccionario_maestro.items()
+    }
+    with open(NOMBRE_ARCHIVO_FILAS, 'w', encoding='utf-8') as f:
+        json.dump(filas, f, ensure_ascii=False)
+
+    print(f"\n[DONE] Guardado en: {NOMBRE_ARCHIVO_SALIDA}")
+    print(f"[DONE] Datos de filas en: {NOMBRE_ARCHIVO_FILAS}")
\ No newline at end of file
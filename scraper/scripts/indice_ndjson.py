@@ -0,0 +1,300 @@
+"""
+Índice de acceso aleatorio para los NDJSON del pipeline.
+
+Junto a cada <archivo>.ndjson se guarda <archivo>.ndjson.idx, un binario
+columnar (little-endian) con, por cada registro:
+
+    appid (int64) | offset (uint64) | huella (uint64) | longitud (uint32)
+
+ordenado por appid. La huella es un blake2b de 8 bytes de la línea, para
+saber si un registro ha cambiado sin decodificarlo. La cabecera guarda el
+tamaño y la fecha de modificación del NDJSON indexado: si no coinciden, el
+índice está desfasado y se reconstruye solo al abrirlo.
+
+IndiceNDJSON mapea en memoria el índice y el NDJSON y se comporta como un
+dict {appid: doc} de solo lectura: comprobar si un appid existe o sacar el
+set de IDs no decodifica ningún JSON, y cada doc se decodifica solo cuando
+se pide.
+
+Uso:
+    with IndiceNDJSON(ARCHIVO) as registros:
+        ids = registros.ids()            # set de appids, sin json.loads
+        doc = registros.get(appid)       # decodifica solo esa línea
+
+    construir(ARCHIVO)                   # tras reescribir el NDJSON
+    actualizar(ARCHIVO)                  # tras añadir líneas al final
+"""
+
+import array
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from collections.abc import Mapping
+
+MAGIA = b'NDIX'
+VERSION = 1
+# magia, versión, reservado, nº registros, tamaño del NDJSON, mtime_ns del NDJSON
+_CABECERA = struct.Struct('<4sHHQQq')
+# (nombre, tipo de array, bytes por elemento) de cada columna, en orden en el archivo.
+# Las de 8 bytes van primero para que todas queden alineadas.
+_COLUMNAS = (('appids', 'q', 8), ('offsets', 'Q', 8), ('huellas', 'Q', 8), ('longitudes', 'I', 4))
+
+_ID = re.compile(rb'"steam_id":\s*(\d+)')
+
+
+def ruta_indice(ruta_ndjson):
+    return str(ruta_ndjson) + '.idx'
+
+
+def _huella(linea):
+    return int.from_bytes(hashlib.blake2b(linea, digest_size=8).digest(), 'little')
+
+
+def appid_de_linea(linea):
+    """steam_id de una línea sin decodificar el JSON (con json.loads de respaldo)."""
+    m = _ID.search(linea)
+    if m:
+        return int(m.group(1))
+    try:
+        steam_id = json.loads(linea).get('steam_id')
+        return int(steam_id) if steam_id is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def _escanear(ruta_ndjson, desde=0, entradas=None):
+    """Recorre el NDJSON desde el byte `desde`. Ante appids repetidos gana la última línea."""
+    entradas = {} if entradas is None else entradas
+    with open(ruta_ndjson, 'rb') as f:
+        f.seek(desde)
+        offset = desde
+        for linea in f:
+            contenido = linea.rstrip(b'\r\n')
+            if contenido.strip():
+                appid = appid_de_linea(contenido)
+                if appid is not None:
+                    entradas[appid] = (offset, len(contenido), _huella(contenido))
+            offset += len(linea)
+    return entradas
+
+
+def _guardar(ruta_ndjson, entradas, destino=None):
+    """Escribe el índice (tmp + rename atómico) con la firma actual del NDJSON."""
+    estado = os.stat(ruta_ndjson)
+    appids = sorted(entradas)
+    columnas = {
+        'appids': array.array('q', appids),
+        'offsets': array.array('Q', (entradas[a][0] for a in appids)),
+        'huellas': array.array('Q', (entradas[a][2] for a in appids)),
+        'longitudes': array.array('I', (entradas[a][1] for a in appids)),
+    }
+    destino = destino or ruta_indice(ruta_ndjson)
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    with open(temporal, 'wb') as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION, 0, len(appids), estado.st_size, estado.st_mtime_ns))
+        for nombre, _, _ in _COLUMNAS:
+            columna = columnas[nombre]
+            if sys.byteorder == 'big':
+                columna.byteswap()
+            f.write(columna.tobytes())
+    os.replace(temporal, destino)
+    return len(appids)
+
+
+def _leer_entradas(ruta_ndjson):
+    """Entradas {appid: (offset, longitud, huella)} del índice guardado, o None si no vale."""
+    with IndiceNDJSON(ruta_ndjson, reconstruir=False) as indice:
+        if not indice.valido:
+            return None, None
+        entradas = {
+            indice._appids[i]: (indice._offsets[i], indice._longitudes[i], indice._huellas[i])
+            for i in range(len(indice))
+        }
+        return entradas, indice.tamano_indexado
+
+
+def construir(ruta_ndjson, destino=None):
+    """
+    Indexa el NDJSON entero. `destino` permite indexar un temporal antes de
+    renombrarlo (la firma tamaño/mtime se conserva con el rename).
+    Retorna el nº de registros indexados.
+    """
+    return _guardar(ruta_ndjson, _escanear(ruta_ndjson), destino)
+
+
+def actualizar(ruta_ndjson):
+    """
+    Para escritores que solo añaden al final: indexa únicamente lo nuevo
+    si el índice previo sigue describiendo el principio del archivo; si no,
+    reconstruye entero. Retorna el nº de registros indexados.
+    """
+    if os.path.exists(ruta_indice(ruta_ndjson)):
+        entradas, tamano = _leer_entradas(ruta_ndjson)
+        if entradas is not None and tamano <= os.path.getsize(ruta_ndjson) and _prefijo_intacto(ruta_ndjson, entradas, tamano):
+            return _guardar(ruta_ndjson, _escanear(ruta_ndjson, desde=tamano, entradas=entradas))
+    return construir(ruta_ndjson)
+
+
+def _prefijo_intacto(ruta_ndjson, entradas, tamano):
+    """Comprueba que la última línea indexada sigue igual (el archivo solo ha crecido)."""
+    if not entradas:
+        return tamano == 0
+    offset, longitud, huella = max(entradas.values())
+    with open(ruta_ndjson, 'rb') as f:
+        f.seek(offset)
+        return _huella(f.read(longitud)) == huella
+
+
+def ids_ndjson(ruta_ndjson):
+    """Set de appids de un NDJSON (vacío si no existe), sin decodificar registros."""
+    if not os.path.exists(ruta_ndjson):
+        return set()
+    with IndiceNDJSON(ruta_ndjson) as indice:
+        return indice.ids()
+
+
+class IndiceNDJSON(Mapping):
+    """
+    Vista de solo lectura {appid: doc} de un NDJSON a través de su índice.
+    Las búsquedas son binarias sobre la columna de appids mapeada en memoria
+    (sin construir ningún dict); los docs se decodifican al pedirlos.
+    """
+
+    def __init__(self, ruta_ndjson, reconstruir=True):
+        self.ruta = str(ruta_ndjson)
+        self.reconstruir = reconstruir
+        self.valido = False
+        self.tamano_indexado = 0
+        self._mm_indice = None
+        self._mm_datos = None
+        self._vistas = []
+        self._appids = self._offsets = self._huellas = self._longitudes = ()
+
+    def __enter__(self):
+        return self.abrir()
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def abrir(self):
+        if not os.path.exists(self.ruta):
+            self.valido = True
+            return self
+        self._mapear_indice()
+        if not self.valido and self.reconstruir:
+            self._liberar_indice()
+            try:
+                construir(self.ruta)
+            except OSError:
+                pass
+            self._mapear_indice()
+            if not self.valido:
+                # Sin permiso de escritura para el .idx: índice solo en memoria
+                self._cargar_en_memoria(_escanear(self.ruta))
+        if self.valido and os.path.getsize(self.ruta) > 0:
+            with open(self.ruta, 'rb') as f:
+                self._mm_datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def _mapear_indice(self):
+        ruta = ruta_indice(self.ruta)
+        if not os.path.exists(ruta) or os.path.getsize(ruta) < _CABECERA.size:
+            return
+        with open(ruta, 'rb') as f:
+            self._mm_indice = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, version, _, n, tamano, mtime_ns = _CABECERA.unpack_from(self._mm_indice)
+        estado = os.stat(self.ruta)
+        esperado = _CABECERA.size + n * sum(ancho for _, _, ancho in _COLUMNAS)
+        if magia != MAGIA or version != VERSION or len(self._mm_indice) != esperado:
+            return
+        self.tamano_indexado = tamano
+        # Para actualizar() basta con un índice bien formado; para leer, que sea del archivo actual
+        if self.reconstruir and (tamano != estado.st_size or mtime_ns != estado.st_mtime_ns):
+            return
+
+        inicio = _CABECERA.size
+        for nombre, tipo, ancho in _COLUMNAS:
+            vista = memoryview(self._mm_indice)[inicio:inicio + n * ancho]
+            if sys.byteorder == 'big':
+                columna = array.array(tipo, vista.tobytes())
+                columna.byteswap()
+                vista.release()
+            else:
+                columna = vista.cast(tipo)
+                self._vistas += [vista, columna]
+            setattr(self, '_' + nombre, columna)
+            inicio += n * ancho
+        self.valido = True
+
+    def _cargar_en_memoria(self, entradas):
+        appids = sorted(entradas)
+        self._appids = array.array('q', appids)
+        self._offsets = array.array('Q', (entradas[a][0] for a in appids))
+        self._huellas = array.array('Q', (entradas[a][2] for a in appids))
+        self._longitudes = array.array('I', (entradas[a][1] for a in appids))
+        self.valido = True
+
+    def _liberar_indice(self):
+        for vista in reversed(self._vistas):
+            vista.release()
+        self._vistas = []
+        self._appids = self._offsets = self._huellas = self._longitudes = ()
+        if self._mm_indice is not None:
+            self._mm_indice.close()
+            self._mm_indice = None
+
+    def cerrar(self):
+        self._liberar_indice()
+        if self._mm_datos is not None:
+            self._mm_datos.close()
+            self._mm_datos = None
+
+    # --- Consultas sin decodificar ---
+    def _posicion(self, appid):
+        try:
+            appid = int(appid)
+        except (TypeError, ValueError):
+            return -1
+        i = bisect.bisect_left(self._appids, appid)
+        return i if i < len(self._appids) and self._appids[i] == appid else -1
+
+    def __len__(self):
+        return len(self._appids)
+
+    def __iter__(self):
+        return iter(self._appids)
+
+    def __contains__(self, appid):
+        return self._posicion(appid) >= 0
+
+    def ids(self):
+        return set(self._appids)
+
+    def huella(self, appid):
+        """Huella de la línea del appid (None si no está)."""
+        i = self._posicion(appid)
+        return self._huellas[i] if i >= 0 else None
+
+    def offset(self, appid):
+        """Posición de la línea del appid en el NDJSON (None si no está)."""
+        i = self._posicion(appid)
+        return self._offsets[i] if i >= 0 else None
+
+    def linea(self, appid):
+        """Bytes de la línea del appid, sin salto de línea (None si no está)."""
+        i = self._posicion(appid)
+        if i < 0:
+            return None
+        offset = self._offsets[i]
+        return self._mm_datos[offset:offset + self._longitudes[i]]
+
+    def __getitem__(self, appid):
+        linea = self.linea(appid)
+        if linea is None:
+            raise KeyError(appid)
+        return json.loads(linea)
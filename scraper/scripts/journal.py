@@ -0,0 +1,130 @@
+"""
+Journal de escritura (write-ahead) para los scripts que generan NDJSON.
+
+En vez de truncar el archivo de salida al empezar, cada ejecución escribe en
+<salida>.parcial y, tras cada registro confirmado en disco, apunta en
+<salida>.journal el appid y el offset hasta el que el parcial es válido.
+
+Al publicar se genera también el índice <salida>.idx (indice_ndjson.py).
+
+Si el proceso muere (crash, OOM, reinicio del contenedor) y se relanza con el
+mismo run_id, el parcial se recorta al último offset confirmado y se continúa
+desde ahí. Solo al terminar se publica el parcial sobre la salida con un
+rename atómico; hasta entonces la salida anterior sigue intacta.
+
+Uso:
+    journal = JournalNDJSON(ARCHIVO_SALIDA, run_id)
+    journal.abrir()
+    for appid in pendientes:
+        if appid in journal.completados: continue
+        journal.escribir(appid, doc)       # o journal.marcar(appid) si no hay registro
+    journal.publicar()
+"""
+
+import hashlib
+import json
+import os
+
+import indice_ndjson
+
+
+def calcular_run_id(*partes):
+    """run_id estable a partir de lo que define la ejecución (entrada, opciones...)."""
+    h = hashlib.sha1()
+    for parte in partes:
+        h.update(json.dumps(parte, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+class JournalNDJSON:
+    def __init__(self, ruta_salida, run_id):
+        self.ruta_salida = ruta_salida
+        self.ruta_parcial = ruta_salida + '.parcial'
+        self.ruta_journal = ruta_salida + '.journal'
+        self.run_id = run_id
+        self.completados = {}   # appid -> meta (dict o None)
+        self._parcial = None
+        self._journal = None
+        self._offset = 0
+
+    def abrir(self):
+        """
+        Reanuda el run_id si hay journal suyo; si no, empieza de cero.
+        Retorna: True si se ha reanudado una ejecución anterior.
+        """
+        reanudado = self._cargar_journal()
+
+        if reanudado:
+            # Descartar lo escrito en el parcial después del último commit
+            with open(self.ruta_parcial, 'r+b') as f:
+                f.truncate(self._offset)
+            self._journal = open(self.ruta_journal, 'a', encoding='utf-8')
+        else:
+            self.completados = {}
+            self._offset = 0
+            open(self.ruta_parcial, 'wb').close()
+            self._journal = open(self.ruta_journal, 'w', encoding='utf-8')
+            self._journal.write(json.dumps({"run_id": self.run_id}) + "\n")
+            self._sincronizar(self._journal)
+
+        self._parcial = open(self.ruta_parcial, 'ab')
+        return reanudado
+
+    def _cargar_journal(self):
+        if not (os.path.exists(self.ruta_journal) and os.path.exists(self.ruta_parcial)):
+            return False
+        try:
+            with open(self.ruta_journal, 'r', encoding='utf-8') as f:
+                cabecera = json.loads(f.readline() or '{}')
+                if cabecera.get('run_id') != self.run_id:
+                    return False
+                for linea in f:
+                    try:
+                        entrada = json.loads(linea)
+                    except ValueError:
+                        break  # última línea a medio escribir
+                    self.completados[entrada['appid']] = entrada.get('meta')
+                    self._offset = entrada.get('fin', self._offset)
+        except (OSError, ValueError):
+            self.completados = {}
+            self._offset = 0
+            return False
+        return os.path.getsize(self.ruta_parcial) >= self._offset
+
+    @staticmethod
+    def _sincronizar(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    def escribir_lote(self, items):
+        """
+        items: [(appid, doc o None, meta), ...]. Un doc None solo marca el
+        appid como terminado (p. ej. juego no disponible). Un fsync por lote.
+        """
+        entradas = []
+        for appid, doc, meta in items:
+            if doc is not None:
+                self._parcial.write((json.dumps(doc, ensure_ascii=False) + "\n").encode('utf-8'))
+                self._offset = self._parcial.tell()
+            entradas.append({"appid": appid, "fin": self._offset, "meta": meta})
+        self._sincronizar(self._parcial)
+
+        for entrada in entradas:
+            self._journal.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            self.completados[entrada['appid']] = entrada['meta']
+        self._sincronizar(self._journal)
+
+    def escribir(self, appid, doc, meta=None):
+        self.escribir_lote([(appid, doc, meta)])
+
+    def marcar(self, appid, meta=None):
+        self.escribir_lote([(appid, None, meta)])
+
+    def publicar(self):
+        """Índice + rename atómico del parcial sobre la salida y borrado del journal."""
+        self._sincronizar(self._parcial)
+        self._parcial.close()
+        self._journal.close()
+        indice_ndjson.construir(self.ruta_parcial, indice_ndjson.ruta_indice(self.ruta_salida))
+        os.replace(self.ruta_parcial, self.ruta_salida)
+        os.remove(self.ruta_journal)
@@ -0,0 +1,86 @@
+"""
+Limitador de peticiones compartido por los scrapers de Steam.
+
+Token bucket con ajuste AIMD (Additive Increase / Multiplicative Decrease):
+  - Cada petición consume un token; los tokens se reponen a `tasa` por segundo.
+  - Mientras las respuestas son sanas, la tasa sube de forma aditiva.
+  - Ante un 429 o un 5xx, la tasa se divide (multiplicativa) y se abre una
+    pausa global para que todos los hilos dejen de pedir a la vez. Los 429
+    que llegan dentro de esa pausa son del mismo episodio (varios hilos en
+    vuelo a la vez): solo alargan la pausa, sin volver a dividir la tasa.
+
+Es thread-safe: un mismo limitador se comparte entre todos los hilos de un
+ThreadPoolExecutor.
+"""
+
+import threading
+import time
+
+
+class LimitadorAIMD:
+    def __init__(self, tasa_inicial=1.0, tasa_min=0.2, tasa_max=8.0,
+                 incremento=0.05, factor_bajada=0.5, rafaga=1.0, pausa_backoff=10.0):
+        self.tasa = tasa_inicial
+        self.tasa_min = tasa_min
+        self.tasa_max = tasa_max
+        self.incremento = incremento
+        self.factor_bajada = factor_bajada
+        self.rafaga = rafaga
+        self.pausa_backoff = pausa_backoff
+
+        self._tokens = rafaga
+        self._ultimo = time.monotonic()
+        self._pausa_hasta = 0.0
+        self._lock = threading.Lock()
+
+        # Métricas
+        self._inicio = time.monotonic()
+        self.peticiones = 0
+        self.backoffs = 0
+
+    def _reponer(self, ahora):
+        self._tokens = min(self.rafaga, self._tokens + (ahora - self._ultimo) * self.tasa)
+        self._ultimo = ahora
+
+    def adquirir(self):
+        """Bloquea hasta que haya un token disponible."""
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                if ahora < self._pausa_hasta:
+                    espera = self._pausa_hasta - ahora
+                else:
+                    self._reponer(ahora)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.peticiones += 1
+                        return
+                    espera = (1 - self._tokens) / self.tasa
+            time.sleep(espera)
+
+    def exito(self):
+        """Respuesta sana: subida aditiva de la tasa."""
+        with self._lock:
+            self.tasa = min(self.tasa_max, self.tasa + self.incremento)
+
+    def penalizar(self, pausa=None):
+        """429 / 5xx: bajada multiplicativa de la tasa y pausa global (una bajada por pausa)."""
+        with self._lock:
+            ahora = time.monotonic()
+            if ahora >= self._pausa_hasta:
+                self.tasa = max(self.tasa_min, self.tasa * self.factor_bajada)
+                self.backoffs += 1
+            self._tokens = 0
+            self._pausa_hasta = max(self._pausa_hasta, ahora + (pausa or self.pausa_backoff))
+
+    def registrar(self, status_code):
+        """Ajusta la tasa según el código HTTP recibido."""
+        if status_code == 429 or status_code >= 500:
+            self.penalizar()
+        else:
+            self.exito()
+
+    def req_por_segundo(self):
+        """Tasa lograda desde que se creó el limitador."""
+        transcurrido = time.monotonic() - self._inicio
+        return self.peticiones / transcurrido if transcurrido > 0 else 0.0
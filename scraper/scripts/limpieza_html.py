@@ -0,0 +1,61 @@
+"""
+Limpieza de HTML a texto plano, compartida por el scraper y los scripts de
+imp-futuras (antes cada uno tenía su copia de limpiar_html_respetando_utf8).
+
+limpiar_html_respetando_utf8 da exactamente la misma salida que la versión
+anterior (replace de <br>/<br/>/</p>, re.sub de etiquetas, html.unescape y
+split/join) pero con menos trabajo:
+  - las etiquetas se quitan con una regex precompilada en una sola pasada;
+    los replace previos sobraban (<br>, <br/> y </p> ya son etiquetas)
+  - html.unescape solo se llama si queda algún '&'
+  - el colapso de espacios sigue siendo split/join, que en CPython es más
+    rápido que cualquier regex con callback por token
+
+Si el texto tiene un '<' que no cierra antes del siguiente '<' (HTML roto),
+la versión anterior y la regex de una pasada pueden cortar las etiquetas en
+sitios distintos; en ese caso (raro: Steam escapa los '<' como &lt;) se usa
+el algoritmo anterior tal cual, así la salida es idéntica siempre.
+
+quitar_etiquetas es la limpieza de vectorizador.py, que NO es equivalente:
+quita las etiquetas sin dejar espacio, no decodifica entidades ni colapsa
+espacios (solo strip). Se aplica sobre texto ya limpio y se mantiene así
+para no cambiar los textos que se vectorizan.
+"""
+
+import html
+import re
+
+_ETIQUETA = re.compile(r'<[^>]+>')
+# Etiqueta sin '<' dentro: con HTML bien formado coincide con _ETIQUETA
+_ETIQUETA_SIMPLE = re.compile(r'<[^<>]+>')
+
+
+def _limpiar_html_anterior(texto):
+    """Algoritmo anterior, paso a paso. Se usa como respaldo con HTML roto."""
+    texto = texto.replace('<br>', ' ').replace('<br/>', ' ').replace('</p>', ' ')
+    texto_limpio = _ETIQUETA.sub(' ', texto)
+    texto_limpio = html.unescape(texto_limpio)
+    return " ".join(texto_limpio.split())
+
+
+def limpiar_html_respetando_utf8(texto):
+    """
+    Elimina las etiquetas HTML (dejando un espacio en su lugar), decodifica
+    las entidades y colapsa los espacios. Mantiene tildes y ñ.
+    """
+    if not texto or not isinstance(texto, str):
+        return ""
+
+    texto_limpio = _ETIQUETA_SIMPLE.sub(' ', texto)
+    if '<' in texto_limpio:
+        return _limpiar_html_anterior(texto)
+    if '&' in texto_limpio:
+        texto_limpio = html.unescape(texto_limpio)
+    return " ".join(texto_limpio.split())
+
+
+def quitar_etiquetas(texto):
+    """Limpieza de vectorizador.py: quita etiquetas sin dejar espacio y hace strip."""
+    if not texto:
+        return ""
+    return _ETIQUETA.sub('', texto).strip()
@@ -0,0 +1,95 @@
+"""
+Backend ONNX Runtime con cuantización dinámica int8 para vectorizador.py
+(--backend onnx-int8).
+
+La primera vez se exporta el modelo de sentence-transformers a ONNX con
+optimum y se cuantizan sus pesos a int8 (dinámica: sin datos de calibración,
+las activaciones se cuantizan en cada llamada). El resultado queda en
+cache/onnx/<huella>-<config>/ con la huella del modelo de
+cache_embeddings.py, así que cambiar de modelo o de revisión vuelve a
+exportar; las exportaciones de otras huellas se borran.
+
+Requiere optimum[onnxruntime] (solo para este backend).
+"""
+
+import os
+import platform
+import shutil
+
+import cache_embeddings
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(SCRAPER_DIR, 'cache', 'onnx')
+
+# Configuraciones de cuantización de optimum. El modelo cuantizado funciona
+# en cualquier CPU, pero cada config elige tipos y rango de los pesos para
+# los kernels int8 de una familia de CPUs: con la de otra familia puede no
+# ganar nada frente a float32. Por defecto la de la CPU donde se ejecuta;
+# VECTOR_ONNX_CONFIG fuerza otra. Comparativa: python benchmarks/bench_backend_onnx.py
+CONFIGS = ('arm64', 'avx2', 'avx512', 'avx512_vnni')
+
+
+def config_cpu():
+    if platform.machine().lower() in ('arm64', 'aarch64'):
+        return 'arm64'
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            flags = f.read()
+    except OSError:
+        return 'avx2'
+    if 'avx512_vnni' in flags:
+        return 'avx512_vnni'
+    return 'avx512' if 'avx512f' in flags else 'avx2'
+
+
+CONFIG = os.environ.get('VECTOR_ONNX_CONFIG') or config_cpu()
+
+PROVEEDOR = 'CPUExecutionProvider'
+
+
+def archivo_cuantizado(config=CONFIG):
+    return f"onnx/model_int8_{config}.onnx"
+
+
+def variante(config=CONFIG):
+    """Lo que distingue los embeddings de este backend en la huella de la caché de embeddings."""
+    return f"onnx-int8-{config}"
+
+
+def preparar(nombre, config=CONFIG):
+    """Directorio con el modelo exportado y cuantizado (lo exporta si no existe). Retorna su ruta."""
+    huella = cache_embeddings.huella_modelo(nombre)
+    destino = os.path.join(CACHE_DIR, f"{huella}-{config}")
+    if os.path.exists(os.path.join(destino, archivo_cuantizado(config))):
+        return destino
+
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    print(f"Exportando {nombre} a ONNX int8 ({config}) en {destino}...")
+    temporal = f"{destino}.{os.getpid()}.tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    modelo = SentenceTransformer(nombre, device='cpu', backend='onnx', model_kwargs={'provider': PROVEEDOR})
+    modelo.save_pretrained(temporal)  # módulos de ST + onnx/model.onnx (float32)
+    # Sufijo fijo: optimum lo nombraría qint8 o quint8 según la config
+    export_dynamic_quantized_onnx_model(modelo, config, temporal, file_suffix=f"int8_{config}")
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporal, destino)
+
+    for carpeta in os.listdir(CACHE_DIR):
+        if not carpeta.startswith(huella):
+            shutil.rmtree(os.path.join(CACHE_DIR, carpeta), ignore_errors=True)
+    return destino
+
+
+def cargar(ruta, config=CONFIG, hilos=None):
+    """SentenceTransformer sobre el modelo int8 de preparar(); hilos limita los de ONNX Runtime."""
+    from sentence_transformers import SentenceTransformer
+
+    model_kwargs = {'file_name': archivo_cuantizado(config), 'provider': PROVEEDOR}
+    if hilos:
+        import onnxruntime
+        opciones = onnxruntime.SessionOptions()
+        opciones.intra_op_num_threads = hilos
+        opciones.inter_op_num_threads = 1
+        model_kwargs['session_options'] = opciones
+    return SentenceTransformer(ruta, device='cpu', backend='onnx', model_kwargs=model_kwargs)
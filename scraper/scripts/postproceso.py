@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Postproceso de steam-games-data.ndjson en una sola pasada.
+
+Sustituye a la secuencia desc-changer.py -> clean-tags.py: cada registro se
+lee, se decodifica una vez, pasa por las transformaciones activas y se
+escribe en un temporal que se indexa y se renombra sobre el original (una
+lectura y una escritura del dataset en lugar de una por script, y un solo
+snapshot).
+
+Transformaciones (en este orden; se eligen con --transformaciones):
+  resumenes  detailed_description <- summary de imp-futuras/data/summary.ndjson
+  tags       categories sin la lista negra de limpieza_tags.py
+  html       detailed_description sin etiquetas HTML (lo que hacía vectorizador.py)
+
+Las líneas que ninguna transformación cambia se copian tal cual, sin volver
+a serializarlas. Si no cambia ningún registro no se reescribe el archivo.
+
+Uso:
+  python scripts/postproceso.py                                   # todas
+  python scripts/postproceso.py --transformaciones resumenes,tags
+Benchmark contra la secuencia de scripts: python benchmarks/bench_postproceso.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+import indice_ndjson
+import snapshots
+from limpieza_html import quitar_etiquetas
+from limpieza_tags import limpiar_tags
+
+# Forzar que los prints se muestren inmediatamente (sin buffer)
+sys.stdout.reconfigure(line_buffering=True)
+
+# Obtener la ruta del directorio raíz del proyecto
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Configuración de archivos
+ARCHIVO_SUMMARY = os.path.join(PROJECT_ROOT, 'imp-futuras', 'data', 'summary.ndjson')
+ARCHIVO_STEAM_DATA = os.path.join(PROJECT_ROOT, 'scraper', 'data', 'steam-games-data.ndjson')
+NOMBRE_SNAPSHOT = 'steam-games-data'
+
+
+# ==========================================
+# TRANSFORMACIONES
+# ==========================================
+# Cada una recibe (juego, contexto), modifica el dict en sitio y retorna True
+# si ha cambiado algo.
+
+def resumen_de(resumenes, steam_id):
+    """
+    summary del appid en summary.ndjson (None si no hay). Gana la última línea
+    del appid con resumen, como en el desc-changer.py original: si la que
+    apunta el índice está vacía o es ilegible se mira en las anteriores.
+    """
+    try:
+        resumen = resumenes.get(steam_id, {}).get('summary')
+    except (ValueError, AttributeError):
+        resumen = None
+    if resumen or steam_id not in resumenes:
+        return resumen or None
+    return _ultimos_no_vacios(resumenes.ruta).get(str(steam_id))
+
+
+_NO_VACIOS = {}
+
+
+def _ultimos_no_vacios(ruta):
+    """{steam_id (str): último summary no vacío}. Una pasada por el archivo, solo si hace falta."""
+    estado = os.stat(ruta)
+    clave = (ruta, estado.st_size, estado.st_mtime_ns)
+    if clave not in _NO_VACIOS:
+        ultimos = {}
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    doc = json.loads(linea)
+                except ValueError:
+                    continue
+                if isinstance(doc, dict) and doc.get('steam_id') is not None and doc.get('summary'):
+                    ultimos[str(doc['steam_id'])] = doc['summary']
+        _NO_VACIOS.clear()
+        _NO_VACIOS[clave] = ultimos
+    return _NO_VACIOS[clave]
+
+
+def reemplazar_resumen(juego, contexto):
+    resumen = resumen_de(contexto['resumenes'], juego.get('steam_id'))
+    if resumen is None or juego.get('detailed_description') == resumen:
+        return False
+    juego['detailed_description'] = resumen
+    return True
+
+
+def quitar_tags_basura(juego, contexto):
+    categorias = juego.get('categories')
+    if not categorias:
+        return False
+    limpias = limpiar_tags(categorias)
+    if len(limpias) == len(categorias):
+        return False
+    juego['categories'] = limpias
+    return True
+
+
+def quitar_html(juego, contexto):
+    descripcion = juego.get('detailed_description')
+    if not descripcion or '<' not in descripcion:
+        return False
+    limpia = quitar_etiquetas(descripcion)
+    if limpia == descripcion:
+        return False
+    juego['detailed_description'] = limpia
+    return True
+
+
+TRANSFORMACIONES = {
+    'resumenes': reemplazar_resumen,
+    'tags': quitar_tags_basura,
+    'html': quitar_html,
+}
+
+
+# ==========================================
+# PASADA ÚNICA
+# ==========================================
+def procesar(ruta_entrada, ruta_salida, activas, contexto):
+    """
+    Aplica las transformaciones `activas` (nombres de TRANSFORMACIONES) a
+    cada registro de ruta_entrada y escribe el resultado en ruta_salida.
+    Retorna un Counter: total, modificados, ilegibles y uno por transformación.
+    """
+    funciones = [(nombre, TRANSFORMACIONES[nombre]) for nombre in activas]
+    contadores = Counter()
+    with open(ruta_entrada, 'rb') as entrada, open(ruta_salida, 'wb') as salida:
+        for linea in entrada:
+            contenido = linea.rstrip(b'\r\n')
+            if not contenido.strip():
+                continue
+            contadores['total'] += 1
+            try:
+                juego = json.loads(contenido)
+            except ValueError:
+                # Se conserva tal cual: no es este paso quien debe perder registros
+                contadores['ilegibles'] += 1
+                salida.write(contenido + b"\n")
+                continue
+            cambiado = False
+            for nombre, funcion in funciones:
+                if funcion(juego, contexto):
+                    contadores[nombre] += 1
+                    cambiado = True
+            if cambiado:
+                contadores['modificados'] += 1
+                salida.write(json.dumps(juego, ensure_ascii=False).encode('utf-8') + b"\n")
+            else:
+                salida.write(contenido + b"\n")
+        salida.flush()
+        os.fsync(salida.fileno())
+    return contadores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Postproceso de steam-games-data.ndjson en una sola pasada")
+    parser.add_argument('--transformaciones', default=','.join(TRANSFORMACIONES),
+                        help=f"Separadas por comas, en cualquier orden (por defecto: {','.join(TRANSFORMACIONES)})")
+    args = parser.parse_args()
+
+    pedidas = {t.strip() for t in args.transformaciones.split(',') if t.strip()}
+    desconocidas = pedidas - set(TRANSFORMACIONES)
+    if desconocidas:
+        parser.error(f"transformaciones desconocidas: {', '.join(sorted(desconocidas))}")
+    # Siempre en el orden de TRANSFORMACIONES: el HTML se limpia después de poner el resumen
+    activas = [nombre for nombre in TRANSFORMACIONES if nombre in pedidas]
+
+    print(f"[*] INICIANDO POSTPROCESO")
+    print(f"[*] Steam data: {ARCHIVO_STEAM_DATA}")
+
+    if not os.path.exists(ARCHIVO_STEAM_DATA):
+        print(f"[ERROR] No se encuentra '{ARCHIVO_STEAM_DATA}'")
+        return
+
+    contexto = {'resumenes': None}
+    if 'resumenes' in activas:
+        if os.path.exists(ARCHIVO_SUMMARY):
+            # Índice de summary.ndjson: solo se decodifican los resúmenes que se usan
+            contexto['resumenes'] = indice_ndjson.IndiceNDJSON(ARCHIVO_SUMMARY).abrir()
+            print(f"[*] Summary source: {ARCHIVO_SUMMARY} ({len(contexto['resumenes'])} resúmenes)")
+        else:
+            print(f"[WARN] No se encuentra '{ARCHIVO_SUMMARY}'; se omite el reemplazo de resúmenes")
+            activas.remove('resumenes')
+    print(f"[*] Transformaciones: {', '.join(activas) or 'ninguna'}")
+
+    inicio = time.perf_counter()
+    temporal = ARCHIVO_STEAM_DATA + '.tmp'
+    try:
+        contadores = procesar(ARCHIVO_STEAM_DATA, temporal, activas, contexto)
+    finally:
+        if contexto['resumenes'] is not None:
+            contexto['resumenes'].cerrar()
+
+    if contadores['modificados']:
+        print(f"\n[*] Creando snapshot de steam-games-data.ndjson...")
+        print(f"[OK] Snapshot {snapshots.resumen(snapshots.guardar(NOMBRE_SNAPSHOT, ARCHIVO_STEAM_DATA), NOMBRE_SNAPSHOT)}")
+        indice_ndjson.construir(temporal, indice_ndjson.ruta_indice(ARCHIVO_STEAM_DATA))
+        os.replace(temporal, ARCHIVO_STEAM_DATA)
+        print(f"[OK] Archivo actualizado guardado")
+    else:
+        os.remove(temporal)
+        print(f"\n[OK] Ningún registro cambia; no se reescribe el archivo")
+
+    print("\n" + "="*60)
+    print(f"[DONE] POSTPROCESO COMPLETADO en {time.perf_counter() - inicio:.2f}s")
+    print(f"[INFO] Total de entradas: {contadores['total']}")
+    print(f"[INFO] Modificadas: {contadores['modificados']}")
+    for nombre in activas:
+        print(f"[INFO]   {nombre}: {contadores[nombre]}")
+    if contadores['ilegibles']:
+        print(f"[WARN] Líneas con JSON ilegible (copiadas sin cambios): {contadores['ilegibles']}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
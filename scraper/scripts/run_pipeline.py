@@ -7,6 +7,9 @@ Ejecuta dos scripts en secuencia:
   2. sacar-datos-games.py -> Obtiene detalles completos de cada juego
 
 Si el primer script falla, el segundo no se ejecuta.
+
+Los argumentos extra se reenvían a sacar-datos-games.py, p. ej.:
+  python run_pipeline.py --solo-precios
 """
 
 import subprocess
@@ -30,7 +33,8 @@ SCRIPTS = [
     {
         "nombre": "sacar-datos-games.py", 
         "descripcion": "Descarga de datos completos de juegos",
-        "archivo_salida": "/home/g6/reto/scraper/data/steam-games-data.ndjson"
+        "archivo_salida": "/home/g6/reto/scraper/data/steam-games-data.ndjson",
+        "acepta_argumentos": True  # Recibe los argumentos extra de run_pipeline.py
     }
 ]
 
@@ -56,7 +60,7 @@ def verificar_archivo(ruta):
         return False, f"No se encontró el archivo: {ruta}"
     return True, None
 
-def ejecutar_script(script_info):
+def ejecutar_script(script_info, argumentos=None):
     """
     Ejecuta un script Python y retorna si fue exitoso
     Muestra el output en tiempo real línea por línea
@@ -72,14 +76,15 @@ def ejecutar_script(script_info):
         return False
     
     log(f"Iniciando: {descripcion}", "START")
-    log(f"Ejecutando: {nombre}", "INFO")
+    argumentos = argumentos if script_info.get("acepta_argumentos") else []
+    log(f"Ejecutando: {nombre} {' '.join(argumentos or [])}".rstrip(), "INFO")
     print("-" * 70)
     
     try:
         # Ejecutar el script con output en tiempo real
         # -u fuerza unbuffered output para ver el progreso inmediatamente
         proceso = subprocess.Popen(
-            [PYTHON_EXECUTABLE, "-u", ruta_completa],
+            [PYTHON_EXECUTABLE, "-u", ruta_completa] + (argumentos or []),
             cwd=SCRIPT_DIR,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,  # Combinar stderr con stdout
@@ -146,7 +151,7 @@ def main():
         log("-" * 70, "INFO")
         
         inicio = datetime.now()
-        exito = ejecutar_script(script)
+        exito = ejecutar_script(script, sys.argv[1:])
         fin = datetime.now()
         duracion = (fin - inicio).total_seconds()
         
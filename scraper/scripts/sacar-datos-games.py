@@ -1,13 +1,25 @@
 import requests
+import argparse
 import json
 import time
 import logging
 import os
-import html
 import re
 import sys
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+import cache_steam
+import filtro_juegos
+import indice_ndjson
+from indice_ndjson import IndiceNDJSON
+from journal import JournalNDJSON, calcular_run_id
+from limpieza_html import limpiar_html_respetando_utf8
+from limitador import LimitadorAIMD
+
 # Forzar que los prints se muestren inmediatamente (sin buffer)
 sys.stdout.reconfigure(line_buffering=True)
 
@@ -29,94 +41,150 @@ CANTIDAD_A_PROCESAR = 0
 
 ARCHIVO_ENTRADA = os.path.join(PROJECT_ROOT, 'data', 'steam-top-games.json')
 ARCHIVO_SALIDA = os.path.join(PROJECT_ROOT, 'data', 'steam-games-data.ndjson') 
+# Filas de búsqueda de gameid-script.py y huellas de esas filas en la última ejecución
+ARCHIVO_FILAS = os.path.join(PROJECT_ROOT, 'data', 'steam-search-rows.json')
+ARCHIVO_HUELLAS = os.path.join(PROJECT_ROOT, 'data', 'steam-search-rows-procesadas.json')
+# Frescura por juego: {appid: {"estatico": fecha, "volatil": fecha}}
+ARCHIVO_FRESCURA = os.path.join(PROJECT_ROOT, 'data', 'steam-games-frescura.json')
+# Caché de tags de usuario: {appid: {"tags": [...], "fecha": fecha, "etag": ..., "last_modified": ...}}
+ARCHIVO_TAGS = os.path.join(PROJECT_ROOT, 'data', 'steam-tags-cache.json')
+# Cola de fallidos (dead letter): {appid: {"motivo", "status", "intentos", "primer_fallo", "ultimo_fallo"}}
+ARCHIVO_FALLIDOS = os.path.join(PROJECT_ROOT, 'data', 'steam-games-fallidos.json')
 
-URL_DETALLES = "https://store.steampowered.com/api/appdetails/"
+# STEAM_STORE_URL permite apuntar a otro servidor (p. ej. benchmarks/mock_steam.py)
+URL_TIENDA = os.environ.get('STEAM_STORE_URL', 'https://store.steampowered.com').rstrip('/')
+URL_DETALLES = f"{URL_TIENDA}/api/appdetails/"
 PARAMS_BASE = {"cc": "es", "l": "spanish"}
-DELAY = 1.3 
-URL_STORE_PAGE = "https://store.steampowered.com/app/{appid}/?l=spanish&cc=es"
+URL_STORE_PAGE = URL_TIENDA + "/app/{appid}/?l=spanish&cc=es"
+TIMEOUT = 10
+
+# Motor concurrente: hilos en paralelo + limitador token bucket con AIMD.
+# La tasa arranca en el equivalente al antiguo DELAY = 1.3 y se adapta sola:
+# sube mientras Steam responde bien y se divide ante 429/5xx.
+MAX_HILOS = 8
+TASA_INICIAL = 1 / 1.3   # peticiones/s
+TASA_MAXIMA = 6.0        # peticiones/s
+MAX_REINTENTOS = 3
+LOG_CADA = 100           # cada cuántos juegos se loguea el throughput
+
+# Pipeline por etapas con colas acotadas (backpressure):
+#   descargas (MAX_HILOS hilos) -> parseo/limpieza (PROCESOS_PARSEO procesos)
+#   -> escritor único por lotes (un fsync del journal por lote)
+# Si una etapa va lenta su cola de entrada se llena y las anteriores se frenan.
+# SCRAPER_PROCESOS_PARSEO=0 parsea en un hilo (entornos sin multiprocessing).
+PROCESOS_PARSEO = int(os.environ.get('SCRAPER_PROCESOS_PARSEO', max(1, min(4, (os.cpu_count() or 2) - 1))))
+TAMANO_COLA = 64
+MAX_EN_PARSEO = 2 * max(1, PROCESOS_PARSEO)
+TAMANO_LOTE_ESCRITURA = 50
+FIN_PARSEO = object()    # aviso de la etapa de parseo al escritor si termina antes de tiempo
+INTERVALO_METRICAS = 10  # segundos entre logs de profundidad de colas
+
+# Campos de la fila de búsqueda que, si no cambian, permiten conservar el registro
+# anterior sin pedir appdetails. El recuento de reseñas queda fuera a propósito:
+# cambia a diario en los juegos populares y anularía el ahorro.
+# OJO: las filas vienen de la búsqueda de gameid-script.py, que pide cc=us, y los
+# registros se piden con cc=es. La huella es solo un indicador: un cambio de precio
+# únicamente regional (ES) no se ve, y ese precio no se corrige hasta que caduque
+# TTL_ESTATICO_HORAS y se descargue el juego completo.
+CAMPOS_HUELLA = ('price_final', 'discount_pct', 'released', 'review_summary')
+
+# Refresco incremental por TTL (horas):
+#  - Estáticos (descripciones, requisitos, desarrolladores, géneros...): al
+#    caducar se descarga el juego completo.
+#  - Volátiles (precio y recomendaciones): al caducar se piden solo esos campos.
+#    appdetails acepta varios appids por llamada si se filtra por price_overview;
+#    las recomendaciones van con filters=recommendations (una llamada ligera por juego).
+TTL_ESTATICO_HORAS = 7 * 24
+TTL_VOLATIL_HORAS = 20
+CAMPOS_VOLATILES = ('price_eur', 'price_initial_eur', 'discount_pct', 'is_free', 'recommendations_total')
+TAMANO_LOTE_PRECIOS = 100
+FORMATO_FECHA = '%Y-%m-%d %H:%M:%S'
+
+# Tags de usuario (página de tienda): cambian poco, así que tienen caché propia
+# con su TTL. Al caducar se piden con If-None-Match / If-Modified-Since y un 304
+# solo renueva la fecha. Se descargan en su propio pool de hilos, en paralelo
+# con appdetails (comparten el limitador), en cuanto appdetails de cada appid
+# ha respondido: los no disponibles y los que no son juegos no se piden.
+TTL_TAGS_HORAS = 14 * 24
+MAX_HILOS_TAGS = 4
+ESTADOS_SIN_TAGS = ('UNAVAILABLE', 'EXCLUIDO')
+
+# La página de tienda se lee en streaming: en cuanto se ha visto el bloque
+# popular_tags (o se llega a BYTES_MAX_TIENDA) se corta la conexión sin bajar
+# el resto (scripts, reseñas...). Los bytes ahorrados van al log de métricas.
+BYTES_MAX_TIENDA = 512 * 1024
+TAMANO_TROZO = 16 * 1024
+
+# Cola de fallidos: los juegos cuya descarga completa falla (429 persistente,
+# 5xx, timeout, JSON roto...) se apuntan con motivo e intentos y se reintentan
+# al final de la ejecución, en RONDAS_REINTENTO rondas con HILOS_REINTENTO hilos
+# y su propio backoff (PAUSA_REINTENTO segundos, el doble en cada ronda).
+# Los que sigan fallando conservan su registro anterior en vez de desaparecer.
+ESTADOS_FALLIDOS = ('RATE_LIMIT', 'HTTP_ERROR', 'EXCEPTION')
+RONDAS_REINTENTO = 2
+PAUSA_REINTENTO = 30
+HILOS_REINTENTO = 2
+
+LIMITADOR = LimitadorAIMD(tasa_inicial=TASA_INICIAL, tasa_max=TASA_MAXIMA)
+_local = threading.local()
+# Totales de la descarga en streaming de páginas de tienda (los suman varios hilos)
+BYTES_TIENDA = {"paginas": 0, "leidos": 0, "ahorrados": 0, "cortadas": 0}
+_lock_bytes = threading.Lock()
+# Appids cuyo `type` en appdetails no es un juego: {appid: data}. Al terminar
+# pasan a la lista de exclusión de filtro_juegos y no se vuelven a pedir
+EXCLUIDOS_NUEVOS = {}
+
+def obtener_sesion():
+    """Una requests.Session por hilo (reutiliza conexiones keep-alive)."""
+    if not hasattr(_local, 'sesion'):
+        _local.sesion = requests.Session()
+    return _local.sesion
 
 # =================================================================
 # 2. FUNCIONES DE SINCRONIZACIÓN
 # =================================================================
-def cargar_ids_desde_ndjson(filepath):
-    """Carga todos los IDs del archivo NDJSON existente."""
-    ids = set()
+def cargar_json(filepath, defecto):
+    """Carga un JSON auxiliar; si no existe o está corrupto devuelve `defecto`."""
     if not os.path.exists(filepath):
-        return ids
-    
+        return defecto
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            for linea in f:
-                if linea.strip():
-                    doc = json.loads(linea)
-                    ids.add(doc.get('steam_id'))
+            return json.load(f)
     except Exception as e:
-        logging.error(f"Error al cargar IDs desde NDJSON: {e}")
-    
-    return ids
+        logging.error(f"Error al cargar {filepath}: {e}")
+        return defecto
 
-def sincronizar_datos(lista_entrada, archivo_salida):
+def huella_fila(fila):
+    """Huella comparable de una fila de búsqueda (None si no hay fila)."""
+    if not fila:
+        return None
+    return [fila.get(campo) for campo in CAMPOS_HUELLA]
+
+def sincronizar_datos(lista_entrada, registros_existentes):
     """
     Sincroniza los datos:
-    1. Si no existe archivo_salida: procesar todos
-    2. Si existe: elimina obsoletos, reprocesa todo para actualizar precios
-    
+    1. Si no hay registros existentes: procesar todos
+    2. Si los hay: descarta obsoletos. Qué se vuelve a pedir de cada juego
+       lo decide main() según su frescura (TTL estático/volátil)
+
+    No toca el archivo de salida: la salida nueva se publica de forma
+    atómica al final (journal.py), así un fallo a mitad no pierde nada.
+
     Retorna: lista de IDs a procesar
     """
     ids_nuevos = set(juego.get('appid') for juego in lista_entrada)
-    ids_existentes = cargar_ids_desde_ndjson(archivo_salida)
+    ids_existentes = set(registros_existentes)
     ids_a_eliminar = ids_existentes - ids_nuevos
     
     print(f"\n[SINCRONIZACIÓN]")
     print(f"  Total IDs en steam-top-games.json: {len(ids_nuevos)}")
     print(f"  Total IDs en steam-games-data.ndjson: {len(ids_existentes)}")
-    print(f"  IDs a reprocesar (actualizar precios): {len(ids_nuevos)}")
+    print(f"  IDs a sincronizar (según TTL): {len(ids_nuevos)}")
     print(f"  IDs obsoletos a eliminar: {len(ids_a_eliminar)}")
     print()
-    
-    # Eliminar obsoletos si existen
-    if len(ids_a_eliminar) > 0:
-        print(f"[*] Eliminando {len(ids_a_eliminar)} registros obsoletos...")
-        datos_validos = []
-        try:
-            with open(archivo_salida, 'r', encoding='utf-8') as f:
-                for linea in f:
-                    if linea.strip():
-                        doc = json.loads(linea)
-                        if doc.get('steam_id') in ids_nuevos:
-                            datos_validos.append(doc)
-        except Exception as e:
-            logging.error(f"Error al leer datos: {e}")
-        
-        with open(archivo_salida, 'w', encoding='utf-8') as f:
-            for doc in datos_validos:
-                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
-        
-        logging.info(f"SINCRONIZACIÓN | Eliminados:{len(ids_a_eliminar)} | A reprocesar:{len(ids_nuevos)}")
-    else:
-        # Vaciar archivo para reprocesar todo
-        if os.path.exists(archivo_salida):
-            with open(archivo_salida, 'w', encoding='utf-8') as f:
-                pass
-    
+
+    logging.info(f"SINCRONIZACIÓN | Eliminados:{len(ids_a_eliminar)} | A sincronizar:{len(ids_nuevos)}")
     return list(ids_nuevos)
-def limpiar_html_respetando_utf8(texto):
-    """
-    Elimina las etiquetas HTML
-    """
-    if not texto or not isinstance(texto, str): return ""
-    
-    # 1. Reemplazar saltos de línea HTML por espacios para que no se peguen las palabras
-    texto = texto.replace('<br>', ' ').replace('<br/>', ' ').replace('</p>', ' ')
-    
-    # 2. Eliminar cualquier etiqueta HTML (<...>) usando Expresiones Regulares
-    texto_limpio = re.sub(r'<[^>]+>', ' ', texto)
-    
-    # 3. Decodificar entidades HTML (Ej: convierte "&quot;" en comillas reales, "&amp;" en &)
-    texto_limpio = html.unescape(texto_limpio)
-    
-    # 4. Eliminar espacios dobles o triples que hayan quedado
-    return " ".join(texto_limpio.split())
 
 def extraer_tags_populares(html, max_tags=10):
     try:
@@ -137,16 +205,103 @@ def extraer_tags_populares(html, max_tags=10):
         logging.warning(f"Error al extraer tags populares: {e}")
         return []
 
-def obtener_tags_populares(appid):
+def tags_desde_cache(appid):
+    """Tags de la página de tienda guardada en cache_steam (modo --replay)."""
+    entrada = cache_steam.leer(URL_STORE_PAGE.format(appid=appid))
+    return extraer_tags_populares(entrada['body']) if entrada else []
+
+def descargar_pagina_tienda(appid, url, headers):
+    """
+    GET en streaming de la página de tienda. Lee trozos hasta ver el cierre
+    del bloque popular_tags o llegar a BYTES_MAX_TIENDA y cierra la conexión
+    sin leer el resto. Los bytes se cuentan en la red (comprimidos), así que
+    el ahorro solo se conoce si el servidor manda Content-Length.
+
+    Retorna: (status_code, html leído o None si no es un 200, cabeceras)
+    """
+    inicio = time.time()
+    resp = obtener_sesion().get(url, headers=headers, timeout=TIMEOUT, stream=True)
+    if resp.status_code != 200:
+        resp.close()
+        return resp.status_code, None, resp.headers
+
+    leido = bytearray()
+    pos_bloque = -1
+    cortada = False
+    try:
+        for trozo in resp.iter_content(TAMANO_TROZO):
+            desde = max(0, len(leido) - 16)
+            leido += trozo
+            if pos_bloque < 0:
+                pos_bloque = leido.find(b'popular_tags', desde)
+                desde = pos_bloque
+            # El primer </div> tras abrir el bloque va después de todos los <a class="app_tag">
+            if pos_bloque >= 0 and leido.find(b'</div>', max(desde, pos_bloque)) >= 0:
+                cortada = True
+                break
+            if len(leido) >= BYTES_MAX_TIENDA:
+                cortada = True
+                break
+        en_red = resp.raw.tell()
+    finally:
+        resp.close()
+
+    total = resp.headers.get('Content-Length')
+    ahorrados = max(0, int(total) - en_red) if total and total.isdigit() else 0
+    latencia = round(time.time() - inicio, 4)
+    with _lock_bytes:
+        BYTES_TIENDA["paginas"] += 1
+        BYTES_TIENDA["leidos"] += en_red
+        BYTES_TIENDA["ahorrados"] += ahorrados
+        BYTES_TIENDA["cortadas"] += cortada
+    logging.info(f"STORE_PAGE | ID:{appid} | LEIDOS:{en_red} | AHORRADOS:{ahorrados if total else '?'} "
+                 f"| TAGS_VISTOS:{pos_bloque >= 0} | LATENCY:{latencia}s")
+
+    return resp.status_code, bytes(leido).decode(resp.encoding or 'utf-8', errors='ignore'), resp.headers
+
+def obtener_tags_populares(appid, previa=None, ttl_horas=TTL_TAGS_HORAS):
+    """
+    Tags de usuario de un juego usando su entrada de la caché de tags:
+      - vigente (menos de ttl_horas)  -> se devuelve sin pedir nada
+      - caducada con ETag/Last-Modified -> petición condicional; un 304 renueva la fecha
+      - sin entrada                   -> descarga completa de la página
+
+    Retorna: (estado, entrada)
+      estado  -> 'CACHE' | 'NOT_MODIFIED' | 'OK' | 'ERROR'
+      entrada -> {"tags", "fecha", "etag", "last_modified"} (la previa si falla)
+    """
+    if previa and edad_horas(previa.get('fecha')) <= ttl_horas:
+        return 'CACHE', previa
+
+    url = URL_STORE_PAGE.format(appid=appid)
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if previa:
+        if previa.get('etag'):
+            headers['If-None-Match'] = previa['etag']
+        if previa.get('last_modified'):
+            headers['If-Modified-Since'] = previa['last_modified']
+
+    ahora = datetime.utcnow().strftime(FORMATO_FECHA)
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(URL_STORE_PAGE.format(appid=appid), headers=headers, timeout=10)
-        if resp.status_code == 200:
-            return extraer_tags_populares(resp.text)
-        logging.warning(f"Fallo al pedir tags populares {appid}: status {resp.status_code}")
+        LIMITADOR.adquirir()
+        status_code, texto, cabeceras = descargar_pagina_tienda(appid, url, headers)
+        LIMITADOR.registrar(status_code)
+        if status_code == 304 and previa:
+            return 'NOT_MODIFIED', dict(previa, fecha=ahora)
+        if status_code == 200:
+            # En la caché queda la página hasta el bloque de tags, que es lo que usa --replay
+            cache_steam.guardar(url, None, status_code, texto)
+            return 'OK', {
+                "tags": extraer_tags_populares(texto),
+                "fecha": ahora,
+                "etag": cabeceras.get('ETag'),
+                "last_modified": cabeceras.get('Last-Modified'),
+            }
+        logging.warning(f"Fallo al pedir tags populares {appid}: status {status_code}")
     except Exception as e:
         logging.warning(f"Excepcion al pedir tags populares {appid}: {e}")
-    return []
+    return 'ERROR', previa
+
 def normalizar_fecha(fecha_texto):
     if not fecha_texto: return None
     meses = {
@@ -167,7 +322,13 @@ def normalizar_fecha(fecha_texto):
 # =================================================================
 # 3. PROCESAMIENTO DE DATOS
 # =================================================================
-def procesar_juego_elk(appid, data):
+def procesar_juego_elk(appid, data, tags_populares=None, scraped_at=None):
+    """
+    Convierte el `data` de appdetails en el registro NDJSON.
+    tags_populares: tags de usuario ya obtenidos (etapa de tags); si no hay,
+    categories se queda con las categorías de appdetails.
+    scraped_at: usado por --replay (fecha de la respuesta cacheada en vez de la actual).
+    """
     is_free = data.get('is_free', False)
     price_data = data.get('price_overview', {})
     
@@ -192,8 +353,7 @@ def procesar_juego_elk(appid, data):
     # --- LISTAS ---
     genres = [g['description'] for g in data.get('genres', [])]
     categories_raw = [c['description'] for c in data.get('categories', [])]
-    categories_populares = obtener_tags_populares(appid)
-    categories = categories_populares if categories_populares else categories_raw
+    categories = tags_populares if tags_populares else categories_raw
     devs = data.get('developers', [])
     pubs = data.get('publishers', [])
     
@@ -203,7 +363,7 @@ def procesar_juego_elk(appid, data):
     # --- FECHAS ---
     raw_date = data.get('release_date', {}).get('date', '')
     iso_date = normalizar_fecha(raw_date)
-    now_clean = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    now_clean = scraped_at or datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
 
     return {
         "steam_id": int(appid),
@@ -239,11 +399,454 @@ def procesar_juego_elk(appid, data):
     }
 
 # =================================================================
-# 4. EJECUCIÓN PRINCIPAL
+# 4. DESCARGA CONCURRENTE
+# =================================================================
+def descargar_juego(appid):
+    """
+    Etapa de descarga: pide appdetails respetando el limitador compartido.
+    Reintenta ante 429/5xx tras el backoff del limitador. El procesado
+    (limpieza HTML, etc.) lo hace la etapa de parseo.
+
+    Retorna: (estado, data de appdetails, latencia, status_code)
+      estado -> 'OK' | 'UNAVAILABLE' | 'EXCLUIDO' | 'RATE_LIMIT' | 'HTTP_ERROR' | 'EXCEPTION'
+      ('EXCLUIDO': el `type` no es un juego, p. ej. dlc o music)
+    """
+    status_code = 0
+    duration = 0.0
+    estado = 'EXCEPTION'
+
+    for _ in range(MAX_REINTENTOS):
+        LIMITADOR.adquirir()
+        start_time = time.time()
+        try:
+            params = dict(PARAMS_BASE, appids=appid)
+            r = obtener_sesion().get(URL_DETALLES, params=params, timeout=TIMEOUT)
+            status_code = r.status_code
+            duration = round(time.time() - start_time, 4)
+            LIMITADOR.registrar(status_code)
+
+            if status_code == 200:
+                cache_steam.guardar(URL_DETALLES, params, status_code, r.text)
+                d = r.json()
+                if d and str(appid) in d and d[str(appid)]['success']:
+                    data = d[str(appid)]['data']
+                    if data.get('type') in filtro_juegos.TIPOS_EXCLUIDOS:
+                        EXCLUIDOS_NUEVOS[appid] = data
+                        return 'EXCLUIDO', None, duration, status_code
+                    return 'OK', data, duration, status_code
+                return 'UNAVAILABLE', None, duration, status_code
+
+            if status_code == 429:
+                estado = 'RATE_LIMIT'
+                logging.error(f"RATE_LIMIT_429 | ID:{appid} | TASA:{LIMITADOR.tasa:.2f}req/s")
+                continue
+            if status_code >= 500:
+                estado = 'HTTP_ERROR'
+                logging.error(f"HTTP_ERROR | STATUS:{status_code} | ID:{appid} | TASA:{LIMITADOR.tasa:.2f}req/s")
+                continue
+            return 'HTTP_ERROR', None, duration, status_code
+
+        except Exception as e:
+            duration = round(time.time() - start_time, 4)
+            logging.error(f"EXCEPTION | ID:{appid} | ERROR:{e}")
+            return 'EXCEPTION', None, duration, status_code
+
+    return estado, None, duration, status_code
+
+def reconstruir_desde_cache(lista, registros_previos, frescura):
+    """
+    Modo --replay: rehace los registros desde las respuestas cacheadas
+    (appdetails + página de tienda) sin tocar la red. Los juegos sin
+    respuesta en caché conservan su registro anterior, si lo hay; los que
+    no son juegos según su `type` se descartan.
+
+    Los refrescos de volátiles (lotes de precios, recomendaciones) no se
+    cachean: si el registro anterior tiene los volátiles más recientes que
+    la respuesta cacheada, se arrastran a la reconstrucción. `frescura` se
+    actualiza en sitio con las fechas de cada doc devuelto.
+
+    Retorna: (docs en el orden de la lista, nº reconstruidos, nº conservados)
+    """
+    docs = []
+    reconstruidos = 0
+    conservados = 0
+    for juego in lista:
+        appid = juego.get('appid')
+        entrada = cache_steam.leer(URL_DETALLES, dict(PARAMS_BASE, appids=appid))
+        try:
+            d = json.loads(entrada['body']) if entrada else None
+        except ValueError:
+            d = None
+        if d and str(appid) in d and d[str(appid)]['success']:
+            if d[str(appid)]['data'].get('type') in filtro_juegos.TIPOS_EXCLUIDOS:
+                continue
+            doc = procesar_juego_elk(appid, d[str(appid)]['data'], tags_populares=tags_desde_cache(appid),
+                                     scraped_at=entrada['fetched_at'])
+            fecha_volatil = entrada['fetched_at']
+            if appid in registros_previos:
+                _, volatil_previo = frescura_de(appid, registros_previos, frescura)
+                if edad_horas(volatil_previo) <= edad_horas(fecha_volatil):
+                    previo = registros_previos[appid]
+                    doc.update({campo: previo[campo] for campo in CAMPOS_VOLATILES if campo in previo})
+                    fecha_volatil = volatil_previo
+            frescura[str(appid)] = {"estatico": entrada['fetched_at'], "volatil": fecha_volatil}
+            docs.append(doc)
+            reconstruidos += 1
+        elif appid in registros_previos:
+            fecha_estatico, fecha_volatil = frescura_de(appid, registros_previos, frescura)
+            frescura[str(appid)] = {"estatico": fecha_estatico, "volatil": fecha_volatil}
+            docs.append(registros_previos[appid])
+            conservados += 1
+    return docs, reconstruidos, conservados
+
+def edad_horas(fecha_texto):
+    """Horas desde `fecha_texto` (formato scraped_at); infinito si no es válida."""
+    try:
+        fecha = datetime.strptime(fecha_texto, FORMATO_FECHA)
+    except (TypeError, ValueError):
+        return float('inf')
+    return (datetime.utcnow() - fecha).total_seconds() / 3600
+
+def frescura_de(appid, registros, frescura):
+    """
+    Fechas de último refresco estático/volátil (por defecto, el scraped_at del
+    registro, que solo se decodifica si falta en el sidecar de frescura).
+    """
+    entrada = frescura.get(str(appid), {})
+    if entrada.get('estatico') and entrada.get('volatil'):
+        return entrada['estatico'], entrada['volatil']
+    scraped_at = registros[appid].get('scraped_at')
+    return (entrada.get('estatico') or scraped_at,
+            entrada.get('volatil') or scraped_at)
+
+def aplicar_precio(doc, data):
+    """
+    Parchea los campos de precio de un registro con la respuesta
+    filtrada por price_overview (misma lógica que procesar_juego_elk).
+    Sin price_overview, Steam devuelve data = [] tanto para un juego gratis
+    como para uno de pago bloqueado por región o retirado temporalmente:
+    los precios solo se ponen a 0 si la respuesta trae is_free. Un registro
+    que ya era gratis se queda como está; uno de pago conserva su precio.
+
+    Retorna: True si el precio quedó refrescado, False si no (el juego de
+    pago sin price_overview cuenta como refresco fallido).
+    """
+    price_data = data.get('price_overview') if isinstance(data, dict) else None
+
+    if price_data:
+        doc['is_free'] = False
+        doc['price_eur'] = float(price_data.get('final', 0)) / 100
+        doc['price_initial_eur'] = float(price_data.get('initial', 0)) / 100
+        doc['discount_pct'] = int(price_data.get('discount_percent', 0))
+        return True
+    if isinstance(data, dict) and data.get('is_free'):
+        doc['is_free'] = True
+        doc['price_eur'] = 0.0
+        doc['price_initial_eur'] = 0.0
+        doc['discount_pct'] = 0
+        return True
+    return bool(doc.get('is_free'))
+
+def descargar_lote_precios(appids):
+    """
+    Pide price_overview para varios appids en una sola llamada.
+
+    Retorna: dict {appid: data} solo con los appids que respondieron con éxito.
+    """
+    params = dict(PARAMS_BASE, appids=",".join(str(a) for a in appids), filters="price_overview")
+
+    for _ in range(MAX_REINTENTOS):
+        LIMITADOR.adquirir()
+        start_time = time.time()
+        try:
+            r = obtener_sesion().get(URL_DETALLES, params=params, timeout=TIMEOUT)
+            duration = round(time.time() - start_time, 4)
+            LIMITADOR.registrar(r.status_code)
+
+            if r.status_code == 200:
+                d = r.json() or {}
+                logging.info(f"PRICE_BATCH | IDS:{len(appids)} | LATENCY:{duration}s")
+                return {
+                    int(aid): entrada.get('data', [])
+                    for aid, entrada in d.items()
+                    if entrada and entrada.get('success')
+                }
+
+            logging.error(f"PRICE_BATCH_HTTP_ERROR | STATUS:{r.status_code} | IDS:{len(appids)}")
+            if r.status_code != 429 and r.status_code < 500:
+                break
+
+        except Exception as e:
+            logging.error(f"PRICE_BATCH_EXCEPTION | IDS:{len(appids)} | ERROR:{e}")
+            break
+
+    return {}
+
+def descargar_recomendaciones(appid):
+    """Pide solo el bloque recommendations de un juego. Retorna el total o None."""
+    params = dict(PARAMS_BASE, appids=appid, filters="recommendations")
+
+    for _ in range(MAX_REINTENTOS):
+        LIMITADOR.adquirir()
+        try:
+            r = obtener_sesion().get(URL_DETALLES, params=params, timeout=TIMEOUT)
+            LIMITADOR.registrar(r.status_code)
+            if r.status_code == 200:
+                entrada = (r.json() or {}).get(str(appid)) or {}
+                if not entrada.get('success'):
+                    return None
+                data = entrada.get('data')
+                # Sin recomendaciones Steam devuelve data = []
+                return int(data.get('recommendations', {}).get('total', 0)) if isinstance(data, dict) else 0
+            if r.status_code != 429 and r.status_code < 500:
+                break
+        except Exception as e:
+            logging.error(f"RECOMMENDATIONS_EXCEPTION | ID:{appid} | ERROR:{e}")
+            break
+
+    return None
+
+def refrescar_recomendaciones(registros):
+    """
+    Actualiza en sitio recommendations_total de los registros.
+    Retorna: lista de appids que no se pudieron refrescar.
+    """
+    appids = list(registros)
+    fallidos = []
+
+    print(f"[*] Refrescando recomendaciones de {len(appids)} juegos...")
+    with ThreadPoolExecutor(max_workers=MAX_HILOS) as executor:
+        for appid, total in zip(appids, executor.map(descargar_recomendaciones, appids)):
+            if total is None:
+                fallidos.append(appid)
+            else:
+                registros[appid]['recommendations_total'] = total
+
+    logging.info(f"RECOMMENDATIONS_REFRESH | ACTUALIZADOS:{len(appids) - len(fallidos)} | FALLIDOS:{len(fallidos)}")
+    return fallidos
+
+def refrescar_precios(registros):
+    """
+    Actualiza en sitio price_eur, price_initial_eur, discount_pct e
+    is_free de los registros existentes, en lotes de
+    TAMANO_LOTE_PRECIOS appids por petición.
+
+    Retorna: lista de appids cuyo precio no se pudo refrescar.
+    """
+    appids = list(registros)
+    lotes = [appids[i:i + TAMANO_LOTE_PRECIOS] for i in range(0, len(appids), TAMANO_LOTE_PRECIOS)]
+    fallidos = []
+
+    print(f"[*] Refrescando precios de {len(appids)} juegos en {len(lotes)} peticiones...")
+    with ThreadPoolExecutor(max_workers=MAX_HILOS) as executor:
+        for n, (lote, precios) in enumerate(zip(lotes, executor.map(descargar_lote_precios, lotes)), 1):
+            fallidos_lote = [appid for appid in lote
+                             if appid not in precios or not aplicar_precio(registros[appid], precios[appid])]
+            fallidos.extend(fallidos_lote)
+            print(f"   [OK] Lote {n}/{len(lotes)}: {len(lote) - len(fallidos_lote)}/{len(lote)} precios actualizados")
+
+    logging.info(f"PRICE_REFRESH | ACTUALIZADOS:{len(appids) - len(fallidos)} | FALLIDOS:{len(fallidos)} | PETICIONES:{len(lotes)}")
+    return fallidos
+
+# =================================================================
+# 5. PIPELINE: DESCARGA -> PARSEO -> ESCRITURA
+# =================================================================
+class MetricasPipeline:
+    """Contadores por etapa y profundidad de colas, para ver qué etapa es el cuello de botella."""
+
+    def __init__(self, cola_descargas, cola_escritura):
+        self.cola_descargas = cola_descargas
+        self.cola_escritura = cola_escritura
+        self.descargados = 0
+        self.parseados = 0
+        self.escritos = 0
+        self.en_parseo = 0
+        self._lock = threading.Lock()
+        self._inicio = time.monotonic()
+
+    def sumar_descarga(self):
+        with self._lock:
+            self.descargados += 1
+
+    def log(self, evento='PIPELINE'):
+        transcurrido = max(time.monotonic() - self._inicio, 1e-9)
+        logging.info(
+            f"{evento} | COLA_DESCARGAS:{self.cola_descargas.qsize()}/{TAMANO_COLA} "
+            f"| EN_PARSEO:{self.en_parseo}/{MAX_EN_PARSEO} | COLA_ESCRITURA:{self.cola_escritura.qsize()}/{TAMANO_COLA} "
+            f"| DESCARGADOS:{self.descargados} ({self.descargados / transcurrido:.2f}/s) "
+            f"| PARSEADOS:{self.parseados} ({self.parseados / transcurrido:.2f}/s) "
+            f"| ESCRITOS:{self.escritos} ({self.escritos / transcurrido:.2f}/s)"
+        )
+
+def etapa_descarga(cola_appids, cola_descargas, metricas, pedir_tags):
+    """
+    Hilo descargador: saca appids de la cola y deja la respuesta en
+    cola_descargas junto con el futuro de sus tags. Los tags se piden con
+    pedir_tags(appid) solo si appdetails no dice que el appid no está
+    disponible o no es un juego (futuro None).
+    """
+    while True:
+        try:
+            appid = cola_appids.get_nowait()
+        except queue.Empty:
+            return
+        try:
+            resultado = descargar_juego(appid)
+        except Exception as e:
+            logging.error(f"EXCEPTION | ID:{appid} | ERROR:{e}")
+            resultado = ('EXCEPTION', None, 0.0, 0)
+        futuro_tags = None
+        if resultado[0] not in ESTADOS_SIN_TAGS:
+            try:
+                futuro_tags = pedir_tags(appid)
+            except RuntimeError:
+                # Pool de tags ya cerrado: el pipeline se ha abortado
+                return
+        # Bloquea si el parseo va por detrás (backpressure)
+        cola_descargas.put((appid, resultado, futuro_tags))
+        metricas.sumar_descarga()
+
+def etapa_parseo(total, cola_descargas, cola_escritura, pool, metricas):
+    """
+    Hilo despachador: junta cada descarga con sus tags, la manda al pool de
+    parseo (como mucho MAX_EN_PARSEO a la vez) y entrega los resultados al
+    escritor en orden de llegada.
+
+    Al terminar deja (FIN_PARSEO, excepción o None) en cola_escritura: si
+    muere antes de entregar los `total` juegos (pool roto, fallo en los
+    tags...) el escritor no se queda esperando y relanza la excepción.
+    """
+    en_vuelo = deque()
+    error = None
+
+    def entregar_mas_antiguo():
+        appid, duration, status_code, resultado_tags, futuro = en_vuelo.popleft()
+        try:
+            doc, estado = futuro.result(), 'OK'
+        except Exception as e:
+            logging.error(f"PARSE_EXCEPTION | ID:{appid} | ERROR:{e}")
+            doc, estado = None, 'EXCEPTION'
+        metricas.parseados += 1
+        metricas.en_parseo = len(en_vuelo)
+        cola_escritura.put((appid, estado, doc, duration, status_code, resultado_tags))
+
+    try:
+        for _ in range(total):
+            appid, (estado, data, duration, status_code), futuro_tags = cola_descargas.get()
+            resultado_tags = futuro_tags.result() if futuro_tags else ('OMITIDO', None)
+            if estado != 'OK':
+                cola_escritura.put((appid, estado, None, duration, status_code, resultado_tags))
+                continue
+
+            entrada_tags = resultado_tags[1] or {}
+            futuro = pool.submit(procesar_juego_elk, appid, data, entrada_tags.get('tags'))
+            en_vuelo.append((appid, duration, status_code, resultado_tags, futuro))
+            metricas.en_parseo = len(en_vuelo)
+            if len(en_vuelo) >= MAX_EN_PARSEO:
+                entregar_mas_antiguo()
+
+        while en_vuelo:
+            entregar_mas_antiguo()
+    except Exception as e:
+        logging.error(f"PARSE_STAGE_EXCEPTION | ERROR:{e}")
+        error = e
+    finally:
+        cola_escritura.put((FIN_PARSEO, error))
+
+def anotar_fallido(fallidos, appid, estado, status_code):
+    """Suma un intento fallido a la entrada del appid en la cola de fallidos."""
+    ahora = datetime.utcnow().strftime(FORMATO_FECHA)
+    entrada = fallidos.setdefault(str(appid), {"intentos": 0, "primer_fallo": ahora})
+    entrada.update(motivo=estado, status=status_code, intentos=entrada["intentos"] + 1, ultimo_fallo=ahora)
+    logging.warning(f"DEAD_LETTER | ID:{appid} | MOTIVO:{estado} | STATUS:{status_code} | INTENTOS:{entrada['intentos']}")
+
+def reintentar_fallidos(pendientes, fallidos, cache_tags):
+    """
+    Pasada diferida sobre los juegos que fallaron en el pipeline: hasta
+    RONDAS_REINTENTO rondas con HILOS_REINTENTO hilos, esperando antes de
+    cada una PAUSA_REINTENTO segundos (el doble en cada ronda) para que el
+    limitador y Steam se recuperen. Los tags son los que ya trajo el pipeline.
+
+    Retorna: (resueltos [(appid, doc o None si ya no está disponible)], appids sin resolver)
+    """
+    resueltos = []
+    pausa = PAUSA_REINTENTO
+    for ronda in range(1, RONDAS_REINTENTO + 1):
+        if not pendientes:
+            break
+        print(f"[*] Reintento diferido {ronda}/{RONDAS_REINTENTO}: {len(pendientes)} juegos (tras {pausa}s de espera)")
+        time.sleep(pausa)
+        with ThreadPoolExecutor(max_workers=HILOS_REINTENTO) as executor:
+            resultados = list(executor.map(descargar_juego, pendientes))
+
+        siguen = []
+        for appid, (estado, data, duration, status_code) in zip(pendientes, resultados):
+            if estado == 'OK':
+                try:
+                    resueltos.append((appid, procesar_juego_elk(appid, data, (cache_tags.get(str(appid)) or {}).get('tags'))))
+                    continue
+                except Exception as e:
+                    logging.error(f"PARSE_EXCEPTION | ID:{appid} | ERROR:{e}")
+                    estado = 'EXCEPTION'
+            elif estado in ('UNAVAILABLE', 'EXCLUIDO'):
+                resueltos.append((appid, None))
+                continue
+            anotar_fallido(fallidos, appid, estado, status_code)
+            siguen.append(appid)
+
+        logging.info(f"RETRY_PASS | RONDA:{ronda} | PENDIENTES:{len(pendientes)} | RESUELTOS:{len(pendientes) - len(siguen)} "
+                     f"| TASA:{LIMITADOR.tasa:.2f}req/s")
+        pendientes = siguen
+        pausa *= 2
+    return resueltos, pendientes
+
+def crear_pool_parseo():
+    """
+    Pool de la etapa de parseo. Se arranca (y se hace fork de los procesos)
+    antes de lanzar ningún hilo, así los hijos no heredan locks a medias.
+    """
+    if PROCESOS_PARSEO <= 0:
+        return ThreadPoolExecutor(max_workers=1)
+    pool = ProcessPoolExecutor(max_workers=PROCESOS_PARSEO)
+    list(pool.map(abs, range(PROCESOS_PARSEO)))
+    return pool
+
+def log_throughput(procesados, total):
+    """Loguea la tasa lograda para poder ajustar contra los límites reales de Steam."""
+    logging.info(
+        f"THROUGHPUT | PROCESADOS:{procesados}/{total} | REQ_S:{LIMITADOR.req_por_segundo():.2f} "
+        f"| TASA_ACTUAL:{LIMITADOR.tasa:.2f} | BACKOFFS:{LIMITADOR.backoffs}"
+    )
+
+# =================================================================
+# 6. EJECUCIÓN PRINCIPAL
 # =================================================================
 def main():
+    parser = argparse.ArgumentParser(description="Descarga los datos completos de los juegos de Steam")
+    parser.add_argument('--solo-precios', action='store_true',
+                        help="En el refresco de campos volátiles pide solo precios (en lotes), "
+                             "sin recomendaciones")
+    parser.add_argument('--replay', action='store_true',
+                        help="Reconstruye el NDJSON solo desde la caché de respuestas (sin red)")
+    parser.add_argument('--max-age', type=float, default=None, metavar='HORAS',
+                        help="Edad máxima (horas) de cualquier registro; por encima se descarga "
+                             "completo. --max-age 0 fuerza el refresco completo de todo")
+    parser.add_argument('--run-id', default=None,
+                        help="Identificador de ejecución para reanudar (por defecto: hash de "
+                             "la entrada y las opciones)")
+    args = parser.parse_args()
+
+    ttl_estatico = TTL_ESTATICO_HORAS
+    ttl_volatil = TTL_VOLATIL_HORAS
+    ttl_tags = TTL_TAGS_HORAS
+    if args.max_age is not None:
+        ttl_estatico = min(ttl_estatico, args.max_age)
+        ttl_volatil = min(ttl_volatil, args.max_age)
+        ttl_tags = min(ttl_tags, args.max_age)
+
     print(f"[*] INICIANDO SCRAPER (Output: {ARCHIVO_SALIDA})")
     print(f"[*] Logs: scraper_full_data_metrics.log")
+    print(f"[*] TTL estático: {ttl_estatico}h | TTL volátil: {ttl_volatil}h")
     
     if not os.path.exists(ARCHIVO_ENTRADA):
         print(f"[ERROR] No encuentro '{ARCHIVO_ENTRADA}'.")
@@ -252,67 +855,300 @@ def main():
     with open(ARCHIVO_ENTRADA, 'r', encoding='utf-8') as f:
         lista = json.load(f)
 
-    # SINCRONIZAR: eliminar obsoletos y reprocesar todo
-    print("\n[SINCRONIZACIÓN DE DATOS]")
-    ids_a_procesar = sincronizar_datos(lista, ARCHIVO_SALIDA)
-    lista = [j for j in lista if j.get('appid') in ids_a_procesar]
+    # Lo que ya se sabe que no es un juego (lista de exclusión) ni se pide ni se conserva
+    excluidos = filtro_juegos.cargar_excluidos()
+    lista = [j for j in lista if str(j.get('appid')) not in excluidos]
+
+    # Registros existentes vía índice: saber qué IDs hay no decodifica nada
+    # y cada doc se decodifica solo si se va a conservar o refrescar
+    registros_previos = IndiceNDJSON(ARCHIVO_SALIDA).abrir()
+    try:
+        frescura = cargar_json(ARCHIVO_FRESCURA, {})
+        filas = cargar_json(ARCHIVO_FILAS, {})
+        huellas_previas = cargar_json(ARCHIVO_HUELLAS, {})
+        cache_tags = cargar_json(ARCHIVO_TAGS, {})
+        fallidos = cargar_json(ARCHIVO_FALLIDOS, {})
+
+        # REPLAY: reconstruir todo desde la caché, a velocidad de CPU
+        if args.replay:
+            inicio = time.time()
+            docs, reconstruidos, conservados = reconstruir_desde_cache(lista, registros_previos, frescura)
+            registros_previos.cerrar()
+            temporal = ARCHIVO_SALIDA + '.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                for doc in docs:
+                    f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+            indice_ndjson.construir(temporal, indice_ndjson.ruta_indice(ARCHIVO_SALIDA))
+            os.replace(temporal, ARCHIVO_SALIDA)
+            with open(ARCHIVO_FRESCURA, 'w', encoding='utf-8') as f:
+                json.dump({str(doc['steam_id']): frescura[str(doc['steam_id'])] for doc in docs}, f)
+            duracion = time.time() - inicio
+            print(f"[REPLAY] {reconstruidos} reconstruidos desde caché | {conservados} sin caché (se conservan) "
+                  f"| {len(lista) - len(docs)} descartados | {duracion:.2f}s")
+            logging.info(f"REPLAY | RECONSTRUIDOS:{reconstruidos} | CONSERVADOS:{conservados} | DURACION:{duracion:.2f}s")
+            return
+
+        # JOURNAL: reanudar la ejecución interrumpida con el mismo run_id, si la hay
+        run_id = args.run_id or calcular_run_id(lista, args.solo_precios, args.max_age, CANTIDAD_A_PROCESAR)
+        journal = JournalNDJSON(ARCHIVO_SALIDA, run_id)
+        if journal.abrir():
+            print(f"[INFO] Reanudando ejecución {run_id}: {len(journal.completados)} juegos ya confirmados")
+            logging.info(f"RESUME | RUN_ID:{run_id} | COMPLETADOS:{len(journal.completados)}")
+        else:
+            logging.info(f"RUN_START | RUN_ID:{run_id}")
+
+        # SINCRONIZAR: eliminar obsoletos
+        print("\n[SINCRONIZACIÓN DE DATOS]")
+        ids_a_procesar = sincronizar_datos(lista, registros_previos)
+        lista = [j for j in lista if j.get('appid') in ids_a_procesar]
+
+        if CANTIDAD_A_PROCESAR > 0: 
+            lista = lista[:CANTIDAD_A_PROCESAR]
+
+        lista = [j for j in lista if j.get('appid') not in journal.completados]
 
-    if CANTIDAD_A_PROCESAR > 0: 
-        lista = lista[:CANTIDAD_A_PROCESAR]
+        # PLANIFICAR según la frescura de cada juego:
+        #  - nuevo o estáticos caducados          -> descarga completa
+        #  - volátiles caducados                  -> solo precio (+ recomendaciones)
+        #    (salvo que la fila de búsqueda no haya cambiado: precio confirmado)
+        #  - todo vigente                         -> se conserva tal cual
+        ahora = datetime.utcnow().strftime(FORMATO_FECHA)
+        conservados = {}
+        volatiles = {}
+        for juego in lista:
+            appid = juego.get('appid')
+            if appid not in registros_previos:
+                continue
+            fecha_estatico, fecha_volatil = frescura_de(appid, registros_previos, frescura)
+            if edad_horas(fecha_estatico) > ttl_estatico:
+                continue
+            doc = registros_previos[appid]
+            # La meta del journal lleva la huella de la fila con la que se refrescaron
+            # los volátiles: los vigentes por TTL no se han refrescado y mantienen la anterior
+            frescura[str(appid)] = {"estatico": fecha_estatico, "volatil": fecha_volatil,
+                                    "huella": huellas_previas.get(str(appid))}
+            if edad_horas(fecha_volatil) <= ttl_volatil:
+                conservados[appid] = doc
+                continue
+            huella = huella_fila(filas.get(str(appid)))
+            frescura[str(appid)]["huella"] = huella
+            if huella is not None and huella == huellas_previas.get(str(appid)):
+                conservados[appid] = doc
+                frescura[str(appid)]["volatil"] = ahora
+            else:
+                volatiles[appid] = doc
+
+        # Refresco de volátiles: los que fallen pasan a descarga completa
+        if volatiles:
+            fallidos_volatiles = set(refrescar_precios(volatiles))
+            if not args.solo_precios:
+                fallidos_volatiles.update(refrescar_recomendaciones(
+                    {a: d for a, d in volatiles.items() if a not in fallidos_volatiles}))
+            for appid in fallidos_volatiles:
+                del volatiles[appid]
+            for appid in volatiles:
+                frescura[str(appid)]["volatil"] = ahora
+
+        lista = [j for j in lista if j.get('appid') not in conservados and j.get('appid') not in volatiles]
+        print(f"[INFO] Vigentes (se conservan): {len(conservados)} | Volátiles refrescados: {len(volatiles)} "
+              f"| Descarga completa (nuevos/caducados): {len(lista)}")
+        logging.info(f"PLAN | CONSERVADOS:{len(conservados)} | VOLATILES:{len(volatiles)} | COMPLETOS:{len(lista)}")
     
-    total = len(lista)
-    print(f"[*] Procesando {total} juegos...")
+        total = len(lista)
+        print(f"[*] Procesando {total} juegos...")
 
-    # Limpiamos archivo JSON de salida (Modo 'w' vacía el archivo)
-    with open(ARCHIVO_SALIDA, 'w', encoding='utf-8') as f: pass 
+        # Volcamos primero los registros conservados y los de volátiles refrescados.
+        # Todo pasa por el journal: se escribe en el parcial y se publica al final.
+        journal.escribir_lote(
+            [(appid, doc, frescura[str(appid)]) for appid, doc in list(conservados.items()) + list(volatiles.items())]
+        )
     
-    # Escribimos en modo Append ('a')
-    with open(ARCHIVO_SALIDA, 'a', encoding='utf-8') as f_out:
-        
-        for i, juego in enumerate(lista):
-            appid = juego.get('appid')
-            
-            # Inicio medición tiempo
-            start_time = time.time()
-            
+        # Pipeline: descargas de appdetails y de tags (cada una con su pool de hilos;
+        # los tags de un appid se piden cuando appdetails confirma que es un juego)
+        # -> parseo en procesos -> escritura por lotes en el hilo principal.
+        # El orden de salida es el de llegada; el journal lleva la cuenta de lo hecho.
+        inicio = time.time()
+        estados_tags = {'CACHE': 0, 'NOT_MODIFIED': 0, 'OK': 0, 'ERROR': 0, 'OMITIDO': 0}
+        appids = [juego.get('appid') for juego in lista]
+        cola_appids = queue.Queue()
+        for appid in appids:
+            cola_appids.put(appid)
+        cola_descargas = queue.Queue(maxsize=TAMANO_COLA)
+        cola_escritura = queue.Queue(maxsize=TAMANO_COLA)
+        metricas = MetricasPipeline(cola_descargas, cola_escritura)
+        fin_metricas = threading.Event()
+
+        def monitor():
+            while not fin_metricas.wait(INTERVALO_METRICAS):
+                metricas.log()
+
+        lote = []
+        pendientes_reintento = []
+
+        def volcar():
+            if lote:
+                journal.escribir_lote(lote)
+                metricas.escritos += len(lote)
+                lote.clear()
+
+        with crear_pool_parseo() as pool_parseo, \
+             ThreadPoolExecutor(max_workers=MAX_HILOS_TAGS) as executor_tags:
+
+            def pedir_tags(appid):
+                return executor_tags.submit(obtener_tags_populares, appid, cache_tags.get(str(appid)), ttl_tags)
+
+            hilos = [threading.Thread(target=etapa_descarga, daemon=True,
+                                      args=(cola_appids, cola_descargas, metricas, pedir_tags))
+                     for _ in range(MAX_HILOS)]
+            hilos.append(threading.Thread(target=etapa_parseo, daemon=True,
+                                          args=(total, cola_descargas, cola_escritura, pool_parseo, metricas)))
+            hilos.append(threading.Thread(target=monitor, daemon=True))
+            for hilo in hilos:
+                hilo.start()
+
+            # Escritor único: agrupa en lotes y vuelca cuando el lote se llena
+            # o cuando no llega nada durante un segundo
             try:
-                r = requests.get(f"{URL_DETALLES}?appids={appid}", params=PARAMS_BASE, timeout=10)
-                status_code = r.status_code
-                
-                # Calculamos duración
-                end_time = time.time()
-                duration = round(end_time - start_time, 4)
-
-                if status_code == 200:
-                    d = r.json()
-                    if d and str(appid) in d and d[str(appid)]['success']:
-                        # Procesar datos
-                        doc = procesar_juego_elk(appid, d[str(appid)]['data'])
-                        
-                        # Escribir JSON NDJSON (ensure_ascii=False mantiene la ñ)
-                        f_out.write(json.dumps(doc, ensure_ascii=False) + "\n")
-                        f_out.flush()
-                        
-                        # Log
+                for i in range(total):
+                    while True:
+                        try:
+                            entrega = cola_escritura.get(timeout=1)
+                            break
+                        except queue.Empty:
+                            volcar()
+
+                    if entrega[0] is FIN_PARSEO:
+                        # Lo ya escrito queda confirmado en el journal para reanudar
+                        volcar()
+                        if entrega[1] is not None:
+                            raise entrega[1]
+                        raise RuntimeError(f"La etapa de parseo terminó tras entregar {i} de {total} juegos")
+                    appid, estado, doc, duration, status_code, (estado_tags, entrada_tags) = entrega
+
+                    estados_tags[estado_tags] += 1
+                    if entrada_tags:
+                        cache_tags[str(appid)] = entrada_tags
+
+                    if estado == 'OK':
+                        # NDJSON (ensure_ascii=False mantiene la ñ), confirmado en el journal con su frescura
+                        lote.append((appid, doc, {"estatico": doc['scraped_at'], "volatil": doc['scraped_at'],
+                                                  "huella": huella_fila(filas.get(str(appid)))}))
+
                         logging.info(f"SUCCESS | ID:{appid} | NAME:{doc['name']} | PRICE:{doc['price_eur']} | LATENCY:{duration}s")
-                        
                         print(f"[OK] [{i+1}/{total}] {doc['name']} ({doc['price_eur']}\u20ac)")
-                    else:
+
+                    elif estado == 'UNAVAILABLE':
+                        lote.append((appid, None, None))
                         print(f"[SKIP] [{i+1}/{total}] No disponible: {appid}")
                         logging.warning(f"UNAVAILABLE | ID:{appid} | LATENCY:{duration}s")
-                
-                elif status_code == 429:
-                    print("[WARN] RATE LIMIT. Pausando 60s...")
-                    logging.error(f"RATE_LIMIT_429 | ID:{appid}")
-                    time.sleep(60)
-                
-                else:
-                     logging.error(f"HTTP_ERROR | STATUS:{status_code} | ID:{appid}")
-
-            except Exception as e:
-                logging.error(f"EXCEPTION | ID:{appid} | ERROR:{e}")
-            
-            time.sleep(DELAY)
+
+                    elif estado == 'EXCLUIDO':
+                        lote.append((appid, None, None))
+                        tipo = EXCLUIDOS_NUEVOS[appid].get('type')
+                        print(f"[SKIP] [{i+1}/{total}] No es un juego ({tipo}): {appid}")
+                        logging.info(f"EXCLUDED | ID:{appid} | TYPE:{tipo} | LATENCY:{duration}s")
+
+                    elif estado == 'RATE_LIMIT':
+                        print(f"[WARN] [{i+1}/{total}] RATE LIMIT persistente: {appid}")
+
+                    elif estado == 'HTTP_ERROR':
+                        logging.error(f"HTTP_ERROR | STATUS:{status_code} | ID:{appid}")
+
+                    if estado in ESTADOS_FALLIDOS:
+                        anotar_fallido(fallidos, appid, estado, status_code)
+                        pendientes_reintento.append(appid)
+
+                    if len(lote) >= TAMANO_LOTE_ESCRITURA:
+                        volcar()
+
+                    if (i + 1) % LOG_CADA == 0:
+                        log_throughput(i + 1, total)
+
+                volcar()
+                fin_metricas.set()
+                metricas.log('PIPELINE_TOTAL')
+            except BaseException:
+                # Sin esperar a los tags en cola: cada uno pasaría por el limitador
+                executor_tags.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        log_throughput(total, total)
+        logging.info(f"TAGS | CACHE:{estados_tags['CACHE']} | NOT_MODIFIED:{estados_tags['NOT_MODIFIED']} "
+                     f"| DESCARGADAS:{estados_tags['OK']} | FALLIDAS:{estados_tags['ERROR']} "
+                     f"| OMITIDAS:{estados_tags['OMITIDO']}")
+        print(f"[INFO] Tags: {estados_tags['CACHE']} desde caché | {estados_tags['NOT_MODIFIED']} sin cambios (304) "
+              f"| {estados_tags['OK']} descargadas | {estados_tags['ERROR']} fallidas "
+              f"| {estados_tags['OMITIDO']} sin pedir (no disponibles o no son juegos)")
+        if BYTES_TIENDA['paginas']:
+            logging.info(f"STORE_PAGE_TOTAL | PAGINAS:{BYTES_TIENDA['paginas']} | CORTADAS:{BYTES_TIENDA['cortadas']} "
+                         f"| LEIDOS:{BYTES_TIENDA['leidos']} | AHORRADOS:{BYTES_TIENDA['ahorrados']}")
+            print(f"[INFO] Páginas de tienda: {BYTES_TIENDA['leidos'] / 1024:.0f} KB leídos | "
+                  f"{BYTES_TIENDA['ahorrados'] / 1024:.0f} KB ahorrados cortando tras los tags")
+
+        # REINTENTO DIFERIDO: los que sigan fallando conservan su registro anterior
+        # (con sus fechas de frescura, así la próxima ejecución vuelve a pedirlos)
+        sin_resolver = []
+        arrastrados = set()
+        if pendientes_reintento:
+            resueltos, sin_resolver = reintentar_fallidos(pendientes_reintento, fallidos, cache_tags)
+            journal.escribir_lote([
+                (appid, doc, {"estatico": doc['scraped_at'], "volatil": doc['scraped_at'],
+                              "huella": huella_fila(filas.get(str(appid)))} if doc else None)
+                for appid, doc in resueltos
+            ])
+            arrastre = []
+            for appid in sin_resolver:
+                if appid in registros_previos:
+                    fecha_estatico, fecha_volatil = frescura_de(appid, registros_previos, frescura)
+                    arrastre.append((appid, registros_previos[appid], {"estatico": fecha_estatico, "volatil": fecha_volatil,
+                                                                       "huella": huellas_previas.get(str(appid))}))
+            journal.escribir_lote(arrastre)
+            arrastrados = {appid for appid, _, _ in arrastre}
+            logging.info(f"DEAD_LETTER_TOTAL | FALLIDOS:{len(pendientes_reintento)} | RECUPERADOS:{len(resueltos)} "
+                         f"| ARRASTRADOS:{len(arrastrados)} | PERDIDOS:{len(sin_resolver) - len(arrastrados)}")
+            print(f"[INFO] Fallidos: {len(pendientes_reintento)} | recuperados en el reintento: {len(resueltos)} "
+                  f"| sin resolver: {len(sin_resolver)} ({len(arrastrados)} conservan su registro anterior)")
+    finally:
+        # Cerrado antes de publicar: en Windows no se puede reemplazar un archivo mapeado
+        registros_previos.cerrar()
+
+    duracion_total = time.time() - inicio
+    print(f"[INFO] {total} juegos en {duracion_total:.1f}s | {LIMITADOR.req_por_segundo():.2f} req/s "
+          f"(tasa final {LIMITADOR.tasa:.2f} req/s, backoffs: {LIMITADOR.backoffs})")
+
+    # PUBLICAR: rename atómico del parcial sobre steam-games-data.ndjson
+    journal.publicar()
+    logging.info(f"RUN_DONE | RUN_ID:{run_id}")
+
+    # Los escritos llevan su frescura y su huella como meta del journal (también los
+    # de antes de reanudar). La huella es la de la fila con la que se pidieron sus
+    # volátiles: los vigentes por TTL y los arrastrados mantienen la anterior.
+    completados = {a: meta for a, meta in journal.completados.items() if meta is not None}
+    escritos = set(completados)
+    frescura.update({str(a): {"estatico": meta["estatico"], "volatil": meta["volatil"]}
+                     for a, meta in completados.items()})
+    huellas = {str(a): meta["huella"] for a, meta in completados.items() if meta.get("huella") is not None}
+    with open(ARCHIVO_HUELLAS, 'w', encoding='utf-8') as f:
+        json.dump(huellas, f)
+
+    # Frescura solo de lo que sigue en el dataset
+    with open(ARCHIVO_FRESCURA, 'w', encoding='utf-8') as f:
+        json.dump({str(a): frescura[str(a)] for a in escritos if str(a) in frescura}, f)
+
+    # Caché de tags solo de lo que sigue en el dataset
+    with open(ARCHIVO_TAGS, 'w', encoding='utf-8') as f:
+        json.dump({str(a): cache_tags[str(a)] for a in escritos if str(a) in cache_tags}, f, ensure_ascii=False)
+
+    # Lista de exclusión: los no-juegos vistos en appdetails no se vuelven a pedir
+    nuevos_excluidos = filtro_juegos.anadir_excluidos(EXCLUIDOS_NUEVOS)
+    if EXCLUIDOS_NUEVOS:
+        print(f"[INFO] {len(EXCLUIDOS_NUEVOS)} appids no son juegos (dlc, music...): "
+              f"{nuevos_excluidos} nuevos en la lista de exclusión")
+        logging.info(f"EXCLUSION_LIST | VISTOS:{len(EXCLUIDOS_NUEVOS)} | NUEVOS:{nuevos_excluidos}")
+
+    # Cola de fallidos: solo lo que sigue sin resolver (acumula intentos entre ejecuciones)
+    with open(ARCHIVO_FALLIDOS, 'w', encoding='utf-8') as f:
+        json.dump({str(a): fallidos[str(a)] for a in sin_resolver}, f, indent=2)
 
     print("-" * 60)
     print(f"[DONE] FINALIZADO el Json y el log.")
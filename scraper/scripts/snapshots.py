@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Snapshots comprimidos y deduplicados de los archivos que reescriben los
+scripts del pipeline (sustituyen a las copias completas en backups/).
+
+Cada snapshot (generación) de un archivo se guarda en backups/snapshots/:
+
+    packs/<nombre>/<gen>.pack.zst            líneas nuevas en esa generación
+    manifiestos/<nombre>/<gen>.manifest.zst  metadatos + lista de líneas
+
+El archivo se trocea por líneas (un registro por línea en los NDJSON) y
+cada línea se identifica por un blake2b de 16 bytes. Solo las líneas que no
+estaban en la generación anterior se escriben en el pack nuevo. El
+manifiesto de la primera generación es completo (hash + pack por línea);
+los siguientes son un delta contra la generación anterior ("copia las
+líneas i..j de la base" + hashes nuevos), así una noche en la que cambian
+pocos registros ocupa poco más que esos registros comprimidos. Si el
+archivo entero es idéntico a la última generación no se crea ninguna.
+
+Compresión con zstd (paquete zstandard) o, si no está instalado, gzip; cada
+archivo se lee según su extensión.
+
+Retención: se conservan las RETENCION últimas generaciones de cada nombre;
+la más antigua que queda se reescribe como manifiesto completo si su base
+se borra, y se eliminan los packs a los que ya no apunta ningún manifiesto.
+
+Uso:
+    snapshots.guardar('steam-games-data', ARCHIVO)   # antes de reescribirlo
+
+    python scripts/snapshots.py listar [nombre]
+    python scripts/snapshots.py restaurar nombre [--generacion GEN] [--destino RUTA]
+    python scripts/snapshots.py podar [nombre] [--conservar N]
+    python scripts/snapshots.py guardar nombre RUTA
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import tempfile
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOTS_DIR = os.environ.get('SNAPSHOTS_DIR', os.path.join(SCRAPER_DIR, 'backups', 'snapshots'))
+RETENCION = int(os.environ.get('SNAPSHOTS_RETENCION', 7))
+
+NIVEL_ZSTD = 3
+NIVEL_GZIP = 3
+EXTENSION = '.zst' if zstandard else '.gz'
+
+_REGISTRO_PACK = struct.Struct('<16sI')  # hash | longitud, seguido de la línea
+_ENTRADA = struct.Struct('<16sI')        # manifiesto completo: hash | índice en meta["packs"]
+_COPIA = struct.Struct('<II')            # delta, tras b'C': inicio | nº de líneas de la base
+# delta, tras b'N': hash (16 bytes) de una línea del pack de esta generación
+
+
+# ==========================================
+# COMPRESIÓN
+# ==========================================
+def _abrir_escritura(ruta, final):
+    """Escritor binario comprimido según la extensión del archivo `final`."""
+    if final.endswith('.zst'):
+        return zstandard.open(ruta, 'wb', cctx=zstandard.ZstdCompressor(level=NIVEL_ZSTD))
+    return gzip.open(ruta, 'wb', compresslevel=NIVEL_GZIP)
+
+
+def _abrir_lectura(ruta):
+    if ruta.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"{ruta} está comprimido con zstd: instala el paquete zstandard")
+        # El lector de zstandard no implementa readline(): se envuelve en un buffer
+        return io.BufferedReader(zstandard.open(ruta, 'rb'))
+    return gzip.open(ruta, 'rb')
+
+
+def _leer_exacto(f, n):
+    datos = f.read(n)
+    while len(datos) < n:
+        resto = f.read(n - len(datos))
+        if not resto:
+            break
+        datos += resto
+    return datos
+
+
+def _huella(linea):
+    return hashlib.blake2b(linea, digest_size=16).digest()
+
+
+# ==========================================
+# RUTAS Y MANIFIESTOS
+# ==========================================
+def _dir(tipo, nombre):
+    return os.path.join(SNAPSHOTS_DIR, tipo, nombre)
+
+
+def _buscar(tipo, nombre, gen, sufijo):
+    """Ruta existente de la generación (.zst o .gz), o None."""
+    for extension in ('.zst', '.gz'):
+        ruta = os.path.join(_dir(tipo, nombre), gen + sufijo + extension)
+        if os.path.exists(ruta):
+            return ruta
+    return None
+
+
+def nombres():
+    directorio = os.path.join(SNAPSHOTS_DIR, 'manifiestos')
+    return sorted(os.listdir(directorio)) if os.path.isdir(directorio) else []
+
+
+def generaciones(nombre):
+    """IDs de generación de `nombre`, de la más antigua a la más reciente."""
+    directorio = _dir('manifiestos', nombre)
+    if not os.path.isdir(directorio):
+        return []
+    return sorted({f.split('.manifest')[0] for f in os.listdir(directorio) if '.manifest.' in f and not f.endswith('.tmp')})
+
+
+def leer_meta(nombre, gen):
+    """Metadatos de una generación (solo la cabecera del manifiesto)."""
+    with _abrir_lectura(_buscar('manifiestos', nombre, gen, '.manifest')) as f:
+        return json.loads(f.readline())
+
+
+def _leer_manifiesto(nombre, gen):
+    """(meta, [(hash, nombre_pack), ...]) en el orden de las líneas del archivo."""
+    with _abrir_lectura(_buscar('manifiestos', nombre, gen, '.manifest')) as f:
+        meta = json.loads(f.readline())
+        if meta.get('base') is None:
+            packs = meta['packs']
+            datos = _leer_exacto(f, meta['lineas'] * _ENTRADA.size)
+            return meta, [(h, packs[i]) for h, i in _ENTRADA.iter_unpack(datos)]
+        _, base = _leer_manifiesto(nombre, meta['base'])
+        entradas = []
+        while True:
+            op = f.read(1)
+            if op == b'C':
+                inicio, cuantas = _COPIA.unpack(_leer_exacto(f, _COPIA.size))
+                entradas.extend(base[inicio:inicio + cuantas])
+            elif op == b'N':
+                entradas.append((_leer_exacto(f, 16), meta['pack']))
+            else:
+                break
+    return meta, entradas
+
+
+def _operaciones_delta(hashes, base):
+    """Ops (b'C', inicio, n) / (b'N', hash) que reconstruyen `hashes` a partir de `base`."""
+    posicion = {}
+    for i, (h, _) in enumerate(base):
+        posicion.setdefault(h, i)
+    ops = []
+    inicio = siguiente = None
+    for h in hashes:
+        if siguiente is not None and siguiente < len(base) and base[siguiente][0] == h:
+            siguiente += 1
+            continue
+        if inicio is not None:
+            ops.append((b'C', inicio, siguiente - inicio))
+            inicio = siguiente = None
+        if h in posicion:
+            inicio = posicion[h]
+            siguiente = inicio + 1
+        else:
+            ops.append((b'N', h))
+    if inicio is not None:
+        ops.append((b'C', inicio, siguiente - inicio))
+    return ops
+
+
+def _escribir_manifiesto(nombre, meta, entradas=None, ops=None):
+    """Manifiesto completo (entradas) o delta (ops); tmp + rename atómico. Retorna su tamaño."""
+    gen = meta['generacion']
+    final = _buscar('manifiestos', nombre, gen, '.manifest') or \
+        os.path.join(_dir('manifiestos', nombre), gen + '.manifest' + EXTENSION)
+    with _abrir_escritura(final + '.tmp', final) as f:
+        f.write(json.dumps(meta, ensure_ascii=False).encode('utf-8') + b"\n")
+        if ops is None:
+            indice_pack = {p: i for i, p in enumerate(meta['packs'])}
+            for h, pack in entradas:
+                f.write(_ENTRADA.pack(h, indice_pack[pack]))
+        else:
+            for op in ops:
+                if op[0] == b'C':
+                    f.write(b'C' + _COPIA.pack(op[1], op[2]))
+                else:
+                    f.write(b'N' + op[1])
+    os.replace(final + '.tmp', final)
+    return os.path.getsize(final)
+
+
+# ==========================================
+# GUARDAR
+# ==========================================
+def guardar(nombre, ruta, conservar=None):
+    """
+    Crea una generación de `ruta` bajo `nombre` y aplica la retención.
+    Retorna los metadatos de la generación creada (con "nuevas",
+    "bytes_pack" y "bytes_manifiesto"), o None si el archivo no existe o no
+    ha cambiado desde la última generación.
+    """
+    if not os.path.exists(ruta):
+        return None
+    anteriores = generaciones(nombre)
+    meta_base, base = (None, [])
+    if anteriores:
+        meta_base, base = _leer_manifiesto(nombre, anteriores[-1])
+    previas = dict(base)
+
+    gen = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+    os.makedirs(_dir('packs', nombre), exist_ok=True)
+    os.makedirs(_dir('manifiestos', nombre), exist_ok=True)
+    ruta_pack = os.path.join(_dir('packs', nombre), gen + '.pack' + EXTENSION)
+    nombre_pack = os.path.basename(ruta_pack)
+
+    sha = hashlib.sha256()
+    entradas, nuevas = [], set()
+    tamano = 0
+    with open(ruta, 'rb') as entrada, _abrir_escritura(ruta_pack + '.tmp', ruta_pack) as pack:
+        for linea in entrada:
+            sha.update(linea)
+            tamano += len(linea)
+            h = _huella(linea)
+            if h in previas:
+                entradas.append((h, previas[h]))
+                continue
+            if h not in nuevas:
+                nuevas.add(h)
+                pack.write(_REGISTRO_PACK.pack(h, len(linea)))
+                pack.write(linea)
+            entradas.append((h, nombre_pack))
+
+    if meta_base and meta_base['sha256'] == sha.hexdigest():
+        os.remove(ruta_pack + '.tmp')
+        return None
+    if nuevas:
+        os.replace(ruta_pack + '.tmp', ruta_pack)
+    else:
+        os.remove(ruta_pack + '.tmp')
+
+    meta = {
+        "nombre": nombre,
+        "generacion": gen,
+        "origen": os.path.abspath(ruta),
+        "fecha": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "lineas": len(entradas),
+        "bytes": tamano,
+        "sha256": sha.hexdigest(),
+        "nuevas": len(nuevas),
+        "bytes_pack": os.path.getsize(ruta_pack) if nuevas else 0,
+        "base": meta_base['generacion'] if meta_base else None,
+        "pack": nombre_pack if nuevas else None,
+        "packs": sorted({pack for _, pack in entradas}),
+    }
+    if meta_base:
+        ops = _operaciones_delta([h for h, _ in entradas], base)
+        meta["bytes_manifiesto"] = _escribir_manifiesto(nombre, meta, ops=ops)
+    else:
+        meta["bytes_manifiesto"] = _escribir_manifiesto(nombre, meta, entradas=entradas)
+
+    podar(nombre, conservar)
+    return meta
+
+
+# ==========================================
+# RESTAURAR
+# ==========================================
+def restaurar(nombre, gen=None, destino=None):
+    """
+    Reconstruye una generación (la última por defecto) en `destino` (por
+    defecto, el archivo de origen): temporal + rename atómico, comprobando
+    el sha256. Retorna los metadatos de la generación restaurada.
+    """
+    disponibles = generaciones(nombre)
+    if not disponibles:
+        raise FileNotFoundError(f"No hay snapshots de '{nombre}' en {SNAPSHOTS_DIR}")
+    gen = gen or disponibles[-1]
+    if gen not in disponibles:
+        raise FileNotFoundError(f"No existe la generación {gen} de '{nombre}'")
+    meta, entradas = _leer_manifiesto(nombre, gen)
+    destino = destino or meta['origen']
+
+    # Las líneas necesarias se descomprimen pack a pack a un almacén temporal
+    # sin comprimir; después se escriben en el orden del manifiesto
+    necesarias = {h for h, _ in entradas}
+    posiciones = {}
+    with tempfile.TemporaryFile() as almacen:
+        for nombre_pack in meta['packs']:
+            with _abrir_lectura(os.path.join(_dir('packs', nombre), nombre_pack)) as pack:
+                while True:
+                    cabecera = _leer_exacto(pack, _REGISTRO_PACK.size)
+                    if len(cabecera) < _REGISTRO_PACK.size:
+                        break
+                    h, longitud = _REGISTRO_PACK.unpack(cabecera)
+                    linea = _leer_exacto(pack, longitud)
+                    if h in necesarias and h not in posiciones:
+                        posiciones[h] = (almacen.tell(), longitud)
+                        almacen.write(linea)
+        faltan = necesarias - posiciones.keys()
+        if faltan:
+            raise ValueError(f"Snapshot {nombre}/{gen} incompleto: faltan {len(faltan)} líneas en los packs")
+
+        os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+        temporal = f"{destino}.{os.getpid()}.tmp"
+        sha = hashlib.sha256()
+        with open(temporal, 'wb') as salida:
+            for h, _ in entradas:
+                offset, longitud = posiciones[h]
+                almacen.seek(offset)
+                linea = almacen.read(longitud)
+                sha.update(linea)
+                salida.write(linea)
+    if sha.hexdigest() != meta['sha256']:
+        os.remove(temporal)
+        raise ValueError(f"Snapshot {nombre}/{gen} corrupto: el sha256 no coincide")
+    os.replace(temporal, destino)
+    return meta
+
+
+# ==========================================
+# RETENCIÓN
+# ==========================================
+def podar(nombre, conservar=None):
+    """
+    Borra las generaciones más antiguas (se quedan las `conservar` últimas,
+    RETENCION por defecto) y los packs sin ningún manifiesto que los use.
+    Retorna (generaciones borradas, packs borrados).
+    """
+    conservar = RETENCION if conservar is None else conservar
+    disponibles = generaciones(nombre)
+    sobrantes = disponibles[:-conservar] if conservar > 0 else disponibles
+    if sobrantes and len(sobrantes) < len(disponibles):
+        # La primera que se queda deja de depender de las que se borran
+        primera = disponibles[len(sobrantes)]
+        meta, entradas = _leer_manifiesto(nombre, primera)
+        if meta.get('base') in sobrantes:
+            meta['base'] = None
+            _escribir_manifiesto(nombre, meta, entradas=entradas)
+    for gen in sobrantes:
+        os.remove(_buscar('manifiestos', nombre, gen, '.manifest'))
+
+    vivos = set()
+    for gen in generaciones(nombre):
+        vivos.update(leer_meta(nombre, gen)['packs'])
+    borrados = 0
+    directorio = _dir('packs', nombre)
+    if os.path.isdir(directorio):
+        for archivo in os.listdir(directorio):
+            if archivo not in vivos:
+                os.remove(os.path.join(directorio, archivo))
+                borrados += 1
+    return len(sobrantes), borrados
+
+
+def ocupado(nombre):
+    """Bytes en disco de los snapshots de `nombre` (packs + manifiestos)."""
+    total = 0
+    for tipo in ('packs', 'manifiestos'):
+        directorio = _dir(tipo, nombre)
+        if os.path.isdir(directorio):
+            total += sum(os.path.getsize(os.path.join(directorio, f)) for f in os.listdir(directorio))
+    return total
+
+
+# ==========================================
+# CLI
+# ==========================================
+def _mb(n):
+    return f"{n / 1024 / 1024:.2f} MB"
+
+
+def resumen(meta, nombre=''):
+    """Texto para los prints de los scripts tras guardar()."""
+    if meta is None:
+        return f"{nombre}: sin cambios desde la última generación (no se crea ninguna)"
+    return (f"{meta['nombre']} {meta['generacion']}: {meta['nuevas']} líneas nuevas de {meta['lineas']}, "
+            f"{_mb(meta['bytes_pack'] + meta['bytes_manifiesto'])} en disco")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshots deduplicados de los archivos del pipeline")
+    sub = parser.add_subparsers(dest='orden', required=True)
+    p = sub.add_parser('listar', help="Generaciones guardadas")
+    p.add_argument('nombre', nargs='?')
+    p = sub.add_parser('restaurar', help="Reconstruye una generación (la última por defecto)")
+    p.add_argument('nombre')
+    p.add_argument('--generacion')
+    p.add_argument('--destino', help="Por defecto, la ruta original del archivo")
+    p = sub.add_parser('podar', help="Aplica la retención")
+    p.add_argument('nombre', nargs='?')
+    p.add_argument('--conservar', type=int, default=RETENCION)
+    p = sub.add_parser('guardar', help="Crea una generación a mano")
+    p.add_argument('nombre')
+    p.add_argument('ruta')
+    args = parser.parse_args()
+
+    print(f"[*] Snapshots: {SNAPSHOTS_DIR} | compresión: {'zstd' if zstandard else 'gzip'} | retención: {RETENCION}")
+    if args.orden == 'listar':
+        for nombre in ([args.nombre] if args.nombre else nombres()):
+            print(f"\n[INFO] {nombre}: {len(generaciones(nombre))} generaciones, {_mb(ocupado(nombre))} en disco")
+            for gen in generaciones(nombre):
+                meta = leer_meta(nombre, gen)
+                manifiesto = os.path.getsize(_buscar('manifiestos', nombre, gen, '.manifest'))
+                print(f"  {gen}  {meta['fecha']}  {meta['lineas']:>9} líneas  {_mb(meta['bytes']):>11}"
+                      f"  nuevas: {meta['nuevas']:>8}  pack: {_mb(meta['bytes_pack'])}  manifiesto: {_mb(manifiesto)}"
+                      f"{'  (delta)' if meta.get('base') else ''}")
+    elif args.orden == 'restaurar':
+        try:
+            meta = restaurar(args.nombre, args.generacion, args.destino)
+        except (FileNotFoundError, ValueError, RuntimeError) as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        print(f"[OK] {args.nombre} {meta['generacion']} restaurado en {args.destino or meta['origen']} "
+              f"({meta['lineas']} líneas, sha256 verificado)")
+    elif args.orden == 'podar':
+        for nombre in ([args.nombre] if args.nombre else nombres()):
+            gens, packs = podar(nombre, args.conservar)
+            print(f"[OK] {nombre}: {gens} generaciones y {packs} packs borrados")
+    elif args.orden == 'guardar':
+        if not os.path.exists(args.ruta):
+            print(f"[ERROR] No se encuentra '{args.ruta}'")
+            sys.exit(1)
+        print(f"[OK] Snapshot {resumen(guardar(args.nombre, args.ruta), args.nombre)}")
+
+
+if __name__ == "__main__":
+    main()
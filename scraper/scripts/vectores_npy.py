@@ -0,0 +1,93 @@
+"""
+Vectores en binario junto al NDJSON vectorizado (sidecar .npy).
+
+En lugar de 768 floats en texto dentro de cada línea, vectorizador.py
+--formato npy escribe:
+  steam-games-data-vect.npy       matriz N x dimensión (float32 o float16), C-contigua
+  steam-games-data-vect.ids.npy   int64 con el steam_id de cada fila
+La fila i corresponde a la línea i de steam-games-data-vect.ndjson.
+
+Los consumidores solo necesitan numpy: cargar() abre la matriz con
+np.load(mmap_mode='r'), sin copiarla ni parsear nada, y filas() da el
+índice {steam_id: fila}.
+"""
+
+import os
+import shutil
+
+import numpy as np
+
+DTYPES = {'float32': np.float32, 'float16': np.float16}
+
+
+def ruta_ids(ruta_npy):
+    return ruta_npy[:-len('.npy')] + '.ids.npy' if ruta_npy.endswith('.npy') else ruta_npy + '.ids.npy'
+
+
+class EscritorVectores:
+    """
+    Escribe la matriz fila a fila sin conocer N de antemano: los datos van a
+    un temporal en crudo y cerrar() antepone la cabecera .npy y publica la
+    matriz y los ids con rename atómico.
+    """
+
+    def __init__(self, ruta_npy, dtype='float32'):
+        self.ruta = ruta_npy
+        self.dtype = np.dtype(DTYPES[dtype])
+        self.dimension = None
+        self.filas = 0
+        self._ids = []
+        self._crudo = open(f"{ruta_npy}.{os.getpid()}.raw", 'wb')
+
+    def anadir(self, steam_ids, vectores):
+        vectores = np.ascontiguousarray(vectores, dtype=self.dtype)
+        if self.dimension is None:
+            self.dimension = vectores.shape[1]
+        self._crudo.write(vectores.tobytes())
+        self._ids.extend(steam_ids)
+        self.filas += len(vectores)
+
+    def cerrar(self):
+        """Publica .npy e .ids.npy. Retorna (bytes de la matriz, bytes de los ids)."""
+        self._crudo.close()
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f, open(self._crudo.name, 'rb') as crudo:
+            np.lib.format.write_array_header_1_0(f, {'descr': np.lib.format.dtype_to_descr(self.dtype),
+                                                     'fortran_order': False,
+                                                     'shape': (self.filas, self.dimension or 0)})
+            shutil.copyfileobj(crudo, f, 1 << 20)
+        os.remove(self._crudo.name)
+
+        destino_ids = ruta_ids(self.ruta)
+        temporal_ids = f"{destino_ids}.{os.getpid()}.tmp"
+        with open(temporal_ids, 'wb') as f:
+            np.save(f, np.asarray(self._ids, dtype=np.int64))
+        os.replace(temporal, self.ruta)
+        os.replace(temporal_ids, destino_ids)
+        return os.path.getsize(self.ruta), os.path.getsize(destino_ids)
+
+    def descartar(self):
+        self._crudo.close()
+        os.remove(self._crudo.name)
+
+
+def cargar(ruta_npy, mmap=True):
+    """(ids, matriz): la matriz mapeada en memoria (solo lectura) salvo mmap=False."""
+    ids = np.load(ruta_ids(ruta_npy))
+    matriz = np.load(ruta_npy, mmap_mode='r' if mmap else None)
+    return ids, matriz
+
+
+def filas(ids):
+    """{steam_id: fila} para buscar el vector de un juego."""
+    return {int(steam_id): i for i, steam_id in enumerate(ids)}
+
+
+def borrar(ruta_npy):
+    """Quita el sidecar (p. ej. al volver al formato NDJSON, para que no quede desfasado)."""
+    borrados = 0
+    for ruta in (ruta_npy, ruta_ids(ruta_npy)):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+            borrados += 1
+    return borrados
@@ -1,10 +1,20 @@
+import argparse
 import json
+import multiprocessing
 import os
-import re
-import tempfile
 import shutil
+import time
+from collections import deque
+
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
+import cache_embeddings
+import modelo_onnx
+import vectores_npy
+from limpieza_html import quitar_etiquetas
+
 # --- CONFIGURACION (RUTAS RELATIVAS) ---
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 SCRAPER_DIR = os.path.dirname(SCRIPT_DIR)  # Sube a /scraper
@@ -12,87 +22,387 @@ DATA_DIR = os.path.join(SCRAPER_DIR, "data")
 
 ARCHIVO_RAW = os.path.join(DATA_DIR, "steam-games-data.ndjson")
 ARCHIVO_FINAL = os.path.join(DATA_DIR, "steam-games-data-vect.ndjson")
+ARCHIVO_VECTORES = os.path.join(DATA_DIR, "steam-games-data-vect.npy")  # + .ids.npy
 
 # Nombre del modelo (Multilingue)
 MODEL_NAME = 'paraphrase-multilingual-mpnet-base-v2'
 
-print(f"Cargando modelo IA ({MODEL_NAME})...")
-try:
-    modelo = SentenceTransformer(MODEL_NAME)
-    print("Modelo cargado.")
-except Exception as e:
-    print(f"Error cargando modelo: {e}")
-    exit(1)
+# --- LOTES ---
+# Los juegos se leen en bloques de TAMANO_BLOQUE (la memoria no depende del
+# tamaño del dataset); dentro de cada bloque se ordenan por longitud en tokens
+# y se codifican en lotes de TAMANO_LOTE, de modo que cada lote lleva textos
+# de longitud parecida y casi no hay padding. La salida conserva el orden de
+# entrada. Benchmark por tamaño de lote: python benchmarks/bench_vectorizador.py
+TAMANO_LOTE = int(os.environ.get('VECTOR_LOTE', 32))
+TAMANO_BLOQUE = int(os.environ.get('VECTOR_BLOQUE', 2048))
+
+# --- PROCESOS ---
+# Con PROCESOS > 1 cada bloque se reparte en trozos entre otros tantos
+# procesos, cada uno con su copia del modelo y torch limitado a
+# (CPUs disponibles / PROCESOS) hilos para que entre todos no sobresuscriban la
+# CPU. El proceso principal lee y prepara los textos, mantiene como mucho
+# TROZOS_EN_VUELO trozos por proceso pendientes y escribe los resultados en el
+# orden de entrada. 0 = un proceso por CPU.
+# Escalado: python benchmarks/bench_vectorizador_procesos.py
+PROCESOS = int(os.environ.get('VECTOR_PROCESOS', 1))
+TROZOS_EN_VUELO = 2
+
+# --- CACHE ---
+# Los vectores se guardan por hash(modelo + revisión + texto) en
+# cache/embeddings/ (ver cache_embeddings.py): solo se codifican los textos
+# nuevos o cambiados desde la ejecución anterior.
+USAR_CACHE = os.environ.get('VECTOR_CACHE', '1') != '0'
+
+# --- FORMATO DE SALIDA ---
+# ndjson: vector_embedding como lista de floats en cada línea (compatibilidad)
+# npy:    NDJSON sin vector_embedding + matriz binaria en ARCHIVO_VECTORES y
+#         steam_id por fila en .ids.npy (ver vectores_npy.py); se carga con
+#         np.load(mmap_mode='r') sin parsear texto
+# ambos:  las dos cosas
+# Tamaño y tiempo de carga de cada formato: python benchmarks/bench_vectores_npy.py
+FORMATOS = ('ndjson', 'npy', 'ambos')
+FORMATO = os.environ.get('VECTOR_FORMATO', 'ndjson')
+DTYPE_VECTORES = os.environ.get('VECTOR_DTYPE', 'float32')
+
+# --- BACKEND DE INFERENCIA ---
+# torch:     SentenceTransformer tal cual (float32)
+# onnx-int8: el mismo modelo exportado a ONNX con pesos int8 (cuantización
+#            dinámica) y ejecutado con ONNX Runtime; se exporta una vez a
+#            cache/onnx/ (ver modelo_onnx.py). Los vectores no son idénticos
+#            a los de torch, así que la caché de embeddings es otra.
+# Precisión (coseno frente a torch) y velocidad: python benchmarks/bench_backend_onnx.py
+BACKENDS = ('torch', 'onnx-int8')
+BACKEND = os.environ.get('VECTOR_BACKEND', 'torch')
+
+
+def cpus_disponibles():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def cargar_modelo(nombre=MODEL_NAME, backend='torch'):
+    print(f"Cargando modelo IA ({nombre}, {backend})...")
+    try:
+        if backend == 'onnx-int8':
+            modelo = modelo_onnx.cargar(modelo_onnx.preparar(nombre))
+        else:
+            modelo = SentenceTransformer(nombre, device='cpu')
+        print("Modelo cargado.")
+        return modelo
+    except Exception as e:
+        print(f"Error cargando modelo: {e}")
+        exit(1)
+
+
+def texto_vector(juego):
+    """Limpia detailed_description del juego (en sitio) y retorna el texto que se vectoriza."""
+    nombre = juego.get('name') or "Sin Nombre"
+    genres = ", ".join((juego.get('genres') or [])[:5])
+    tags = ", ".join((juego.get('categories') or [])[:10])
+
+    # 1. LIMPIEZA DE LA DESCRIPCION LARGA (Para el JSON final)
+    # La limpiamos para que OpenRouter no lea HTML basura, pero NO la metemos al vector.
+    desc_larga_limpia = quitar_etiquetas(juego.get('detailed_description'))
+    juego['detailed_description'] = desc_larga_limpia # Actualizamos el objeto original
+
+    # --- CONSTRUCCION DEL TEXTO SEMANTICO (VECTOR) ---
+    # Solo: Título, Géneros, Tags y Descripción IA (sin developer ni short_description)
+    return (
+        f"Title: {nombre}. "
+        f"Genres: {genres}. "
+        f"Tags: {tags}. "
+        f"Details: {desc_larga_limpia}"
+    )
+
+
+def longitudes_tokens(modelo, textos):
+    """Nº de tokens que verá el modelo por texto (con especiales y truncado a max_seq_length)."""
+    ids = modelo.tokenizer(textos, add_special_tokens=True, truncation=True,
+                           max_length=modelo.max_seq_length)['input_ids']
+    return [len(i) for i in ids]
+
+
+def codificar(modelo, textos, tamano_lote=TAMANO_LOTE):
+    """
+    Embeddings (float32, una fila por texto, en el orden de `textos`).
+    Los textos se agrupan por longitud en tokens y cada lote se pasa entero
+    a encode(), así que el padding de un lote es solo la diferencia entre su
+    texto más largo y su texto más corto.
+    Si un lote falla se repite texto a texto; los textos que siguen fallando
+    quedan como filas NaN (ver filas_fallidas) para que se omitan.
+    """
+    vectores = np.empty((len(textos), modelo.get_sentence_embedding_dimension()), dtype=np.float32)
+    if not textos:
+        return vectores
+    longitudes = longitudes_tokens(modelo, textos)
+    orden = sorted(range(len(textos)), key=longitudes.__getitem__)
+    for inicio in range(0, len(orden), tamano_lote):
+        indices = orden[inicio:inicio + tamano_lote]
+        try:
+            vectores[indices] = modelo.encode([textos[i] for i in indices], batch_size=len(indices),
+                                              convert_to_numpy=True, show_progress_bar=False)
+        except Exception:
+            for i in indices:
+                try:
+                    vectores[i] = modelo.encode([textos[i]], batch_size=1,
+                                                convert_to_numpy=True, show_progress_bar=False)[0]
+                except Exception as e:
+                    print(f"\nError vectorizando texto ({textos[i][:60]!r}...): {e}")
+                    vectores[i] = np.nan
+    return vectores
+
+
+def filas_fallidas(vectores):
+    """Máscara de las filas que codificar() no pudo vectorizar."""
+    return np.isnan(vectores).any(axis=1)
+
+
+def leer_bloques(f_in, tamano_bloque, errores):
+    """
+    (nº de línea, juego) del NDJSON en listas de hasta tamano_bloque; las
+    líneas ilegibles se cuentan en errores['lineas'].
+    """
+    bloque = []
+    for i, linea in enumerate(f_in):
+        if not linea.strip(): continue
+        try:
+            bloque.append((i, json.loads(linea)))
+        except ValueError as e:
+            errores['lineas'] += 1
+            print(f"\nError en linea {i}: {e}")
+            continue
+        if len(bloque) == tamano_bloque:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+# Los codificadores reciben trabajos (contexto, textos) y devuelven
+# (contexto, vectores) en el mismo orden. El modelo (o el pool) solo se carga
+# cuando llega algún texto: con la caché, una noche sin cambios no lo carga.
+
+def vectores_en_serie(nombre_modelo, trabajos, tamano_lote, backend='torch'):
+    """(contexto, vectores) de cada trabajo, codificados en este proceso."""
+    modelo = None
+    for contexto, textos in trabajos:
+        if not textos:
+            yield contexto, None
+            continue
+        if modelo is None:
+            modelo = cargar_modelo(nombre_modelo, backend)
+        yield contexto, codificar(modelo, textos, tamano_lote)
 
-def limpiar_html(texto):
-    if not texto: return ""
-    return re.sub(r'<[^>]+>', '', texto).strip()
 
-def procesar_pipeline():
+# Estado de cada proceso del pool (se inicializa una vez por proceso)
+_trabajador = {}
+
+
+def _iniciar_trabajador(nombre_modelo, hilos, tamano_lote, backend='torch'):
+    torch.set_num_threads(hilos)
+    torch.set_num_interop_threads(1)
+    _trabajador['lote'] = tamano_lote
+    try:
+        if backend == 'onnx-int8':
+            # nombre_modelo ya es el directorio exportado por el proceso principal
+            _trabajador['modelo'] = modelo_onnx.cargar(nombre_modelo, hilos=hilos)
+        else:
+            _trabajador['modelo'] = SentenceTransformer(nombre_modelo, device='cpu')
+    except Exception as e:
+        # Si el initializer lanzara, el pool relanzaría procesos sin fin
+        _trabajador['error'] = e
+
+
+def _codificar_trozo(textos):
+    if 'error' in _trabajador:
+        raise RuntimeError(f"Error cargando modelo en el proceso {os.getpid()}: {_trabajador['error']}")
+    return codificar(_trabajador['modelo'], textos, _trabajador['lote'])
+
+
+def _unir(trozos):
+    return np.concatenate([trozo.get() for trozo in trozos]) if trozos else None
+
+
+def vectores_en_paralelo(nombre_modelo, trabajos, tamano_lote, procesos, backend='torch'):
+    """(contexto, vectores) de cada trabajo; sus textos se reparten en trozos entre `procesos` procesos."""
+    hilos = max(1, cpus_disponibles() // procesos)
+    pool = None
+    pendientes = deque()
+    en_vuelo = 0
+    try:
+        for contexto, textos in trabajos:
+            if textos and pool is None:
+                print(f"{procesos} procesos x {hilos} hilos de {backend}")
+                if backend == 'onnx-int8':
+                    # Exportar aquí, una vez, y no en cada proceso a la vez
+                    nombre_modelo = modelo_onnx.preparar(nombre_modelo)
+                # spawn: un fork con torch ya cargado puede bloquear el runtime de OpenMP
+                pool = multiprocessing.get_context('spawn').Pool(
+                    procesos, _iniciar_trabajador, (nombre_modelo, hilos, tamano_lote, backend))
+            tamano_trozo = -(-len(textos) // procesos)
+            trozos = [pool.apply_async(_codificar_trozo, (textos[inicio:inicio + tamano_trozo],))
+                      for inicio in range(0, len(textos), tamano_trozo or 1)]
+            pendientes.append((contexto, trozos))
+            en_vuelo += len(trozos)
+            while en_vuelo > TROZOS_EN_VUELO * procesos:
+                contexto_listo, trozos_listos = pendientes.popleft()
+                en_vuelo -= len(trozos_listos)
+                yield contexto_listo, _unir(trozos_listos)
+        while pendientes:
+            contexto_listo, trozos_listos = pendientes.popleft()
+            yield contexto_listo, _unir(trozos_listos)
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def abrir_cache(nombre_modelo, backend='torch'):
+    """CacheEmbeddings del modelo y backend, o None si no se puede saber su revisión (sin caché)."""
+    variante = modelo_onnx.variante() if backend == 'onnx-int8' else None
+    try:
+        huella = cache_embeddings.huella_modelo(nombre_modelo, variante=variante)
+    except Exception as e:
+        print(f"Aviso: sin caché de embeddings, no se pudo obtener la revisión del modelo: {e}")
+        return None
+    cache = cache_embeddings.CacheEmbeddings(huella).cargar()
+    print(f"Caché de embeddings: {len(cache)} vectores en {cache.ruta}")
+    return cache
+
+
+def procesar_pipeline(tamano_lote=TAMANO_LOTE, tamano_bloque=TAMANO_BLOQUE, procesos=PROCESOS,
+                      nombre_modelo=MODEL_NAME, usar_cache=USAR_CACHE, formato=FORMATO, dtype=DTYPE_VECTORES,
+                      backend=BACKEND):
+    """Vectoriza ARCHIVO_RAW en ARCHIVO_FINAL. Retorna {juegos, errores, aciertos, codificados}."""
     if not os.path.exists(ARCHIVO_RAW):
         print(f"ERROR: No encuentro el archivo origen: {ARCHIVO_RAW}")
         return
 
+    inicio = time.perf_counter()
+    procesos = procesos or cpus_disponibles()
     print(f"Leyendo datos crudos de {ARCHIVO_RAW}...")
-    
+    print(f"Lotes de {tamano_lote} textos ordenados por longitud, bloques de {tamano_bloque} juegos")
+    print(f"Formato de salida: {formato}" + (f" ({dtype})" if formato != 'ndjson' else ""))
+    print(f"Backend: {backend}" + (f" ({modelo_onnx.CONFIG})" if backend == 'onnx-int8' else ""))
+    cache = abrir_cache(nombre_modelo, backend) if usar_cache else None
+
     # --- ESTRATEGIA DE ESCRITURA ATOMICA ---
     archivo_temporal = ARCHIVO_FINAL + ".tmp"
-    
+    vector_en_json = formato in ('ndjson', 'ambos')
+    sidecar = vectores_npy.EscritorVectores(ARCHIVO_VECTORES, dtype) if formato in ('npy', 'ambos') else None
+
     contador = 0
-    errores = 0
-
-    with open(ARCHIVO_RAW, 'r', encoding='utf-8') as f_in, \
-         open(archivo_temporal, 'w', encoding='utf-8') as f_out:
-        
-        for i, linea in enumerate(f_in):
-            try:
-                if not linea.strip(): continue
-                juego = json.loads(linea)
-                
-                # --- PREPARACION DE DATOS ---
-                
-                nombre = juego.get('name') or "Sin Nombre"
-                genres = ", ".join((juego.get('genres') or [])[:5])
-                tags = ", ".join((juego.get('categories') or [])[:10])
-                
-                # 1. LIMPIEZA DE LA DESCRIPCION LARGA (Para el JSON final)
-                # La limpiamos para que OpenRouter no lea HTML basura, pero NO la metemos al vector.
-                desc_larga_limpia = limpiar_html(juego.get('detailed_description'))
-                juego['detailed_description'] = desc_larga_limpia # Actualizamos el objeto original
-
-                # --- CONSTRUCCION DEL TEXTO SEMANTICO (VECTOR) ---
-                # Solo: Título, Géneros, Tags y Descripción IA (sin developer ni short_description)
-                texto_vector = (
-                    f"Title: {nombre}. "
-                    f"Genres: {genres}. "
-                    f"Tags: {tags}. "
-                    f"Details: {desc_larga_limpia}"
-                )
-
-                # --- VECTORIZACION ---
-                vector = modelo.encode(texto_vector)
-                
-                # Inyectamos el vector en el JSON original
-                juego['vector_embedding'] = vector.tolist()
-                
-                # Escribimos AL VUELO
-                json.dump(juego, f_out, ensure_ascii=False)
-                f_out.write('\n')
-                
-                contador += 1
-                if contador % 100 == 0:
-                    print(f"Procesados: {contador} juegos...", end='\r')
-
-            except Exception as e:
-                errores += 1
-                print(f"\nError en linea {i}: {e}")
-
-    print(f"\nFinalizado. Procesados: {contador}. Errores: {errores}")
-    
+    errores = {'lineas': 0}
+
+    try:
+        with open(ARCHIVO_RAW, 'r', encoding='utf-8') as f_in, \
+             open(archivo_temporal, 'w', encoding='utf-8') as f_out:
+
+            def trabajos():
+                # Solo van al modelo los textos que no están en la caché
+                for leidos in leer_bloques(f_in, tamano_bloque, errores):
+                    lineas, bloque, textos = [], [], []
+                    for i, juego in leidos:
+                        try:
+                            textos.append(texto_vector(juego))
+                        except Exception as e:
+                            errores['lineas'] += 1
+                            print(f"\nError en linea {i}: {e}")
+                            continue
+                        lineas.append(i)
+                        bloque.append(juego)
+                    if not bloque:
+                        continue
+                    if cache is not None:
+                        vectores, faltan = cache.buscar(textos)
+                    else:
+                        vectores, faltan = None, list(range(len(textos)))
+                    yield (lineas, bloque, textos, vectores, faltan), [textos[i] for i in faltan]
+
+            # --- VECTORIZACION (por lotes, en este proceso o en un pool) ---
+            if procesos > 1:
+                vectorizados = vectores_en_paralelo(nombre_modelo, trabajos(), tamano_lote, procesos, backend)
+            else:
+                vectorizados = vectores_en_serie(nombre_modelo, trabajos(), tamano_lote, backend)
+
+            for (lineas, bloque, textos, vectores, faltan), nuevos in vectorizados:
+                if faltan:
+                    if vectores is None:
+                        vectores = nuevos
+                    else:
+                        vectores[faltan] = nuevos
+                    fallidas = filas_fallidas(vectores)
+                    if cache is not None:
+                        cache.anadir([textos[i] for i in faltan if not fallidas[i]], nuevos[~fallidas[faltan]])
+                    if fallidas.any():
+                        # Como antes de los lotes: el juego que no se puede vectorizar se omite
+                        for i in np.flatnonzero(fallidas):
+                            errores['lineas'] += 1
+                            print(f"\nError en linea {lineas[i]}: no se pudo vectorizar")
+                        bloque = [juego for juego, fallida in zip(bloque, fallidas) if not fallida]
+                        vectores = vectores[~fallidas]
+                        if not bloque:
+                            continue
+
+                if sidecar is not None:
+                    sidecar.anadir([juego.get('steam_id') or -1 for juego in bloque], vectores)
+
+                for juego, vector in zip(bloque, vectores):
+                    # Inyectamos el vector en el JSON original
+                    if vector_en_json:
+                        juego['vector_embedding'] = vector.tolist()
+
+                    # Escribimos en el orden de entrada
+                    json.dump(juego, f_out, ensure_ascii=False)
+                    f_out.write('\n')
+
+                contador += len(bloque)
+                print(f"Procesados: {contador} juegos...", end='\r')
+    except BaseException:
+        # Sin cerrar(): no se publica un .npy a medias y se borra su temporal
+        if sidecar is not None:
+            sidecar.descartar()
+        raise
+
+    print(f"\nFinalizado. Procesados: {contador}. Errores: {errores['lineas']}")
+    if cache is not None:
+        guardados = cache.guardar()
+        print(f"Caché de embeddings: {cache.aciertos} aciertos, {cache.fallos} textos nuevos o cambiados "
+              f"({cache.tasa_aciertos():.1f}% de aciertos); {guardados} vectores guardados")
+
     # --- MOVER ARCHIVO FINAL ---
     print("Moviendo archivo temporal a destino final...")
     shutil.move(archivo_temporal, ARCHIVO_FINAL)
-    print(f"Listo! Archivo generado en: {ARCHIVO_FINAL}")
+    print(f"Listo! Archivo generado en: {ARCHIVO_FINAL} ({os.path.getsize(ARCHIVO_FINAL) / 1024 / 1024:.1f} MB, "
+          f"{time.perf_counter() - inicio:.1f}s)")
+    if sidecar is not None:
+        bytes_matriz, bytes_ids = sidecar.cerrar()
+        print(f"Vectores: {ARCHIVO_VECTORES} ({sidecar.filas} x {sidecar.dimension} {dtype}, "
+              f"{(bytes_matriz + bytes_ids) / 1024 / 1024:.1f} MB con los ids)")
+    elif vectores_npy.borrar(ARCHIVO_VECTORES):
+        # Un sidecar de una ejecución anterior ya no corresponde al NDJSON nuevo
+        print(f"Borrado el sidecar anterior: {ARCHIVO_VECTORES}")
+    return {'juegos': contador, 'errores': errores['lineas'],
+            'aciertos': cache.aciertos if cache is not None else 0,
+            'codificados': cache.fallos if cache is not None else contador}
+
 
 if __name__ == "__main__":
-    procesar_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Genera los embeddings de steam-games-data.ndjson")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Textos por llamada al modelo (env VECTOR_LOTE)")
+    parser.add_argument('--bloque', type=int, default=TAMANO_BLOQUE,
+                        help="Juegos leídos y ordenados a la vez; acota la memoria (env VECTOR_BLOQUE)")
+    parser.add_argument('--procesos', type=int, default=PROCESOS,
+                        help="Procesos de codificación, 0 = uno por CPU (env VECTOR_PROCESOS)")
+    parser.add_argument('--sin-cache', action='store_true',
+                        help="Vectoriza todos los textos sin leer ni escribir la caché (env VECTOR_CACHE=0)")
+    parser.add_argument('--formato', choices=FORMATOS, default=FORMATO,
+                        help="ndjson (vector en cada línea), npy (matriz binaria aparte) o ambos (env VECTOR_FORMATO)")
+    parser.add_argument('--dtype', choices=sorted(vectores_npy.DTYPES), default=DTYPE_VECTORES,
+                        help="Tipo de la matriz .npy (env VECTOR_DTYPE)")
+    parser.add_argument('--backend', choices=BACKENDS, default=BACKEND,
+                        help="torch o onnx-int8 (ONNX Runtime, pesos int8) (env VECTOR_BACKEND)")
+    args = parser.parse_args()
+    procesar_pipeline(args.lote, args.bloque, args.procesos, usar_cache=USAR_CACHE and not args.sin_cache,
+                      formato=args.formato, dtype=args.dtype, backend=args.backend)
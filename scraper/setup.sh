@@ -138,18 +138,12 @@ echo ""
 
 
 # 9. Ejecutar scraping de Steam API
+# (DLC, soundtracks, paquetes y contenido adulto se filtran ya en gameid-script.py)
 echo "[*] Ejecutando run_pipeline.py..."
 echo ""
 python scripts/run_pipeline.py || log_fail "Fallo ejecutando run_pipeline.py"
 
 
-# 9.5. Filtrar juegos (DLC, soundtracks, contenido adulto)
-echo ""
-echo "[*] Ejecutando filter-games.py para filtrar juegos irrelevantes..."
-echo ""
-python scripts/filter-games.py || log_fail "Fallo ejecutando filter-games.py"
-
-
 # 10. Ejecutar pipeline de extracción y resumen IA
 echo ""
 echo "[*] Ejecutando pipeline de extracción y resumen (flux.sh)..."
@@ -157,21 +151,14 @@ echo ""
 bash "${ROOT_DIR}/imp-futuras/flux.sh" || log_fail "Fallo ejecutando flux.sh"
 
 
-# 11. Reemplazar descripciones con resúmenes IA
+# 11. Postproceso: resúmenes IA + limpieza de categorías y HTML en una pasada
 echo ""
-echo "[*] Ejecutando desc-changer.py para reemplazar descripciones..."
+echo "[*] Ejecutando postproceso.py (resúmenes IA, categorías irrelevantes, HTML)..."
 echo ""
-python "${SCRAPER_DIR}/scripts/desc-changer.py" || log_fail "Fallo ejecutando desc-changer.py"
+python "${SCRAPER_DIR}/scripts/postproceso.py" || log_fail "Fallo ejecutando postproceso.py"
 
 
-# 12. Limpiar categorías irrelevantes (Steam metadata)
-echo ""
-echo "[*] Ejecutando clean-tags.py para limpiar categorías irrelevantes..."
-echo ""
-python scripts/clean-tags.py || log_fail "Fallo ejecutando clean-tags.py"
-
-
-# 13. Generar embeddings semánticos (768 dims)
+# 12. Generar embeddings semánticos (768 dims)
 echo ""
 echo "[*] Ejecutando vectorizador.py..."
 echo ""
@@ -179,8 +166,11 @@ python scripts/vectorizador.py || log_fail "Fallo ejecutando vectorizador.py"
 echo ""
 
 
-# 14. Sincronizar datos vectorizados a máquina remota
+# 13. Sincronizar datos vectorizados a máquina remota
 ARCHIVO_VECT="${SCRAPER_DIR}/data/steam-games-data-vect.ndjson"
+# Sidecar binario de vectorizador.py --formato npy|ambos (solo existe en esos formatos)
+ARCHIVO_VECT_NPY="${SCRAPER_DIR}/data/steam-games-data-vect.npy"
+ARCHIVO_VECT_IDS="${SCRAPER_DIR}/data/steam-games-data-vect.ids.npy"
 LOG_METRICS="${SCRAPER_DIR}/logs/scraper_metrics.log"
 MAQUINA_REMOTA="192.199.1.65"
 RUTA_REMOTA="/home/g6/reto/datos"
@@ -189,11 +179,15 @@ if [ -f "$ARCHIVO_VECT" ]; then
     echo "[*] Copiando datos vectorizados a $MAQUINA_REMOTA:$RUTA_REMOTA ..."
     scp "$ARCHIVO_VECT" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || log_fail "Fallo copiando archivo a máquina remota"
     echo "[OK] Datos sincronizados en $MAQUINA_REMOTA:$RUTA_REMOTA/steam-games-data-vect.ndjson"
+    if [ -f "$ARCHIVO_VECT_NPY" ]; then
+        scp "$ARCHIVO_VECT_NPY" "$ARCHIVO_VECT_IDS" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || log_fail "Fallo copiando vectores .npy a máquina remota"
+        echo "[OK] Vectores sincronizados en $MAQUINA_REMOTA:$RUTA_REMOTA/steam-games-data-vect.npy (+ .ids.npy)"
+    fi
 else
     echo "[WARN] No se encontró el archivo vectorizado. Saltando sincronización."
 fi
 
-# 15. Sincronizar logs a máquina remota
+# 14. Sincronizar logs a máquina remota
 if [ -f "$LOG_METRICS" ]; then
     echo "[*] Copiando log de métricas a $MAQUINA_REMOTA:$RUTA_REMOTA ..."
     scp "$LOG_METRICS" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || log_fail "Fallo copiando log a máquina remota"
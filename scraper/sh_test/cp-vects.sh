@@ -6,6 +6,9 @@ echo "=========================================="
 echo ""
 
 ARCHIVO_VECT="/home/g6/reto/scraper/data/steam-games-data-vect.ndjson"
+# Sidecar binario de vectorizador.py --formato npy|ambos (solo existe en esos formatos)
+ARCHIVO_VECT_NPY="/home/g6/reto/scraper/data/steam-games-data-vect.npy"
+ARCHIVO_VECT_IDS="/home/g6/reto/scraper/data/steam-games-data-vect.ids.npy"
 LOG_METRICS="/home/g6/reto/scraper/logs/scraper_metrics.log"
 MAQUINA_REMOTA="192.199.1.65"
 RUTA_REMOTA="/home/g6/reto/datos"
@@ -14,6 +17,10 @@ if [ -f "$ARCHIVO_VECT" ]; then
     echo "[*] Copiando datos vectorizados a $MAQUINA_REMOTA:$RUTA_REMOTA ..."
     scp "$ARCHIVO_VECT" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || log_fail "Fallo copiando archivo a máquina remota"
     echo "[OK] Datos sincronizados en $MAQUINA_REMOTA:$RUTA_REMOTA/steam-games-data-vect.ndjson"
+    if [ -f "$ARCHIVO_VECT_NPY" ]; then
+        scp "$ARCHIVO_VECT_NPY" "$ARCHIVO_VECT_IDS" "$MAQUINA_REMOTA:$RUTA_REMOTA/" || log_fail "Fallo copiando vectores .npy a máquina remota"
+        echo "[OK] Vectores sincronizados en $MAQUINA_REMOTA:$RUTA_REMOTA/steam-games-data-vect.npy (+ .ids.npy)"
+    fi
 else
     echo "[WARN] No se encontró el archivo vectorizado. Saltando sincronización."
 fi
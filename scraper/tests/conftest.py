@@ -0,0 +1,28 @@
+import importlib.util
+import logging
+import os
+import sys
+
+import pytest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(SCRAPER_DIR, 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(SCRAPER_DIR, 'benchmarks'))
+
+
+def cargar_script(archivo, nombre):
+    """Importa un script de scripts/ con guion en el nombre como módulo nuevo."""
+    spec = importlib.util.spec_from_file_location(nombre, os.path.join(SCRIPTS_DIR, archivo))
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+@pytest.fixture
+def sacar_datos(tmp_path):
+    """sacar-datos-games.py recién cargado, con el log de métricas en tmp_path."""
+    # Con el logging ya configurado, su basicConfig no toca logs/
+    logging.basicConfig(filename=str(tmp_path / 'metricas.log'), level=logging.INFO, force=True)
+    return cargar_script('sacar-datos-games.py', 'sacar_datos_games')
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+
+import cache_embeddings
+from cache_embeddings import CacheEmbeddings
+
+TEXTOS = ["Juego A. Acción, RPG", "Juego B. Estrategia", "Juego C. Puzzle"]
+
+
+def vectores(n, dimension=4):
+    return np.arange(n * dimension, dtype=np.float32).reshape(n, dimension)
+
+
+def test_huella_cambia_con_la_revision_y_la_variante():
+    base = cache_embeddings.huella_modelo('modelo', revision='aaa')
+    assert base == cache_embeddings.huella_modelo('modelo', revision='aaa')
+    assert base != cache_embeddings.huella_modelo('modelo', revision='bbb')
+    assert base != cache_embeddings.huella_modelo('modelo', revision='aaa', variante='onnx-int8-avx2')
+
+
+def test_revision_de_un_modelo_local_es_el_hash_de_sus_archivos(tmp_path):
+    (tmp_path / 'config.json').write_text('{"dim": 4}')
+    revision = cache_embeddings.revision_modelo(str(tmp_path))
+    (tmp_path / 'config.json').write_text('{"dim": 8}')
+    assert cache_embeddings.revision_modelo(str(tmp_path)) != revision
+
+
+def test_aciertos_y_fallos_por_revision(tmp_path):
+    directorio = str(tmp_path)
+    huella_a = cache_embeddings.huella_modelo('modelo', revision='aaa')
+
+    cache = CacheEmbeddings(huella_a, directorio).cargar()
+    encontrados, faltan = cache.buscar(TEXTOS[:2])
+    assert encontrados is None and faltan == [0, 1]
+    cache.anadir(TEXTOS[:2], vectores(2))
+    assert cache.guardar() == 2
+
+    cache = CacheEmbeddings(huella_a, directorio).cargar()
+    encontrados, faltan = cache.buscar(TEXTOS)
+    assert faltan == [2]
+    np.testing.assert_array_equal(encontrados[:2], vectores(2))
+    assert (cache.aciertos, cache.fallos) == (2, 1)
+
+    # Otra revisión del modelo: todo son fallos y al guardar se borra la caché anterior
+    huella_b = cache_embeddings.huella_modelo('modelo', revision='bbb')
+    cache_b = CacheEmbeddings(huella_b, directorio).cargar()
+    encontrados, faltan = cache_b.buscar(TEXTOS)
+    assert encontrados is None and faltan == [0, 1, 2]
+    cache_b.anadir(TEXTOS, vectores(3))
+    cache_b.guardar()
+    assert os.listdir(directorio) == [f"{huella_b}.bin"]
+
+
+def test_guardar_conserva_solo_lo_usado(tmp_path):
+    huella = cache_embeddings.huella_modelo('modelo', revision='aaa')
+    cache = CacheEmbeddings(huella, str(tmp_path))
+    cache.anadir(TEXTOS, vectores(3))
+    cache.guardar()
+
+    cache = CacheEmbeddings(huella, str(tmp_path)).cargar()
+    cache.buscar(TEXTOS[1:2])
+    assert cache.guardar() == 1
+    cache = CacheEmbeddings(huella, str(tmp_path)).cargar()
+    assert len(cache) == 1
+    encontrados, faltan = cache.buscar(TEXTOS[1:2])
+    assert faltan == []
+    np.testing.assert_array_equal(encontrados[0], vectores(3)[1])
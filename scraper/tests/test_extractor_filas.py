@@ -0,0 +1,51 @@
+import glob
+import json
+import os
+
+import pytest
+
+from bench_extractor_filas import DIRECTORIO_PAGINAS, parsear_bs4
+from extractor_filas import extraer_filas
+
+# Página escrita a mano con el marcado de /search/results/ (JSON con results_html)
+# para cubrir los casos raros: gratis, descuento, paquete, bundle sin appid y
+# descriptores de adultos. Las páginas grabadas de Steam
+# (bench_extractor_filas.py --grabar N) se guardan junto a ella en tests/datos
+# y entran en la comparación con BeautifulSoup.
+PAGINA = os.path.join(DIRECTORIO_PAGINAS, 'pagina-busqueda.json')
+PAGINAS = sorted(glob.glob(os.path.join(DIRECTORIO_PAGINAS, 'pagina-*.json')))
+
+
+def results_html(ruta=PAGINA):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)['results_html']
+
+
+def test_filas_de_una_pagina_grabada():
+    filas = extraer_filas(results_html())
+    assert filas == [
+        {"appid": "730", "itemkey": "App_730", "descids": [2, 5], "title": "Counter-Strike 2",
+         "price_final": 0, "discount_pct": 0, "released": "Aug 21, 2012",
+         "review_summary": "Very Positive", "review_pct": 86, "review_count": 8123456},
+        {"appid": "1245620", "itemkey": "App_1245620", "descids": [], "title": "ELDEN RING & Shadow of the Erdtree",
+         "price_final": 3999, "discount_pct": 33, "released": "24 Feb, 2022",
+         "review_summary": "Very Positive", "review_pct": 92, "review_count": 712034},
+        # El bundle sin data-ds-appid se descarta; del paquete se queda el primer appid
+        {"appid": "400", "itemkey": "Sub_469", "descids": [], "title": "The Orange Box",
+         "price_final": 1999, "discount_pct": 0, "released": "10 Oct, 2007",
+         "review_summary": None, "review_pct": None, "review_count": None},
+        {"appid": "2000950", "itemkey": "App_2000950", "descids": [1, 3, 4], "title": 'Juego "Adultos"',
+         "price_final": None, "discount_pct": None, "released": "Coming soon",
+         "review_summary": None, "review_pct": None, "review_count": None},
+    ]
+
+
+@pytest.mark.parametrize("ruta", PAGINAS, ids=os.path.basename)
+def test_mismos_appids_y_titulos_que_beautifulsoup(ruta):
+    html = results_html(ruta)
+    assert [(f["appid"], f["title"]) for f in extraer_filas(html)] == parsear_bs4(html)
+
+
+def test_pagina_vacia():
+    assert extraer_filas('') == []
+    assert extraer_filas(None) == []
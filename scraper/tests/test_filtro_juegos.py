@@ -0,0 +1,70 @@
+import re
+
+import pytest
+
+import filtro_juegos
+from bench_filtro_juegos import EXTRAS, contiene_palabra_clave_anterior, generar_nombres
+
+
+def patron_alternancia(palabras):
+    """Mismo filtro sin factorizar: una alternativa por palabra clave."""
+    alternativas = '|'.join(r'\s+'.join(re.escape(t) for t in p.split(' ')) for p in sorted(set(palabras)))
+    return re.compile(r'(?<!\w)(?:' + alternativas + r')(?!\w)')
+
+
+def test_trie_equivale_a_la_alternancia_simple():
+    palabras = filtro_juegos.PALABRAS_CLAVE_FILTRO + ["demo", "dem", "demos", "d", "art book"]
+    trie = filtro_juegos.compilar_palabras(palabras)
+    simple = patron_alternancia(palabras)
+    nombres = generar_nombres(5000) + list(EXTRAS) + ["Demo", "D", "Dem Bones", "Art   Book", "demonic"]
+    for nombre in nombres:
+        normalizado = filtro_juegos.normalizar(nombre)
+        assert bool(trie.search(normalizado)) == bool(simple.search(normalizado)), nombre
+
+
+def test_coincide_con_el_filtro_anterior_salvo_subcadenas():
+    palabras = filtro_juegos.PALABRAS_CLAVE_FILTRO
+    for nombre in generar_nombres(5000) + list(EXTRAS):
+        nuevo = filtro_juegos.contiene_palabra_clave(nombre)
+        anterior = contiene_palabra_clave_anterior(filtro_juegos.normalizar(nombre), palabras)
+        if nuevo != anterior:
+            # Solo discrepan los falsos positivos de subcadena del filtro anterior
+            assert anterior and not nuevo, nombre
+            assert not any(re.search(r'(?<!\w)' + re.escape(p) + r'(?!\w)', filtro_juegos.normalizar(nombre))
+                           for p in palabras), nombre
+
+
+@pytest.mark.parametrize("nombre, descartado", [
+    ("Portal 2 Soundtrack", True),
+    ("Half-Life: DLC Pack", True),
+    ("ＤＬＣ de prueba", True),
+    ("Season  Pass", True),
+    ("Adults Only Edition", True),
+    ("Artbooks Collection", True),
+    ("Two Season Passes", True),
+    ("Idlcraft", False),
+    ("Soundtracker", False),
+    ("Adulthood", False),
+    ("", False),
+    (None, False),
+])
+def test_contiene_palabra_clave(nombre, descartado):
+    assert filtro_juegos.contiene_palabra_clave(nombre) == descartado
+
+
+def test_motivo_exclusion():
+    excluidos = {"7": {"type": "dlc"}}
+    assert filtro_juegos.motivo_exclusion({"appid": "7", "title": "Juego"}, excluidos) == "tipo:dlc"
+    assert filtro_juegos.motivo_exclusion({"appid": "9", "descids": [3], "title": "Juego"}, excluidos) == "adulto"
+    assert filtro_juegos.motivo_exclusion({"appid": "10", "title": "Juego Soundtrack"}, excluidos) == "nombre"
+    assert filtro_juegos.motivo_exclusion({"appid": "11", "itemkey": "App_11", "title": "Juego"}, excluidos) is None
+
+
+def test_los_paquetes_se_quedan_con_su_primer_appid():
+    # Como en el gameid-script.py original: el paquete no se descarta por serlo
+    filas = {"400": {"appid": "400", "itemkey": "Sub_469", "title": "The Orange Box"},
+             "7": {"appid": "7", "itemkey": "Sub_8", "title": "Juego Soundtrack Bundle"},
+             "9": {"appid": "9", "itemkey": "Bundle_9", "title": "Juego"}}
+    quedan, motivos = filtro_juegos.filtrar_filas(filas, {"9": {"type": "dlc"}})
+    assert list(quedan) == ["400"]
+    assert motivos == {"nombre": 1, "tipo:dlc": 1}
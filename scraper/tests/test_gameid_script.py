@@ -0,0 +1,74 @@
+import logging
+
+import pytest
+
+from conftest import cargar_script
+
+POR_PAGINA = 50
+
+
+@pytest.fixture
+def gameid(tmp_path):
+    logging.basicConfig(filename=str(tmp_path / 'metricas.log'), level=logging.INFO, force=True)
+    return cargar_script('gameid-script.py', 'gameid_script')
+
+
+def paginas_falsas(gameid, monkeypatch, total, fallos):
+    """descargar_pagina con `total` appids en orden; fallos: {offset: veces que falla antes de responder}."""
+    llamadas = []
+
+    def descargar_pagina(criterio_sort, offset):
+        llamadas.append(offset)
+        if fallos.get(offset, 0) > 0:
+            fallos[offset] -= 1
+            return None, 0
+        filas = [{"appid": str(a), "title": f"Juego {a}"} for a in range(offset, min(offset + POR_PAGINA, total))]
+        return filas, total
+
+    monkeypatch.setattr(gameid, 'descargar_pagina', descargar_pagina)
+    return llamadas
+
+
+def test_pagina_fallida_se_recupera_en_la_pasada_final(gameid, monkeypatch):
+    llamadas = paginas_falsas(gameid, monkeypatch, 500, {100: 1})
+    (lista,) = gameid.obtener_listas_steam([('CCU_DESC', 300, "prueba")])
+    assert list(lista) == [str(a) for a in range(300)]
+    assert llamadas.count(100) == 2
+
+
+def test_pagina_que_sigue_fallando_lanza_error(gameid, monkeypatch):
+    paginas_falsas(gameid, monkeypatch, 500, {150: 2})
+    with pytest.raises(RuntimeError, match="offset 150"):
+        gameid.obtener_listas_steam([('CCU_DESC', 300, "prueba")])
+
+
+class RespuestaFalsa:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.url = 'http://mock/search/results/'
+
+    def json(self):
+        return {"results_html": "", "total_count": 0}
+
+
+class SesionFalsa:
+    def __init__(self, estados):
+        self.estados = list(estados)
+        self.peticiones = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.peticiones += 1
+        return RespuestaFalsa(self.estados.pop(0))
+
+
+@pytest.mark.parametrize("estados, peticiones, ok", [
+    ([404], 1, False),           # 4xx: no se reintenta
+    ([503, 429, 200], 3, True),  # 5xx y 429: sí
+])
+def test_solo_se_reintenta_lo_transitorio(gameid, monkeypatch, estados, peticiones, ok):
+    sesion = SesionFalsa(estados)
+    monkeypatch.setattr(gameid, 'obtener_sesion', lambda: sesion)
+    monkeypatch.setattr(gameid, 'LIMITADOR', gameid.LimitadorAIMD(tasa_inicial=1000, tasa_max=1000, pausa_backoff=0.01))
+    filas, _ = gameid.descargar_pagina('CCU_DESC', 0)
+    assert sesion.peticiones == peticiones
+    assert (filas is not None) == ok
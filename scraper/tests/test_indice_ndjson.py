@@ -0,0 +1,61 @@
+import json
+import os
+
+import indice_ndjson
+from indice_ndjson import IndiceNDJSON
+
+
+def escribir(ruta, docs, modo='w'):
+    with open(ruta, modo, encoding='utf-8') as f:
+        for doc in docs:
+            f.write(json.dumps(doc) + "\n")
+
+
+def test_construir_y_consultar(tmp_path):
+    ruta = str(tmp_path / 'juegos.ndjson')
+    escribir(ruta, [{"steam_id": 30, "name": "c"}, {"steam_id": 10, "name": "a"}, {"steam_id": 20, "name": "b"}])
+    assert indice_ndjson.construir(ruta) == 3
+
+    with IndiceNDJSON(ruta) as registros:
+        assert registros.ids() == {10, 20, 30}
+        assert 20 in registros and '20' in registros and 99 not in registros
+        assert registros[10] == {"steam_id": 10, "name": "a"}
+        assert registros.get(99) is None
+
+
+def test_actualizar_solo_indexa_lo_anadido(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'juegos.ndjson')
+    escribir(ruta, [{"steam_id": 1, "name": "a"}, {"steam_id": 2, "name": "b"}])
+    indice_ndjson.construir(ruta)
+    escribir(ruta, [{"steam_id": 3, "name": "c"}, {"steam_id": 1, "name": "a2"}], modo='a')
+
+    tamano_previo = os.path.getsize(ruta) - len('{"steam_id": 3, "name": "c"}\n{"steam_id": 1, "name": "a2"}\n')
+    escaneos = []
+    escanear = indice_ndjson._escanear
+    monkeypatch.setattr(indice_ndjson, '_escanear',
+                        lambda r, desde=0, entradas=None: escaneos.append(desde) or escanear(r, desde, entradas))
+
+    assert indice_ndjson.actualizar(ruta) == 3
+    assert escaneos == [tamano_previo]
+    with IndiceNDJSON(ruta) as registros:
+        assert registros.ids() == {1, 2, 3}
+        assert registros[1]["name"] == "a2"  # gana la última línea
+
+
+def test_indice_desfasado_se_reconstruye(tmp_path):
+    ruta = str(tmp_path / 'juegos.ndjson')
+    escribir(ruta, [{"steam_id": 1, "name": "a"}, {"steam_id": 2, "name": "b"}])
+    indice_ndjson.construir(ruta)
+    # Reescritura sin pasar por construir(): el índice describe el archivo anterior
+    escribir(ruta, [{"steam_id": 2, "name": "b, cambiado"}, {"steam_id": 5, "name": "e"}])
+
+    with IndiceNDJSON(ruta, reconstruir=False) as registros:
+        assert registros.tamano_indexado != os.path.getsize(ruta)
+    with IndiceNDJSON(ruta) as registros:
+        assert registros.ids() == {2, 5}
+        assert registros[2]["name"] == "b, cambiado"
+
+    # actualizar() detecta que el principio del archivo ya no es el indexado
+    escribir(ruta, [{"steam_id": 7, "name": "g"}])
+    assert indice_ndjson.actualizar(ruta) == 1
+    assert indice_ndjson.ids_ndjson(ruta) == {7}
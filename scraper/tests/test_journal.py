@@ -0,0 +1,55 @@
+import json
+import os
+
+from journal import JournalNDJSON
+
+
+def leer_ndjson(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+def test_reanuda_tras_un_crash_desde_el_ultimo_commit(tmp_path):
+    salida = str(tmp_path / 'steam-games-data.ndjson')
+    with open(salida, 'w', encoding='utf-8') as f:
+        f.write('{"steam_id": 1, "name": "anterior"}\n')
+
+    journal = JournalNDJSON(salida, 'run-a')
+    assert not journal.abrir()
+    journal.escribir(10, {"steam_id": 10})
+    journal.marcar(20, meta={"motivo": "no disponible"})
+    journal.escribir(30, {"steam_id": 30})
+    # Crash: un registro a medio escribir en el parcial sin entrada en el journal
+    journal._parcial.write(b'{"steam_id": 40, "na')
+    journal._parcial.close()
+    journal._journal.close()
+
+    # La salida anterior sigue intacta hasta publicar
+    assert leer_ndjson(salida) == [{"steam_id": 1, "name": "anterior"}]
+
+    reanudado = JournalNDJSON(salida, 'run-a')
+    assert reanudado.abrir()
+    assert reanudado.completados == {10: None, 20: {"motivo": "no disponible"}, 30: None}
+    reanudado.escribir(40, {"steam_id": 40})
+    reanudado.publicar()
+
+    assert leer_ndjson(salida) == [{"steam_id": 10}, {"steam_id": 30}, {"steam_id": 40}]
+    assert not os.path.exists(salida + '.parcial')
+    assert not os.path.exists(salida + '.journal')
+    assert os.path.exists(salida + '.idx')
+
+
+def test_otro_run_id_empieza_de_cero(tmp_path):
+    salida = str(tmp_path / 'salida.ndjson')
+    journal = JournalNDJSON(salida, 'run-a')
+    journal.abrir()
+    journal.escribir(10, {"steam_id": 10})
+    journal._parcial.close()
+    journal._journal.close()
+
+    otro = JournalNDJSON(salida, 'run-b')
+    assert not otro.abrir()
+    assert otro.completados == {}
+    otro.escribir(20, {"steam_id": 20})
+    otro.publicar()
+    assert leer_ndjson(salida) == [{"steam_id": 20}]
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from limitador import LimitadorAIMD
+
+
+def test_429_simultaneos_dividen_la_tasa_una_vez():
+    limitador = LimitadorAIMD(tasa_inicial=4.0, tasa_min=0.2, pausa_backoff=10.0)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(limitador.registrar, [429] * 8))
+    assert limitador.tasa == 2.0
+    assert limitador.backoffs == 1
+
+
+def test_429_tras_la_pausa_vuelve_a_dividir():
+    limitador = LimitadorAIMD(tasa_inicial=4.0, tasa_min=0.2, pausa_backoff=10.0)
+    limitador.registrar(503)
+    limitador._pausa_hasta = 0.0  # la pausa ya ha pasado
+    limitador.registrar(429)
+    assert limitador.tasa == 1.0
+    assert limitador.backoffs == 2
+
+
+def test_exito_sube_de_forma_aditiva_hasta_el_maximo():
+    limitador = LimitadorAIMD(tasa_inicial=1.0, tasa_max=1.1, incremento=0.05)
+    for _ in range(5):
+        limitador.registrar(200)
+    assert limitador.tasa == 1.1
@@ -0,0 +1,19 @@
+import json
+
+import indice_ndjson
+import postproceso
+
+
+def test_resumen_de_salta_las_lineas_vacias(tmp_path):
+    ruta = tmp_path / 'summary.ndjson'
+    lineas = [{"steam_id": 1, "summary": "viejo"}, {"steam_id": 1, "summary": "nuevo"},
+              {"steam_id": 2, "summary": "bueno"}, {"steam_id": 1, "summary": ""},
+              {"steam_id": 3, "summary": ""}, {"steam_id": 4, "summary": "cuatro"}]
+    ruta.write_text("".join(json.dumps(l) + "\n" for l in lineas) + '{"steam_id": 2, "summ\n', encoding='utf-8')
+
+    with indice_ndjson.IndiceNDJSON(ruta) as resumenes:
+        assert postproceso.resumen_de(resumenes, 1) == "nuevo"
+        assert postproceso.resumen_de(resumenes, 2) == "bueno"   # la última línea está rota
+        assert postproceso.resumen_de(resumenes, 3) is None
+        assert postproceso.resumen_de(resumenes, 4) == "cuatro"
+        assert postproceso.resumen_de(resumenes, 99) is None
@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+import cache_steam
+import filtro_juegos
+import indice_ndjson
+from conftest import cargar_script
+from mock_steam import ServidorSteamFalso
+
+
+def test_precio_con_price_overview(sacar_datos):
+    doc = {"is_free": True, "price_eur": 0.0, "price_initial_eur": 0.0, "discount_pct": 0}
+    data = {"price_overview": {"final": 1499, "initial": 2999, "discount_percent": 50}}
+    assert sacar_datos.aplicar_precio(doc, data)
+    assert doc == {"is_free": False, "price_eur": 14.99, "price_initial_eur": 29.99, "discount_pct": 50}
+
+
+def test_precio_gratis_solo_si_la_respuesta_lo_dice(sacar_datos):
+    doc = {"is_free": False, "price_eur": 19.99, "price_initial_eur": 19.99, "discount_pct": 0}
+    assert sacar_datos.aplicar_precio(doc, {"is_free": True})
+    assert doc == {"is_free": True, "price_eur": 0.0, "price_initial_eur": 0.0, "discount_pct": 0}
+
+
+def test_juego_de_pago_sin_price_overview_conserva_el_precio(sacar_datos):
+    # Bloqueado por región o retirado: Steam responde data = []
+    doc = {"is_free": False, "price_eur": 19.99, "price_initial_eur": 24.99, "discount_pct": 20}
+    assert not sacar_datos.aplicar_precio(doc, [])
+    assert doc == {"is_free": False, "price_eur": 19.99, "price_initial_eur": 24.99, "discount_pct": 20}
+
+
+def test_juego_gratis_sin_price_overview_sigue_gratis(sacar_datos):
+    doc = {"is_free": True, "price_eur": 0.0, "price_initial_eur": 0.0, "discount_pct": 0}
+    assert sacar_datos.aplicar_precio(doc, [])
+    assert doc["is_free"] and doc["price_eur"] == 0.0
+
+
+def test_refresco_de_precios_devuelve_los_de_pago_sin_precio(sacar_datos, monkeypatch):
+    registros = {
+        10: {"is_free": False, "price_eur": 9.99, "price_initial_eur": 9.99, "discount_pct": 0},
+        20: {"is_free": False, "price_eur": 5.0, "price_initial_eur": 5.0, "discount_pct": 0},
+        30: {"is_free": True, "price_eur": 0.0, "price_initial_eur": 0.0, "discount_pct": 0},
+    }
+    respuesta = {10: {"price_overview": {"final": 499, "initial": 999, "discount_percent": 50}}, 20: [], 30: []}
+    monkeypatch.setattr(sacar_datos, 'descargar_lote_precios', lambda lote: {a: respuesta[a] for a in lote})
+    assert sacar_datos.refrescar_precios(registros) == [20]
+    assert registros[10]["price_eur"] == 4.99
+    assert registros[20]["price_eur"] == 5.0
+
+
+def test_procesos_parseo_cero_parsea_en_un_hilo(monkeypatch, tmp_path):
+    monkeypatch.setenv('SCRAPER_PROCESOS_PARSEO', '0')
+    logging.basicConfig(filename=str(tmp_path / 'metricas.log'), level=logging.INFO, force=True)
+    modulo = cargar_script('sacar-datos-games.py', 'sacar_datos_games')
+    assert modulo.PROCESOS_PARSEO == 0
+    with modulo.crear_pool_parseo() as pool:
+        assert isinstance(pool, ThreadPoolExecutor)
+
+
+def test_etapa_parseo_avisa_al_escritor_si_muere(sacar_datos):
+    cola_descargas, cola_escritura = queue.Queue(), queue.Queue()
+    # Los tags del appid fallan: la etapa muere antes de entregar nada
+    futuro_tags = Future()
+    futuro_tags.set_exception(KeyError(10))
+    cola_descargas.put((10, ('OK', {}, 0.1, 200), futuro_tags))
+    metricas = sacar_datos.MetricasPipeline(cola_descargas, cola_escritura)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        sacar_datos.etapa_parseo(1, cola_descargas, cola_escritura, pool, metricas)
+    fin, error = cola_escritura.get_nowait()
+    assert fin is sacar_datos.FIN_PARSEO
+    assert isinstance(error, KeyError)
+
+
+@pytest.fixture
+def mock_steam():
+    servidor = ServidorSteamFalso(juegos=12, kb_tienda=4, puerto=0).iniciar()
+    yield servidor
+    servidor.parar()
+
+
+@pytest.fixture
+def scraper(mock_steam, tmp_path, monkeypatch):
+    """sacar-datos-games.py contra el mock, con todos sus archivos en tmp_path."""
+    monkeypatch.setenv('STEAM_STORE_URL', mock_steam.url)
+    monkeypatch.setenv('SCRAPER_PROCESOS_PARSEO', '0')
+    logging.basicConfig(filename=str(tmp_path / 'metricas.log'), level=logging.INFO, force=True)
+    m = cargar_script('sacar-datos-games.py', 'sacar_datos_games')
+    for nombre in ('ENTRADA', 'SALIDA', 'FILAS', 'HUELLAS', 'FRESCURA', 'TAGS', 'FALLIDOS'):
+        monkeypatch.setattr(m, 'ARCHIVO_' + nombre, str(tmp_path / f'{nombre.lower()}.json'))
+    monkeypatch.setattr(m, 'LIMITADOR', m.LimitadorAIMD(tasa_inicial=200, tasa_max=500, pausa_backoff=0.01))
+    monkeypatch.setattr(m, 'PAUSA_REINTENTO', 0)
+    monkeypatch.setattr(cache_steam, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(filtro_juegos, 'ARCHIVO_EXCLUIDOS', str(tmp_path / 'excluidos.json'))
+    monkeypatch.setattr(sys, 'argv', ['sacar-datos-games.py'])
+
+    def ejecutar(appids):
+        with open(m.ARCHIVO_ENTRADA, 'w', encoding='utf-8') as f:
+            json.dump([{"appid": a, "name": f"Juego {a}"} for a in appids], f)
+        m.main()
+
+    m.ejecutar = ejecutar
+    return m
+
+
+def leer_json(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_refresco_de_volatiles_con_un_fallo_en_la_descarga_completa(scraper, mock_steam, tmp_path, monkeypatch,
+                                                                   capsys):
+    m = scraper
+    catalogo = mock_steam.catalogo
+    juegos = [a for a in catalogo.appids if catalogo.appdetails(a)['type'] == 'game']
+    fallido = juegos[0]
+    mock_steam.fallar = {str(fallido)}
+
+    # 1ª ejecución sin el juego que falla; en la 2ª todo lo anterior tiene los volátiles caducados
+    m.ejecutar([a for a in catalogo.appids if a != fallido])
+    monkeypatch.setattr(m, 'TTL_VOLATIL_HORAS', -1)
+    capsys.readouterr()
+    m.ejecutar(catalogo.appids)
+
+    assert f"Volátiles refrescados: {len(juegos) - 1} " in capsys.readouterr().out
+    assert indice_ndjson.ids_ndjson(m.ARCHIVO_SALIDA) == set(juegos) - {fallido}
+    fallidos = leer_json(m.ARCHIVO_FALLIDOS)
+    assert list(fallidos) == [str(fallido)]
+    assert fallidos[str(fallido)]["motivo"] == 'HTTP_ERROR' and fallidos[str(fallido)]["status"] == 503
+    assert not [a for a in os.listdir(tmp_path) if a.endswith(('.journal', '.parcial'))]
+
+
+def test_huella_solo_de_los_volatiles_refrescados(scraper, mock_steam, monkeypatch, capsys):
+    m = scraper
+    catalogo = mock_steam.catalogo
+    juegos = [a for a in catalogo.appids if catalogo.appdetails(a)['type'] == 'game']
+    cambiado = juegos[0]
+    filas = {str(a): {"appid": str(a), "price_final": 999, "discount_pct": 0,
+                      "released": "1 Jan, 2020", "review_summary": "Positive"} for a in juegos}
+
+    def guardar_filas():
+        with open(m.ARCHIVO_FILAS, 'w', encoding='utf-8') as f:
+            json.dump(filas, f)
+
+    guardar_filas()
+    m.ejecutar(juegos)
+    huellas = leer_json(m.ARCHIVO_HUELLAS)
+    assert huellas[str(cambiado)] == [999, 0, "1 Jan, 2020", "Positive"]
+
+    # Cambia la fila pero los volátiles siguen vigentes: no se piden y la huella no se toca
+    filas[str(cambiado)]["discount_pct"] = 50
+    guardar_filas()
+    m.ejecutar(juegos)
+    assert leer_json(m.ARCHIVO_HUELLAS) == huellas
+
+    # Con los volátiles caducados, el cambiado se refresca y los demás se confirman por huella
+    monkeypatch.setattr(m, 'TTL_VOLATIL_HORAS', -1)
+    capsys.readouterr()
+    m.ejecutar(juegos)
+    assert "Volátiles refrescados: 1 " in capsys.readouterr().out
+    assert leer_json(m.ARCHIVO_HUELLAS)[str(cambiado)] == [999, 50, "1 Jan, 2020", "Positive"]
+    assert set(leer_json(m.ARCHIVO_FRESCURA)[str(cambiado)]) == {"estatico", "volatil"}
+
+
+def test_replay_conserva_los_volatiles_refrescados_despues_de_la_cache(scraper, mock_steam, monkeypatch):
+    m = scraper
+    catalogo = mock_steam.catalogo
+    de_pago = next(a for a in catalogo.appids if catalogo.appdetails(a).get('price_overview')
+                   and catalogo.appdetails(a)['type'] == 'game')
+    m.ejecutar(catalogo.appids)
+    estatico = leer_json(m.ARCHIVO_FRESCURA)[str(de_pago)]["estatico"]
+
+    # Rebaja vista solo en el refresco de volátiles (los lotes de precios no se cachean)
+    data = catalogo.appdetails(de_pago)
+    catalogo.appdetails_grabados[de_pago] = dict(data, price_overview=dict(data['price_overview'], final=1))
+    monkeypatch.setattr(m, 'TTL_VOLATIL_HORAS', -1)
+    m.ejecutar(catalogo.appids)
+    with indice_ndjson.IndiceNDJSON(m.ARCHIVO_SALIDA) as registros:
+        refrescado = registros[de_pago]
+    assert refrescado['price_eur'] == 0.01
+    frescura = leer_json(m.ARCHIVO_FRESCURA)
+
+    monkeypatch.setattr(sys, 'argv', ['sacar-datos-games.py', '--replay'])
+    m.ejecutar(catalogo.appids)
+    with indice_ndjson.IndiceNDJSON(m.ARCHIVO_SALIDA) as registros:
+        reconstruido = registros[de_pago]
+    assert {c: reconstruido[c] for c in m.CAMPOS_VOLATILES} == {c: refrescado[c] for c in m.CAMPOS_VOLATILES}
+    assert leer_json(m.ARCHIVO_FRESCURA)[str(de_pago)] == frescura[str(de_pago)]
+    assert frescura[str(de_pago)]["estatico"] == estatico
+
+
+def test_sin_tags_para_los_que_no_son_juegos(scraper, mock_steam, capsys):
+    catalogo = mock_steam.catalogo
+    juegos = [a for a in catalogo.appids if catalogo.appdetails(a)['type'] == 'game']
+    assert len(juegos) < len(catalogo.appids)
+    scraper.ejecutar(catalogo.appids + [5])  # 5: no está en el catálogo (no disponible)
+
+    assert mock_steam.estadisticas()["peticiones"]["app"] == len(juegos)
+    assert f"| {len(catalogo.appids) - len(juegos) + 1} sin pedir" in capsys.readouterr().out
+
+
+def test_error_en_el_pipeline_cancela_los_tags_pendientes(scraper, mock_steam, monkeypatch):
+    pedidos = []
+
+    def tags_lentos(appid, previa=None, ttl_horas=None):
+        pedidos.append(appid)
+        time.sleep(0.2)
+        return 'ERROR', previa
+
+    def parseo_roto(total, cola_descargas, cola_escritura, pool, metricas):
+        # Muere cuando ya se han encolado los tags de todas las descargas
+        for _ in range(total):
+            cola_descargas.get()
+        cola_escritura.put((scraper.FIN_PARSEO, RuntimeError("parseo roto")))
+
+    monkeypatch.setattr(scraper, 'obtener_tags_populares', tags_lentos)
+    monkeypatch.setattr(scraper, 'etapa_parseo', parseo_roto)
+    monkeypatch.setattr(scraper, 'MAX_HILOS_TAGS', 1)
+    catalogo = mock_steam.catalogo
+    juegos = [a for a in catalogo.appids if catalogo.appdetails(a)['type'] == 'game']
+    with pytest.raises(RuntimeError, match="parseo roto"):
+        scraper.ejecutar(catalogo.appids)
+    # Solo se piden los que ya estaban en marcha, no todos los encolados
+    assert len(pedidos) <= 2 < len(juegos)
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import snapshots
+
+
+@pytest.fixture(autouse=True)
+def directorio_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, 'SNAPSHOTS_DIR', str(tmp_path / 'snapshots'))
+
+
+def escribir(ruta, ids, cambiados=()):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        for i in ids:
+            f.write(json.dumps({"steam_id": i, "version": 2 if i in cambiados else 1}) + "\n")
+    with open(ruta, 'rb') as f:
+        return f.read()
+
+
+def test_guardar_podar_y_restaurar(tmp_path):
+    ruta = str(tmp_path / 'steam-games-data.ndjson')
+    versiones = [
+        escribir(ruta, range(100)),
+        escribir(ruta, range(100), cambiados={5, 50}),
+        escribir(ruta, range(3, 103), cambiados={5}),
+    ]
+    metas = []
+    for i, contenido in enumerate(versiones):
+        with open(ruta, 'wb') as f:
+            f.write(contenido)
+        metas.append(snapshots.guardar('juegos', ruta, conservar=5))
+        if i == 0:
+            assert snapshots.guardar('juegos', ruta, conservar=5) is None  # sin cambios
+
+    assert metas[0]["base"] is None and metas[0]["nuevas"] == 100
+    assert metas[1]["base"] == metas[0]["generacion"] and metas[1]["nuevas"] == 2
+    assert metas[2]["nuevas"] == 4  # 100-102 y la 50 de vuelta a la versión 1
+
+    # Al borrar la primera, la segunda pasa a manifiesto completo; su pack sigue en uso
+    assert snapshots.podar('juegos', conservar=2) == (1, 0)
+    gens = snapshots.generaciones('juegos')
+    assert gens == [metas[1]["generacion"], metas[2]["generacion"]]
+    assert snapshots.leer_meta('juegos', gens[0])["base"] is None
+
+    for gen, contenido in zip(gens, versiones[1:]):
+        destino = tmp_path / f'restaurado-{gen}.ndjson'
+        snapshots.restaurar('juegos', gen, str(destino))
+        assert destino.read_bytes() == contenido
+
+    # Sin destino, la última generación vuelve a la ruta original
+    with open(ruta, 'wb') as f:
+        f.write(b'roto\n')
+    snapshots.restaurar('juegos')
+    with open(ruta, 'rb') as f:
+        assert f.read() == versiones[2]
+
+
+def test_restaurar_generacion_inexistente(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        snapshots.restaurar('juegos')
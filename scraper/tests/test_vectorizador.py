@@ -0,0 +1,81 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import vectorizador
+
+
+class ModeloFalso:
+    """encode() determinista que falla con cualquier lote que traiga un texto con ROTO."""
+    max_seq_length = 128
+
+    def __init__(self):
+        self.lotes = []
+
+    def get_sentence_embedding_dimension(self):
+        return 3
+
+    def tokenizer(self, textos, **kwargs):
+        return {'input_ids': [t.split() for t in textos]}
+
+    def encode(self, textos, **kwargs):
+        self.lotes.append(len(textos))
+        if any('ROTO' in t for t in textos):
+            raise RuntimeError("texto no válido")
+        return np.array([[len(t), t.count(' '), 1.0] for t in textos], dtype=np.float32)
+
+
+def test_un_texto_que_falla_no_tumba_el_lote():
+    modelo = ModeloFalso()
+    textos = ["a b", "ROTO c", "d e f", "g"]
+    vectores = vectorizador.codificar(modelo, textos, tamano_lote=4)
+    assert vectorizador.filas_fallidas(vectores).tolist() == [False, True, False, False]
+    np.testing.assert_array_equal(vectores[[0, 2, 3]], [[3, 1, 1], [5, 2, 1], [1, 0, 1]])
+    # El lote entero y después texto a texto
+    assert modelo.lotes == [4, 1, 1, 1, 1]
+
+
+def test_el_pipeline_omite_y_cuenta_los_juegos_que_fallan(tmp_path, monkeypatch):
+    raw = tmp_path / 'steam-games-data.ndjson'
+    juegos = [{"steam_id": 1, "name": "Uno"}, {"steam_id": 2, "name": "ROTO"},
+              {"steam_id": 3, "name": "Tres"}, {"steam_id": 4, "name": "Cuatro"}]
+    raw.write_text("".join(json.dumps(j) + "\n" for j in juegos) + "{no es json\n", encoding='utf-8')
+    monkeypatch.setattr(vectorizador, 'ARCHIVO_RAW', str(raw))
+    monkeypatch.setattr(vectorizador, 'ARCHIVO_FINAL', str(tmp_path / 'vect.ndjson'))
+    monkeypatch.setattr(vectorizador, 'ARCHIVO_VECTORES', str(tmp_path / 'vect.npy'))
+    monkeypatch.setattr(vectorizador, 'cargar_modelo', lambda *args: ModeloFalso())
+
+    resultado = vectorizador.procesar_pipeline(tamano_lote=2, tamano_bloque=3, procesos=1,
+                                               usar_cache=False, formato='ambos')
+
+    assert resultado['juegos'] == 3 and resultado['errores'] == 2
+    with open(tmp_path / 'vect.ndjson', 'r', encoding='utf-8') as f:
+        escritos = [json.loads(linea) for linea in f]
+    assert [j['steam_id'] for j in escritos] == [1, 3, 4]
+    assert all(len(j['vector_embedding']) == 3 for j in escritos)
+    assert np.load(tmp_path / 'vect.ids.npy').tolist() == [1, 3, 4]
+
+
+def test_si_el_pipeline_falla_se_descarta_el_sidecar(tmp_path, monkeypatch):
+    raw = tmp_path / 'steam-games-data.ndjson'
+    raw.write_text("".join(json.dumps({"steam_id": i, "name": f"Juego {i}"}) + "\n" for i in range(6)),
+                   encoding='utf-8')
+    monkeypatch.setattr(vectorizador, 'ARCHIVO_RAW', str(raw))
+    monkeypatch.setattr(vectorizador, 'ARCHIVO_FINAL', str(tmp_path / 'vect.ndjson'))
+    monkeypatch.setattr(vectorizador, 'ARCHIVO_VECTORES', str(tmp_path / 'vect.npy'))
+    serie = vectorizador.vectores_en_serie
+
+    def serie_que_se_corta(*args):
+        for n, resultado in enumerate(serie(*args)):
+            if n == 1:
+                raise RuntimeError("modelo caído")
+            yield resultado
+
+    monkeypatch.setattr(vectorizador, 'cargar_modelo', lambda *args: ModeloFalso())
+    monkeypatch.setattr(vectorizador, 'vectores_en_serie', serie_que_se_corta)
+    with pytest.raises(RuntimeError, match="modelo caído"):
+        vectorizador.procesar_pipeline(tamano_lote=2, tamano_bloque=3, procesos=1,
+                                       usar_cache=False, formato='npy')
+    assert not [a for a in os.listdir(tmp_path) if a.startswith('vect.npy')]